@@ -0,0 +1,46 @@
+"""
+Gunicorn + Uvicorn worker yapılandırması (ASGI, async analitik API'ler).
+
+Çalıştırma (DASHBOARD_ASYNC_VIEWS bu dosyada açılır):
+    gunicorn -c gunicorn_asgi.conf.py pardonai.asgi:application
+
+Tek süreçli (geliştirme / küçük makine) eşdeğeri:
+    DASHBOARD_ASYNC_VIEWS=1 DASHBOARD_ASYNC_THREADS=16 uvicorn pardonai.asgi:application \\
+        --host 0.0.0.0 --port 8000 --workers 1 --loop uvloop --http httptools \\
+        --timeout-keep-alive 5 --limit-concurrency 200
+
+Kapasite:
+  - Her worker tek bir event loop'tur; sorgular DASHBOARD_ASYNC_THREADS
+    boyutlu iş parçacığı havuzunda koşar (pardonai/dashboard/aio.py). Worker
+    başına aynı anda DB'de bekleyen istek sayısı ~DASHBOARD_ASYNC_THREADS'tir
+    (senkron worker'da 1).
+  - Her havuz iş parçacığı kendi DB bağlantısını tutar (CONN_MAX_AGE):
+    WEB_CONCURRENCY x DASHBOARD_ASYNC_THREADS, PostgreSQL max_connections'ın
+    (ya da pgbouncer havuzunun) altında kalmalıdır.
+  - WEB_CONCURRENCY çekirdek sayısı kadar tutulur; CPU işi (pandas / numpy
+    hesapları, JSON) GIL altında olduğundan worker sayısı CPU'ya, havuz
+    boyutu DB beklemesine göre ölçeklenir.
+  - Ölçüm: python manage.py bench_concurrency (in-process) ya da
+    --url ile çalışan bir sunucuya karşı.
+Tüm değerler ortam değişkenleriyle değiştirilebilir.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# worker başına sorgu havuzu = DB bağlantısı üst sınırı (settings.DASHBOARD_ASYNC_THREADS)
+os.environ.setdefault("DASHBOARD_ASYNC_THREADS", "16")
+os.environ.setdefault("DASHBOARD_ASYNC_VIEWS", "1")
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+# süreç içi önbelleklerin (aggregate_cache) ve bellek parçalanmasının sınırı
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
@@ -0,0 +1,189 @@
+# pardonai/dashboard/abc_snapshot.py
+"""
+Önceden hesaplanmış ABC sınıflandırması.
+
+En sık istenen görünüm filtresiz, varsayılan eşikli (80/95) ABC'dir. Her
+gruplama modu (name|id) ve dönem için etiketlerin sırası, kârı, kümülatif
+payı ve sınıfı product_metric_abc_snapshot'ta saklanır:
+  - period "all": tarih filtresi yok
+  - period "YYYY-MM": date_from/date_to tam bir takvim ayı
+
+Tazelik: her dönem, üretildiği andaki veri sürümünü (ProductMetricVersion)
+tutar. Sürüm değiştiyse snapshot kullanılmaz, endpoint canlı hesaplar; yani
+bayat sınıf hiç sunulmaz.
+
+Artımlı yenileme (refresh_abc_snapshots): değişiklik bilgisi rollup'tan
+gelir, ham geçmiş taranmaz. Rollup bir günü yeniden hesapladığında
+(rollup._rebuild_days) o günün ayı ve "all" bayat işaretlenir (mark_stale).
+refresh önce rollup'ı artımlı yeniler, sonra yalnızca bayat dönemleri rollup
+tablosundan üretir; diğerlerinin sürümü tek UPDATE ile güncellenir. Toplamı
+koruyan düzeltmeler (kâr takası, ad değişikliği) de günü kirli işaretlediği
+için yakalanır. Sinyal üretmeyen toplu yazımlar rollup'ta olduğu gibi
+mark_dirty / rebuild_product_rollup gerektirir.
+
+Rollup kapalıysa ya da güncel değilse değişiklik bilgisi yoktur: veri sürümü
+değiştiyse tüm dönemler yeniden üretilir.
+"""
+from __future__ import annotations
+import calendar
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .conditional import data_version
+from .models import ProductMetric, ProductMetricAbcPeriod, ProductMetricAbcSnapshot
+from .pareto_engine import ParetoEngine
+from .rollup import filtered_rollup, refresh_incremental, rollup_enabled, rollup_is_current
+
+PERIOD_ALL = "all"
+THRESHOLDS = (80, 95)
+GROUPBY_KEYS = {"name": "product_name", "id": "product_id"}
+BATCH_SIZE = 5000
+
+class Snapshot(NamedTuple):
+    """Bir dönemin hazır ABC sonucu; canlı agregasyon demetinden tipiyle ayrılır."""
+    labels: list
+    profit: List[float]
+    cum_pct: List[float]
+    classes: List[str]
+
+
+def period_for(date_from: Optional[date], date_to: Optional[date]) -> Optional[str]:
+    """Filtre bir snapshot dönemine karşılık geliyorsa dönem adı."""
+    if date_from is None and date_to is None:
+        return PERIOD_ALL
+    if date_from and date_to and date_from.day == 1 and date_from.year == date_to.year \
+            and date_from.month == date_to.month \
+            and date_to.day == calendar.monthrange(date_to.year, date_to.month)[1]:
+        return f"{date_from:%Y-%m}"
+    return None
+
+
+def _month_range(period: str) -> Tuple[Optional[date], Optional[date]]:
+    if period == PERIOD_ALL:
+        return None, None
+    year, month = (int(x) for x in period.split("-"))
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+# --------------------- okuma ---------------------
+def load(groupby: str, period: str, request=None) -> Optional[Snapshot]:
+    """
+    Dönemin snapshot'ı güncelse (labels, profit, cum_pct, classes), değilse
+    None. Sürüm kontrolü (istekte ETag için okunmuşsa tekrar okunmaz) +
+    (groupby, period, rank) indeksli tek okuma.
+    """
+    state = (
+        ProductMetricAbcPeriod.objects.filter(groupby=groupby, period=period, stale=False)
+        .values_list("version", flat=True).first()
+    )
+    if state is None or state != data_version(request)[0]:
+        return None
+    rows = (
+        ProductMetricAbcSnapshot.objects.filter(groupby=groupby, period=period)
+        .order_by("rank")
+        .values_list("label", "profit", "cum_pct", "abc_class")
+    )
+    labels, profit, cum, classes = [], [], [], []
+    as_label = int if groupby == "id" else str
+    for label, p, c, cls in rows:
+        labels.append(as_label(label))
+        profit.append(p)
+        cum.append(c)
+        classes.append(cls)
+    return Snapshot(labels, profit, cum, classes)
+
+
+# --------------------- üretim ---------------------
+def _source(date_from, date_to):
+    """(queryset, kâr alanı, tarih alanı): rollup güncelse product_metric_daily."""
+    if rollup_enabled() and rollup_is_current():
+        return filtered_rollup(date_from, date_to), "sum_profit", "day"
+    qs = ProductMetric.objects.all()
+    if date_from:
+        qs = qs.filter(ts__gte=date_from)
+    if date_to:
+        qs = qs.filter(ts__lte=date_to)
+    return qs, "total_profit", "ts"
+
+
+def _periods(days: Iterable) -> Set[str]:
+    """Günlerin dönemleri; tarihsiz satırlar yalnızca "all"a girer."""
+    return {f"{d:%Y-%m}" for d in days if d is not None} | {PERIOD_ALL}
+
+
+def mark_stale(days: Iterable) -> None:
+    """Günlerin dönemlerini (yoksa oluşturarak) bayat işaretler; rollup günleri yeniden hesaplarken çağırır."""
+    ProductMetricAbcPeriod.objects.bulk_create(
+        [ProductMetricAbcPeriod(groupby=g, period=p, stale=True) for g in GROUPBY_KEYS for p in sorted(_periods(days))],
+        update_conflicts=True, unique_fields=["groupby", "period"], update_fields=["stale"],
+    )
+
+
+def _all_periods() -> Set[str]:
+    qs, _, day_field = _source(None, None)
+    return _periods(qs.dates(day_field, "month"))
+
+
+def _build(groupby: str, period: str) -> int:
+    key = GROUPBY_KEYS[groupby]
+    qs, profit_field, _ = _source(*_month_range(period))
+    # _query_aggregate ile aynı sıra, aynı yerde (SQL, veritabanı collation'ı): (kâr DESC, etiket ASC)
+    agg = [
+        (r[key], float(r["p"] or 0))
+        for r in qs.values(key).annotate(p=Sum(profit_field)).order_by("-p", key)
+    ]
+    profit = [p for _, p in agg]
+    engine = ParetoEngine(profit)
+    classes = engine.abc_labels(*THRESHOLDS)
+    cum = engine.cum_pct(2)
+
+    ProductMetricAbcSnapshot.objects.filter(groupby=groupby, period=period).delete()
+    objs = [
+        ProductMetricAbcSnapshot(groupby=groupby, period=period, rank=i + 1, label=str(label),
+                                 profit=p, cum_pct=c, abc_class=cls)
+        for i, ((label, p), c, cls) in enumerate(zip(agg, cum, classes))
+    ]
+    ProductMetricAbcSnapshot.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+    return len(objs)
+
+
+def refresh(full: bool = False) -> Dict[str, int]:
+    """Bayat dönemleri yeniden üretir; {"rebuilt", "kept", "removed", "rows"}."""
+    version = data_version()[0]  # hesaplamadan önce: arada gelen yazım snapshot'ı bayat bırakır
+    if rollup_enabled():
+        refresh_incremental()  # kirli günler: dönemleri bayat işaretler
+    stored = {
+        (g, p): (v, stale) for g, p, v, stale in
+        ProductMetricAbcPeriod.objects.values_list("groupby", "period", "version", "stale")
+    }
+    tracked = rollup_enabled() and rollup_is_current()
+    if full or not stored or not tracked and any(v != version for v, _ in stored.values()):
+        # değişiklik bilgisi yok (ilk üretim / rollup yok): tüm dönemler
+        todo = {(g, p) for g in GROUPBY_KEYS for p in _all_periods()} | set(stored)
+    else:
+        todo = {key for key, (_, stale) in stored.items() if stale}
+    now = timezone.now()
+    stats = {"rebuilt": 0, "kept": len(set(stored) - todo), "removed": 0, "rows": 0}
+
+    for groupby, period in sorted(todo):
+        with transaction.atomic():
+            # önce temizlenir: üretim sırasında gelen işaret korunur, sonraki turda işlenir
+            ProductMetricAbcPeriod.objects.update_or_create(
+                groupby=groupby, period=period,
+                defaults={"version": version, "stale": False, "refreshed_at": now},
+            )
+            rows = _build(groupby, period)
+            if rows or period == PERIOD_ALL:
+                stats["rows"] += rows
+                stats["rebuilt"] += 1
+            else:
+                ProductMetricAbcPeriod.objects.filter(groupby=groupby, period=period).delete()
+                if (groupby, period) in stored:
+                    stats["removed"] += 1
+
+    ProductMetricAbcPeriod.objects.exclude(version=version).filter(stale=False).update(version=version, refreshed_at=now)
+    return stats
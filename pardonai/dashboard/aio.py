@@ -0,0 +1,153 @@
+# pardonai/dashboard/aio.py
+"""
+ASGI altında analitik view'lar için yardımcılar (views_async).
+
+Django 4.2'nin async ORM'i (acount, aget, aiterate ...) her sorguyu
+sync_to_async(thread_sensitive=True) ile süreç genelindeki tek senkron iş
+parçacığına gönderir: aynı süreçteki eşzamanlı istekler orada sıraya girer.
+Bu modül sorguları kendi iş parçacığı havuzunda çalıştırır
+(thread_sensitive=False, DASHBOARD_ASYNC_THREADS iş parçacığı):
+  - run_sync(fn, ...): tek bir senkron iş (view gövdesi, payload)
+  - gather(fn1, fn2, ...): bağımsız alt sorgular aynı anda; sonuçlar sırayla
+Her havuz iş parçacığının kendi DB bağlantısı vardır (CONN_MAX_AGE'e göre
+yeniden kullanılır, bozuk/eskimişse iş bitince kapatılır); süreç başına en
+fazla DASHBOARD_ASYNC_THREADS bağlantı açılır.
+
+Ayrıca async view'lar için require_GET (Django 4.2'ninki yalnızca senkron),
+DB cursor'lı senkron akışları tamponlamadan akıtan iter_sync ve async zincirde
+çalışabilen WhiteNoiseMiddleware (DASHBOARD_ASYNC_VIEWS açıkken settings
+whitenoise'unkinin yerine bunu koyar; WSGI'de orijinali kalır).
+"""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Iterable, List
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponseNotAllowed
+from django.utils.log import log_response
+from whitenoise.middleware import WhiteNoiseMiddleware as _WhiteNoiseMiddleware
+
+from . import timing
+
+_END = object()
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "DASHBOARD_ASYNC_THREADS", 16), thread_name_prefix="dashboard-aio",
+                )
+    return _pool
+
+
+def _in_worker(fn: Callable, phases: bool) -> Callable:
+    timer = timing.current()
+
+    def call(*args, **kwargs):
+        try:
+            if timer is None:
+                return fn(*args, **kwargs)
+            with connection.execute_wrapper(timer.execute_wrapper):
+                if phases:
+                    return fn(*args, **kwargs)
+                with timing.detached():
+                    return fn(*args, **kwargs)
+        finally:
+            # havuz iş parçacıkları istek döngüsünün bağlantı temizliğine girmez
+            connection.close_if_unusable_or_obsolete()
+
+    return call
+
+
+async def run_sync(fn: Callable, *args, **kwargs) -> Any:
+    """Senkron (ORM kullanan) işi havuzdaki bir iş parçacığında çalıştırır."""
+    return await sync_to_async(_in_worker(fn, phases=True), thread_sensitive=False, executor=_executor())(*args, **kwargs)
+
+
+async def gather(*calls: Callable[[], Any]) -> List[Any]:
+    """Argümansız senkron çağrıları aynı anda çalıştırır; toplam süre "aggregate" fazıdır."""
+    with timing.phase("aggregate"):
+        return await asyncio.gather(
+            *(sync_to_async(_in_worker(call, phases=False), thread_sensitive=False, executor=_executor())() for call in calls)
+        )
+
+
+async def iter_sync(iterable: Iterable) -> AsyncIterator:
+    """
+    Senkron üreteci async akışa çevirir. Django 4.2 ASGI'de senkron akışları
+    önce tümüyle belleğe alır; burada her parça ayrı okunur. Parçalar
+    Django'nun paylaşılan senkron iş parçacığında üretilir, böylece açık
+    cursor hep aynı bağlantıda kalır.
+    """
+    it = iter(iterable)
+    timer = timing.current()
+
+    def pull():
+        if timer is None:
+            return next(it, _END)
+        with connection.execute_wrapper(timer.execute_wrapper):
+            return next(it, _END)
+
+    step = sync_to_async(pull, thread_sensitive=True)
+    while True:
+        chunk = await step()
+        if chunk is _END:
+            return
+        yield chunk
+
+
+def require_GET(view):
+    """django.views.decorators.http.require_GET'in async view karşılığı."""
+
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method != "GET":
+            response = HttpResponseNotAllowed(["GET"])
+            log_response(
+                "Method Not Allowed (%s): %s", request.method, request.path,
+                response=response, request=request,
+            )
+            return response
+        return await view(request, *args, **kwargs)
+
+    return inner
+
+
+class WhiteNoiseMiddleware(_WhiteNoiseMiddleware):
+    """
+    whitenoise.middleware.WhiteNoiseMiddleware + async mod. Orijinali yalnızca
+    senkron olduğu için ASGI'de tüm zinciri tek iş parçacığına bağlar; burada
+    statik olmayan istekler doğrudan async zincire geçer.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False, executor=_executor())(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve, thread_sensitive=False, executor=_executor())(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,145 @@
+# pardonai/dashboard/arrow_export.py
+"""
+Arrow IPC (stream) ve Parquet dışa aktarımı.
+
+Satırlar DB cursor'ından parça parça okunur; her parça tipli bir record
+batch'e (float64 / int64 / date32 / string) çevrilip yazıcıya verilir ve
+yazılan baytlar hemen akışa çıkar. Bellek parça boyutuyla sınırlıdır.
+Parquet'te her parça ayrı bir row group olur (zstd varsa zstd, yoksa snappy);
+footer akışın sonunda gelir.
+
+pyarrow isteğe bağlıdır (pandas gerekmez); kurulu değilse available() False
+döner ve endpoint'ler yalnızca CSV sunar.
+"""
+from __future__ import annotations
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.ipc as pa_ipc  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pyarrow yoksa
+    pa = pa_ipc = pq = None  # type: ignore
+
+# format -> (content type, dosya uzantısı)
+FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# (kolon, tip adı); tip adları pyarrow kurulu olmadan da tanımlanabilsin diye metin
+AGGREGATE_COLUMNS: List[Tuple[str, str]] = [
+    ("sum_profit", "float64"),
+    ("cum_pct", "float64"),
+    ("sum_click", "int64"),
+    ("sum_sales", "int64"),
+    ("avg_cost", "float64"),
+    ("avg_price", "float64"),
+    ("avg_unit_profit", "float64"),
+    ("avg_ppc", "float64"),
+]
+RAW_COLUMNS: List[Tuple[str, str]] = [
+    ("id", "int64"),
+    ("product_id", "int64"),
+    ("product_name", "string"),
+    ("click", "int64"),
+    ("sales", "int64"),
+    ("click_per_sale", "float64"),
+    ("cost", "float64"),
+    ("sales_price", "float64"),
+    ("unit_profit", "float64"),
+    ("total_profit", "float64"),
+    ("profit_per_click", "float64"),
+    ("ts", "date32"),
+]
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def schema(columns: Sequence[Tuple[str, str]]):
+    types = {"float64": pa.float64(), "int64": pa.int64(), "string": pa.string(), "date32": pa.date32()}
+    return pa.schema([(name, types[t]) for name, t in columns])
+
+
+def transpose(chunk: Sequence[Sequence]) -> List[list]:
+    return [list(col) for col in zip(*chunk)]
+
+
+def batches(rows: Iterable[Sequence], size: int) -> Iterator[List[list]]:
+    """Satır demetlerini kolon listeleri halinde `size`'lık parçalara böler."""
+    chunk: List[Sequence] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield transpose(chunk)
+            chunk = []
+    if chunk:
+        yield transpose(chunk)
+
+
+def _array(values: list, type_):
+    try:
+        return pa.array(values, type=type_)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # ham cursor: SQLite tarihleri 'YYYY-MM-DD' metni olarak gelir
+        return pa.array(values).cast(type_)
+
+
+class _Sink:
+    """Yazıcının hedefi: yazılan baytları biriktirir, drain() ile boşaltılır."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts = []
+        return out
+
+
+def _parquet_codec() -> str:
+    return "zstd" if pa.Codec.is_available("zstd") else "snappy"
+
+
+def stream(fmt: str, columns: Sequence[Tuple[str, str]], column_batches: Iterable[List[list]]) -> Iterator[bytes]:
+    """Kolon listesi parçalarını `fmt` (arrow|parquet) baytları olarak akıtır."""
+    sch = schema(columns)
+    sink = _Sink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, sch, compression=_parquet_codec())
+    else:
+        writer = pa_ipc.new_stream(sink, sch)
+    try:
+        for cols in column_batches:
+            arrays = [_array(col, field.type) for col, field in zip(cols, sch)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=sch))
+            out = sink.drain()
+            if out:
+                yield out
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def label_column(groupby: str) -> Tuple[str, str]:
+    return ("label", "int64" if groupby == "id" else "string")
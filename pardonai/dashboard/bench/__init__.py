@@ -0,0 +1 @@
+"""Pareto endpoint'leri için sentetik veri üretimi ve ölçüm yardımcıları."""
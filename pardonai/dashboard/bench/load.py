@@ -0,0 +1,189 @@
+# pardonai/dashboard/bench/load.py
+"""
+Eşzamanlı yük testi: süreç başına kaç istek aynı anda taşınabiliyor.
+
+Modlar (bench_concurrency):
+  - sync: WSGI senkron worker modeli; süreç istekleri tek tek işler
+    (Django test Client, eşzamanlılık 1)
+  - async: ASGI uygulaması tek event loop'ta; `concurrency` istek aynı anda
+    (AsyncClient + asyncio, DASHBOARD_ASYNC_VIEWS=True ile kurulmuş URL'ler)
+  - url: çalışan bir sunucuya (gunicorn sync / uvicorn) `concurrency` iş
+    parçacığından HTTP; dağıtımlar arası karşılaştırma için
+
+Her istek farklı bir tarih penceresi kullanır, böylece süreç içi agregasyon
+önbelleği isabet etmez ve her istek DB'ye gider. Veri mevcut veritabanından
+okunur (runner'daki gibi transaction içinde yüklenemez: async modun havuz
+iş parçacıkları ayrı bağlantı kullanır ve geri alınacak veriyi görmez).
+
+db_latency_ms > 0 her sorguya yapay bekleme ekler (uzak PostgreSQL'in ağ
+gidiş-dönüşü benzetimi; yerel SQLite'ta sorgular GIL altında CPU işidir ve
+async modun kazancı görünmez). Bekleme GIL'i bırakır, gerçek ağ I/O gibi.
+
+Rapor: istek sayısı, eşzamanlılık, duvar süresi, istek/sn, gecikme
+p50 / p95 / max ve gözlenen en yüksek eşzamanlı istek (in_flight).
+"""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from time import perf_counter, sleep
+from typing import Any, Dict, List, Tuple
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from django.db.backends.signals import connection_created
+from django.db.models import Max, Min
+from django.test import AsyncClient, Client
+
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from .runner import percentile
+
+# ad -> (yol, sabit parametreler, tarih penceresi kullanılır mı)
+SCENARIOS: Dict[str, Tuple[str, Dict[str, str], bool]] = {
+    "pareto": ("/api/pareto", {}, True),
+    "topn": ("/api/pareto/topn", {"n": "10"}, True),
+    "bundle": ("/api/pareto/bundle", {}, True),
+    "drift": ("/api/pareto/drift", {"bucket": "week"}, True),
+    "dashboard_stats": ("/api/dashboard/stats", {}, False),
+}
+DEFAULT_SCENARIOS = ("pareto", "bundle", "dashboard_stats")
+
+Request = Tuple[str, Dict[str, str]]
+
+
+def plan(n: int, scenarios: List[str]) -> List[Request]:
+    """n istek; senaryolar sırayla, her istek için ayrı (date_from, date_to)."""
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"unknown scenarios: {', '.join(unknown)}")
+    bounds = ProductMetric.objects.aggregate(lo=Min("ts"), hi=Max("ts"))
+    lo, hi = bounds["lo"], bounds["hi"]
+    if lo is None:
+        raise ValueError("product_metric is empty; load data first (load_product_metrics)")
+    span = max((hi - lo).days, 1)
+
+    out: List[Request] = []
+    for i in range(n):
+        path, params, windowed = SCENARIOS[scenarios[i % len(scenarios)]]
+        params = dict(params)
+        if windowed:
+            start = lo + timedelta(days=i % span)
+            params["date_from"] = start.isoformat()
+            params["date_to"] = min(start + timedelta(days=7 + i // span), hi).isoformat()
+        out.append((path, params))
+    return out
+
+
+def simulate_db_latency(ms: float) -> None:
+    """Bu süreçte açılan (ve açık) her bağlantının sorgularına `ms` bekleme ekler."""
+    if ms <= 0:
+        return
+
+    def wrapper(execute, sql, params, many, context):
+        sleep(ms / 1000.0)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(install, weak=False)
+    from django.db import connections
+    for conn in connections.all(initialized_only=True):
+        conn.execute_wrappers.append(wrapper)
+
+
+def _summary(mode: str, concurrency: int, wall: float, samples: List[float], errors: int, in_flight: int) -> Dict[str, Any]:
+    return {
+        "mode": mode,
+        "requests": len(samples),
+        "concurrency": concurrency,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "rps": round(len(samples) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "max_ms": round(max(samples, default=0) * 1000, 2),
+        "in_flight": in_flight,
+    }
+
+
+def _consume(response) -> None:
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+
+
+def run_sync(requests: List[Request]) -> Dict[str, Any]:
+    client = Client()
+    samples: List[float] = []
+    errors = 0
+    aggregate_cache.clear()
+    t0 = perf_counter()
+    for path, params in requests:
+        t = perf_counter()
+        response = client.get(path, params)
+        _consume(response)
+        samples.append(perf_counter() - t)
+        errors += response.status_code != 200
+    return _summary("sync", 1, perf_counter() - t0, samples, errors, 1)
+
+
+def run_async(requests: List[Request], concurrency: int) -> Dict[str, Any]:
+    async def main():
+        client = AsyncClient()
+        gate = asyncio.Semaphore(concurrency)
+        samples: List[float] = []
+        state = {"errors": 0, "now": 0, "peak": 0}
+
+        async def one(path, params):
+            async with gate:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+                t = perf_counter()
+                try:
+                    response = await client.get(path, params)
+                    if response.streaming:
+                        async for _ in response.streaming_content:
+                            pass
+                    state["errors"] += response.status_code != 200
+                finally:
+                    samples.append(perf_counter() - t)
+                    state["now"] -= 1
+
+        t0 = perf_counter()
+        await asyncio.gather(*(one(path, params) for path, params in requests))
+        return _summary("async", concurrency, perf_counter() - t0, samples, state["errors"], state["peak"])
+
+    aggregate_cache.clear()
+    return asyncio.run(main())
+
+
+def run_url(base_url: str, requests: List[Request], concurrency: int, timeout: float = 60.0) -> Dict[str, Any]:
+    base_url = base_url.rstrip("/")
+
+    def one(req: Request) -> Tuple[float, bool]:
+        path, params = req
+        t = perf_counter()
+        try:
+            with urlopen(f"{base_url}{path}?{urlencode(params)}", timeout=timeout) as resp:
+                resp.read()
+                ok = resp.status == 200
+        except HTTPError:
+            ok = False
+        return perf_counter() - t, ok
+
+    t0 = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, requests))
+    wall = perf_counter() - t0
+    return _summary("url", concurrency, wall, [r[0] for r in results], sum(not r[1] for r in results), concurrency)
+
+
+def fmt(r: Dict[str, Any]) -> str:
+    return (
+        f"{r['mode']:6} c={r['concurrency']:<4} n={r['requests']:<5} {r['rps']:>8} req/s  "
+        f"p50 {r['p50_ms']:>8.2f}ms  p95 {r['p95_ms']:>8.2f}ms  max {r['max_ms']:>8.2f}ms  "
+        f"in_flight {r['in_flight']:<4} errors {r['errors']}"
+    )
@@ -0,0 +1,249 @@
+# pardonai/dashboard/bench/runner.py
+"""
+Pareto endpoint'leri için tekrarlanabilir ölçüm.
+
+Her boyut (satır sayısı) için sentetik veri (synthetic.load_rows) bir
+transaction içinde yüklenir, rollup ve özetler üretilir, her senaryo Django
+test client'ı ile çağrılır; ölçüm bitince transaction geri alınır, tablo
+ölçüm öncesindeki haline döner. Sonuçların anlamlı olması için boş (ya da
+ölçüme ayrılmış) bir veritabanı kullanılmalı; mevcut satır sayısı rapora
+yazılır.
+
+Senaryo başına:
+  - latency p50 / p95 / max (ms): `runs` ölçüm, önce `warmup` ısınma
+  - queries: istek başına SQL sorgu sayısı
+  - peak_kb: tracemalloc ile ayrı bir çalıştırmada Python tepe belleği
+    (tracemalloc yavaşlattığı için süre ölçümüne katılmaz)
+  - bytes: yanıt boyutu (akışlı yanıtlar dahil)
+
+cold=True (varsayılan) her istekten önce süreç içi agregasyon önbelleğini
+boşaltır; cold=False önbellek isabetini ölçer.
+
+Arrow/Parquet senaryoları pyarrow gerektirir; kurulu değilse atlanır ve
+raporun "skipped" listesine yazılır.
+"""
+from __future__ import annotations
+import json
+import platform
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from math import ceil
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import django
+from django.conf import settings
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from .. import arrow_export, fastjson, rollup, sketch
+from .synthetic import load_rows
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# ad -> (yol, sorgu parametreleri)
+SCENARIOS: Dict[str, tuple] = {
+    "pareto": ("/api/pareto", {}),
+    "pareto_search": ("/api/pareto", {"search": "kahve"}),
+    "pareto_range": ("/api/pareto", {"date_from": "2025-03-01", "date_to": "2025-03-31"}),
+    "abc": ("/api/pareto/abc", {}),
+    "lorenz": ("/api/pareto/lorenz", {}),
+    "scatter": ("/api/pareto/scatter", {}),
+    "hist": ("/api/pareto/hist", {}),
+    "whatif": ("/api/pareto/whatif", {"price_delta_pct": "3", "sales_uplift_pct": "10"}),
+    "treemap": ("/api/pareto/treemap", {}),
+    "topn": ("/api/pareto/topn", {}),
+    "table": ("/api/pareto/table", {"limit": "100"}),
+    "bundle": ("/api/pareto/bundle", {}),
+    "export_csv": ("/api/pareto/export", {}),
+    "export_parquet": ("/api/pareto/export", {"format": "parquet"}),
+    "export_arrow": ("/api/pareto/export", {"format": "arrow"}),
+    "export_raw_csv": ("/api/pareto/export/raw", {}),
+    "export_raw_parquet": ("/api/pareto/export/raw", {"format": "parquet"}),
+}
+# pyarrow kurulu değilse atlanan senaryolar
+PYARROW_SCENARIOS = {"export_parquet", "export_arrow", "export_raw_parquet"}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """En yakın sıra (nearest-rank) yüzdeliği."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, ceil(pct / 100.0 * len(ordered)) - 1)]
+
+
+def _consume(response) -> int:
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "json_backend": fastjson.backend(),
+        "use_rollup": rollup.rollup_enabled(),
+    }
+
+
+def measure(client: Client, path: str, params: Dict[str, str], runs: int, warmup: int, cold: bool) -> Dict[str, Any]:
+    def call():
+        if cold:
+            aggregate_cache.clear()
+        response = client.get(path, params)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} {params}: HTTP {response.status_code}")
+        return _consume(response)
+
+    for _ in range(warmup):
+        call()
+
+    samples: List[float] = []
+    queries: List[int] = []
+    size = 0
+    for _ in range(runs):
+        reset_queries()
+        with CaptureQueriesContext(connection) as ctx:
+            t = perf_counter()
+            size = call()
+            samples.append(perf_counter() - t)
+        queries.append(len(ctx.captured_queries))
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+        "queries": max(queries),
+        "peak_kb": round(peak / 1024, 1),
+        "bytes": size,
+    }
+
+
+def run(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    scenarios: Optional[Iterable[str]] = None,
+    products: int = 20_000,
+    days: int = 365,
+    skew: float = 1.1,
+    seed: int = 42,
+    runs: int = 10,
+    warmup: int = 1,
+    cold: bool = True,
+    log: Callable[[str], None] = lambda msg: None,
+) -> Dict[str, Any]:
+    names = list(scenarios or SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"unknown scenarios: {', '.join(unknown)}")
+    skipped = [] if arrow_export.available() else [n for n in names if n in PYARROW_SCENARIOS]
+    if skipped:
+        log(f"pyarrow yok, atlanan senaryolar: {', '.join(skipped)}")
+        names = [n for n in names if n not in skipped]
+
+    report: Dict[str, Any] = {
+        "env": environment(),
+        "params": {"products": products, "days": days, "skew": skew, "seed": seed,
+                   "runs": runs, "warmup": warmup, "cold": cold},
+        "baseline_rows": ProductMetric.objects.count(),
+        "skipped": skipped,
+        "results": {},
+    }
+    client = Client()
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for size in sizes:
+            result: Dict[str, Any] = {}
+            try:
+                with transaction.atomic():
+                    t0 = perf_counter()
+                    load_rows(size, products=products, days=days, skew=skew, seed=seed)
+                    rollup.rebuild_all()
+                    sketch.rebuild_all()
+                    if connection.vendor in ("postgresql", "sqlite"):
+                        with connection.cursor() as cur:
+                            cur.execute("ANALYZE")
+                    result["_load_s"] = round(perf_counter() - t0, 2)
+                    log(f"{size} satır yüklendi ({result['_load_s']}s)")
+                    for name in names:
+                        path, params = SCENARIOS[name]
+                        result[name] = measure(client, path, params, runs, warmup, cold)
+                        log(f"  {name:18} {_fmt(result[name])}")
+                    raise _Rollback
+            except _Rollback:
+                pass
+            finally:
+                aggregate_cache.clear()
+            report["results"][str(size)] = result
+    return report
+
+
+def _fmt(r: Dict[str, Any]) -> str:
+    return (f"p50={r['p50_ms']:9.2f}ms p95={r['p95_ms']:9.2f}ms q={r['queries']:3} "
+            f"peak={r['peak_kb']:10.1f}KB bytes={r['bytes']}")
+
+
+# --------------------- karşılaştırma ---------------------
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 1.2) -> List[Dict[str, Any]]:
+    """
+    İki raporun ortak (boyut, senaryo) çiftleri: new / old oranları.
+    p50 veya peak oranı threshold'u aşarsa ya da sorgu sayısı artarsa
+    regression=True.
+    """
+    rows = []
+    for size, scenarios in new.get("results", {}).items():
+        before = old.get("results", {}).get(size, {})
+        for name, b in scenarios.items():
+            a = before.get(name)
+            if name.startswith("_") or not a:
+                continue
+            p50 = b["p50_ms"] / a["p50_ms"] if a["p50_ms"] else 1.0
+            p95 = b["p95_ms"] / a["p95_ms"] if a["p95_ms"] else 1.0
+            peak = b["peak_kb"] / a["peak_kb"] if a["peak_kb"] else 1.0
+            rows.append({
+                "size": int(size),
+                "scenario": name,
+                "p50_ms": (a["p50_ms"], b["p50_ms"]),
+                "p50_ratio": round(p50, 3),
+                "p95_ratio": round(p95, 3),
+                "queries": (a["queries"], b["queries"]),
+                "peak_ratio": round(peak, 3),
+                "regression": p50 > threshold or peak > threshold or b["queries"] > a["queries"],
+            })
+    return rows
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
@@ -0,0 +1,82 @@
+# pardonai/dashboard/bench/synthetic.py
+"""
+ProductMetric için sentetik veri üreticisi.
+
+Ürün popülerliği Zipf benzeri dağılır (skew büyüdükçe az sayıda ürün kârın
+çoğunu üretir), böylece pareto eğrisi gerçekçi bir uzun kuyruk gösterir.
+"""
+from __future__ import annotations
+import random
+from datetime import date, timedelta
+from typing import Iterator, List
+
+from django.db import transaction
+
+from ..models import ProductMetric
+from ..search import fold_search
+
+_WORDS = [
+    "Çay", "Kahve", "Şeker", "İncir", "Ilık Süt", "Ayran", "Gözleme", "Börek",
+    "Köfte", "Döner", "Lahmacun", "Pide", "Simit", "Poğaça", "Künefe", "Baklava",
+    "Sütlaç", "Mantı", "Çorba", "Salata", "Limonata", "Su", "Tost", "Omlet",
+]
+
+
+def product_names(products: int, seed: int = 42) -> List[str]:
+    rnd = random.Random(seed)
+    return [f"{rnd.choice(_WORDS)} {rnd.choice(_WORDS)} {i}" for i in range(1, products + 1)]
+
+
+def generate_rows(
+    rows: int,
+    products: int = 1000,
+    days: int = 365,
+    skew: float = 1.1,
+    seed: int = 42,
+    start: date = date(2025, 1, 1),
+) -> Iterator[ProductMetric]:
+    rnd = random.Random(seed)
+    names = product_names(products, seed)
+    folded = [fold_search(n) for n in names]
+    weights = [1.0 / (k ** skew) for k in range(1, products + 1)]
+    base_cost = [rnd.uniform(5, 300) for _ in range(products)]
+    margin = [rnd.uniform(1.1, 3.5) for _ in range(products)]
+
+    picks = rnd.choices(range(products), weights=weights, k=rows)
+    for i in picks:
+        click = rnd.randint(1, 800)
+        sales = rnd.randint(0, click)
+        cost = base_cost[i] * rnd.uniform(0.9, 1.1)
+        price = cost * margin[i]
+        unit = price - cost
+        yield ProductMetric(
+            product_id=i + 1,
+            product_name=names[i],
+            product_name_search=folded[i],  # bulk_create save() çağırmaz
+            click=click,
+            sales=sales,
+            click_per_sale=click / sales if sales else 0.0,
+            cost=cost,
+            sales_price=price,
+            unit_profit=unit,
+            total_profit=unit * sales,
+            profit_per_click=unit * sales / click,
+            ts=start + timedelta(days=rnd.randrange(days)),
+        )
+
+
+def load_rows(rows: int, batch_size: int = 10000, **kwargs) -> int:
+    """generate_rows çıktısını bulk_create ile yazar; yazılan satır sayısını döner."""
+    written = 0
+    batch: List[ProductMetric] = []
+    with transaction.atomic():
+        for obj in generate_rows(rows, **kwargs):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                ProductMetric.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            ProductMetric.objects.bulk_create(batch)
+            written += len(batch)
+    return written
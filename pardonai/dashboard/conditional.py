@@ -0,0 +1,135 @@
+# pardonai/dashboard/conditional.py
+"""
+Analitik API'ler için koşullu GET (ETag / Last-Modified).
+
+ProductMetric'in tek satırlık veri sürümü (product_metric_version) her yazımda
+artar: sinyaller tekil yazımlarda transaction başına bir kez, commit'ten sonra
+(schedule_bump; paylaşılan satır yazanın transaction'ında kilitli kalmaz),
+invalidate_all() toplu yazımlardan sonra.
+ETag = hash(yanıt biçimi, PARETO_ETAG_VERSION, yol, veri sürümü, normalize
+edilmiş sorgu parametreleri); güçlü (strong) bir ETag'dir çünkü aynı kod, sürüm
+ve parametreler bayt bayt aynı yanıtı üretir. Yanıt şekli değiştiğinde
+API_FORMAT artırılır; dağıtımlar PARETO_ETAG_VERSION'a derleme sürümünü verir.
+
+If-None-Match eşleşirse view hiç çalışmaz (agregasyon yok), 304 döner; istek
+başına maliyet tek indeksli sürüm okumasıdır. Yanıtlar "private, no-cache" ile
+işaretlenir: tarayıcı saklar ama her kullanımda yeniden doğrular.
+
+Async view'larda (views_async) aynı mantık: sürüm okuması aio.run_sync ile
+havuzda yapılır, 304 kararı django.utils.cache.get_conditional_response ile
+(condition dekoratörünün kullandığı) verilir.
+"""
+from __future__ import annotations
+import hashlib
+from calendar import timegm
+from functools import wraps
+from datetime import datetime
+from typing import Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+from . import write_batch
+from .aio import run_sync
+from .models import ProductMetricVersion
+
+# analitik yanıtların biçimi değiştiğinde artırılır (eski ETag'ler eşleşmesin)
+API_FORMAT = 1
+
+
+def data_version(request=None) -> Tuple[int, Optional[datetime]]:
+    """(sürüm, son yazım zamanı); istek üzerinde bir kez okunur."""
+    cached = getattr(request, "_pm_data_version", None)
+    if cached is not None:
+        return cached
+    row = ProductMetricVersion.objects.filter(pk=1).values_list("version", "updated_at").first()
+    value = row or (0, None)
+    if request is not None:
+        request._pm_data_version = value
+    return value
+
+
+def bump_data_version() -> None:
+    """ProductMetric değiştiğinde çağrılır; tüm ETag'leri geçersiz kılar."""
+    now = timezone.now()
+    if not ProductMetricVersion.objects.filter(pk=1).update(version=F("version") + 1, updated_at=now):
+        ProductMetricVersion.objects.get_or_create(pk=1, defaults={"version": 1, "updated_at": now})
+
+
+def _bump_on_commit(_days) -> None:
+    bump_data_version()
+
+
+def schedule_bump() -> None:
+    """Tekil yazım sinyalleri için: sürüm commit'te, transaction başına bir kez artar."""
+    write_batch.record((), None, _bump_on_commit)
+
+
+def normalized_params(request) -> str:
+    """Boş değerler ve "_" ile başlayan (cache-buster) anahtarlar atılır, sıra önemsiz."""
+    items = sorted(
+        (key, value.strip())
+        for key, values in request.GET.lists()
+        if not key.startswith("_")
+        for value in values
+        if value.strip()
+    )
+    return "&".join(f"{k}={v}" for k, v in items)
+
+
+def _etag(request, *args, **kwargs) -> str:
+    version, _ = data_version(request)
+    build = getattr(settings, "PARETO_ETAG_VERSION", "")
+    raw = f"{API_FORMAT}\n{build}\n{request.path}\n{version}\n{normalized_params(request)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _last_modified(request, *args, **kwargs) -> Optional[datetime]:
+    return data_version(request)[1]
+
+
+def _finish(response):
+    if response.status_code in (200, 304):
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        # hata yanıtları doğrulayıcı taşımaz; 304 ile yeniden kullanılmasın
+        del response["ETag"]
+        del response["Last-Modified"]
+        patch_cache_control(response, no_store=True)
+    return response
+
+
+def conditional_api(view):
+    """@require_GET altında kullanılır: ETag/Last-Modified, 304 ve no-cache."""
+    if iscoroutinefunction(view):
+        return _async_conditional(view)
+    conditional_view = condition(etag_func=_etag, last_modified_func=_last_modified)(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return _finish(conditional_view(request, *args, **kwargs))
+
+    return wrapper
+
+
+def _async_conditional(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        await run_sync(data_version, request)
+        etag = quote_etag(_etag(request))
+        modified = _last_modified(request)
+        modified = timegm(modified.utctimetuple()) if modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=modified)
+        if response is None:
+            response = await view(request, *args, **kwargs)
+            if modified and not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(modified)
+            response.headers.setdefault("ETag", etag)
+        return _finish(response)
+
+    return wrapper
@@ -0,0 +1,243 @@
+# pardonai/dashboard/counters.py
+"""
+Sık okunan durum sayaçları için sayaç tablosu (status_counter).
+
+Bekleyen sipariş, aktif menü, satıştaki ürün ve tamamlanan hedef sayıları her
+sayfa görüntülemesinde tabloyu taramak yerine (işletme, sayaç) satırından okunur.
+Sayaçlar yalnızca işletme bazında tutulur; global değer (business=GLOBAL)
+okumada işletme satırlarının SUM'ıdır. Tüm yazımların tek bir global satırı
+güncellediği sıcak satır (hot row) yoktur: farklı işletmelerin yazımları
+birbirinin kilidini beklemez.
+
+Güncelleme (signals.py): ilgili modelin kaydı yazılmadan önce (pre_save /
+pre_delete) eski durumu, yazıldıktan sonra yenisi okunur. Aradaki fark F()
+ile artırılır/azaltılır, yani satır kilidiyle ve okuma-yazma yarışı olmadan.
+İşletmesini üst kaydından alan sayaçlar (Product -> menü) üst kayıt başka
+işletmeye taşındığında aynı yazımda birlikte taşınır (MOVES_WITH).
+Bir yazımın tüm sayaç değişiklikleri tek transaction'dadır; yazım zaten bir
+transaction içindeyse geri alındığında sayaçlar da geri alınır.
+
+Sinyal üretmeyen toplu yazımlar (QuerySet.update, bulk_create, ham SQL) ve
+loaddata sayaçları kaydırır: reconcile_status_counters komutu gerçek
+sayımlarla karşılaştırıp onarır. Bir sayacın hiç satırı yoksa ilk kullanımda
+tüm işletmeler için tek GROUP BY sorgusuyla canlı sayımdan oluşturulur
+(_seed); satırı olan bir sayaçta eksik işletme satırı 0 demektir.
+"""
+from __future__ import annotations
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, F, Q, Sum
+from django.db.models.functions import Cast
+
+from pardonai.menu.models import Menu, Product
+from pardonai.orders.models import Order, OrderStatus
+from pardonai.performance.models import Goal
+from .models import Businesses as CoreBusinesses, StatusCounter
+
+GLOBAL = 0  # tüm işletmeler; bu business_id ile satır tutulmaz
+
+# model -> (işletme alanı, {sayaç: koşul}); koşul (alan, değer) ya da None (tüm satırlar)
+COUNTERS = {
+    Order: ("business_id", {
+        "total_orders": None,
+        "pending_orders": ("order_status", OrderStatus.PENDING),
+        "delivered_orders": ("order_status", OrderStatus.DELIVERED),
+    }),
+    Menu: ("business_id", {
+        "total_menus": None,
+        "active_menus": ("is_active", True),
+    }),
+    Product: ("menu__business_id", {
+        "total_products": None,
+        "available_products": ("is_available", True),
+    }),
+    Goal: ("business_id", {
+        "total_goals": None,
+        "achieved_goals": ("is_achieved", True),
+    }),
+}
+# üst model -> (işletmesini onun üzerinden alan model, üst kayda giden alan)
+MOVES_WITH = {
+    Menu: (Product, "menu"),
+}
+NAMES = {name: model for model, (_, names) in COUNTERS.items() for name in names}
+
+State = Tuple[int, Tuple[str, ...]]  # (business_id, koşulu sağlanan sayaçlar)
+
+
+def _q(model, name: str, business: int = GLOBAL) -> Q:
+    path, names = COUNTERS[model]
+    q = Q(**{path: business}) if business != GLOBAL else Q()
+    if names[name] is not None:
+        q &= Q(**dict([names[name]]))
+    return q
+
+
+def live_count(name: str, business: int = GLOBAL) -> int:
+    """Sayacın tablodan hesaplanan gerçek değeri."""
+    model = NAMES[name]
+    return model.objects.filter(_q(model, name, business)).count()
+
+
+def load_state(model, pk) -> Optional[State]:
+    """Satırın veritabanındaki hali; Product'ta işletme menü üzerinden (tek join)."""
+    path, names = COUNTERS[model]
+    fields = {path} | {cond[0] for cond in names.values() if cond is not None}
+    row = model.objects.filter(pk=pk).values(*fields).first()
+    if row is None:
+        return None
+    matched = tuple(name for name, cond in names.items() if cond is None or row[cond[0]] == cond[1])
+    return row[path], matched
+
+
+def deltas(old: Optional[State], new: Optional[State]) -> Dict[Tuple[int, str], int]:
+    """Eski ve yeni durum arasındaki (business_id, sayaç) -> fark; sıfırlar atılır."""
+    out: Dict[Tuple[int, str], int] = defaultdict(int)
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        business, names = state
+        for name in names:
+            out[(business, name)] += sign
+    return {key: d for key, d in out.items() if d}
+
+
+def moved_deltas(model, pk, old: Optional[State], new: Optional[State]) -> Dict[Tuple[int, str], int]:
+    """Üst kayıt işletme değiştirdiyse bağlı kayıtların sayaçları eski işletmeden yenisine (tek sorgu)."""
+    if model not in MOVES_WITH or old is None or new is None or old[0] == new[0]:
+        return {}
+    child, fk = MOVES_WITH[model]
+    _, names = COUNTERS[child]
+    counts = child.objects.filter(**{fk: pk}).aggregate(**{
+        name: Count("pk", filter=Q(**dict([cond])) if cond is not None else None) for name, cond in names.items()
+    })
+    out: Dict[Tuple[int, str], int] = {}
+    for name, n in counts.items():
+        if n:
+            out[(old[0], name)] = -n
+            out[(new[0], name)] = n
+    return out
+
+
+def _live_by_business(model, business: Optional[int] = None):
+    """Model başına tek GROUP BY: {business_id: {sayaç: gerçek değer}}."""
+    path, names = COUNTERS[model]
+    qs = model.objects.order_by()
+    if business is not None:
+        qs = qs.filter(**{path: business})
+    rows = qs.values(path).annotate(**{
+        name: Count("pk", filter=Q(**dict([cond])) if cond is not None else None) for name, cond in names.items()
+    })
+    return {row[path]: {name: row[name] for name in names} for row in rows}
+
+
+def _seed(name: str) -> None:
+    """Hiç satırı olmayan sayacı tüm işletmeler için canlı sayımdan (kaydı olmayana 0) oluşturur."""
+    live = {biz: values[name] for biz, values in _live_by_business(NAMES[name]).items()}
+    for biz in CoreBusinesses.objects.values_list("pk", flat=True):
+        live.setdefault(biz, 0)
+    StatusCounter.objects.bulk_create(
+        [StatusCounter(business_id=biz, name=name, value=value) for biz, value in live.items()],
+        ignore_conflicts=True,
+    )
+
+
+def _bump(business: int, name: str, delta: int) -> None:
+    rows = StatusCounter.objects.filter(business_id=business, name=name)
+    if rows.update(value=F("value") + delta):
+        return
+    if not StatusCounter.objects.filter(name=name).exists():
+        _seed(name)  # yazım zaten kaydedildi: canlı sayım farkı da içerir
+        return
+    # satır yok: yazım zaten kaydedildiği için canlı sayım farkı da içerir
+    _, created = StatusCounter.objects.get_or_create(
+        business_id=business, name=name, defaults={"value": live_count(name, business)},
+    )
+    if not created:
+        rows.update(value=F("value") + delta)
+
+
+def apply(changes: Dict[Tuple[int, str], int]) -> None:
+    """Farkları tek transaction'da uygular; sabit sıra, eşzamanlı yazımlarda kilitlenmeyi önler."""
+    if not changes:
+        return
+    with transaction.atomic():
+        for (business, name), delta in sorted(changes.items()):
+            _bump(business, name, delta)
+
+
+def global_values(names: Iterable[str]):
+    """Global değerler: işletme satırlarının toplamı, sayaç başına bir satır (name, value)."""
+    return (
+        StatusCounter.objects.order_by()
+        .filter(name__in=list(names)).exclude(business_id=GLOBAL)
+        .values("name")
+        .annotate(value=Cast(Sum("value"), BigIntegerField()))  # Postgres'te SUM(bigint) numeric döner
+        .values_list("name", "value")
+    )
+
+
+def get(names: Iterable[str], business: int = GLOBAL) -> Dict[str, int]:
+    """Sayaçlar tek indeksli okumayla; eksik satırlar canlı sayımla oluşturulur."""
+    names = list(names)
+    if business == GLOBAL:
+        values = dict(global_values(names))
+        for name in names:
+            if name not in values:
+                _seed(name)
+                values[name] = live_count(name)
+        return {name: values[name] for name in names}
+    values = dict(
+        StatusCounter.objects.filter(business_id=business, name__in=names).values_list("name", "value")
+    )
+    for name in names:
+        if name not in values:
+            obj, _ = StatusCounter.objects.get_or_create(
+                business_id=business, name=name, defaults={"value": live_count(name, business)},
+            )
+            values[name] = obj.value
+    return {name: values[name] for name in names}
+
+
+def reconcile(business: Optional[int] = None, dry_run: bool = False) -> List[Tuple[int, str, Optional[int], int]]:
+    """
+    Sayaçları gerçek sayımlarla karşılaştırır ve onarır. Model başına tek
+    GROUP BY sorgusu. Dönüş: sapan sayaçlar
+    [(business_id, sayaç, tablodaki değer | None, gerçek değer)].
+    business verilirse yalnızca o işletme kontrol edilir. Eski sürümlerden
+    kalan business_id=0 (global) satırları silinir.
+    """
+    actual: Dict[Tuple[int, str], int] = {}
+    for model in COUNTERS:
+        for biz, values in _live_by_business(model, business).items():
+            for name, value in values.items():
+                actual[(biz, name)] = value
+
+    drift = []
+    with transaction.atomic():
+        if not dry_run:
+            StatusCounter.objects.filter(business_id=GLOBAL).delete()
+        stored = StatusCounter.objects.select_for_update().exclude(business_id=GLOBAL)
+        if business is not None:
+            stored = stored.filter(business_id=business)
+        stored = {(row.business_id, row.name): row for row in stored}
+        for key in sorted(set(actual) | set(stored)):
+            row, value = stored.get(key), actual.get(key, 0)
+            if (row.value if row is not None else 0) == value:
+                continue  # eksik satır 0 demektir; ilk kullanımda canlı sayımla oluşur
+            drift.append((key[0], key[1], row.value if row is not None else None, value))
+            if dry_run:
+                continue
+            if row is None:
+                StatusCounter.objects.create(business_id=key[0], name=key[1], value=value)
+            else:
+                StatusCounter.objects.filter(pk=row.pk).update(value=value)
+    return drift
+
+
+def forget_business(business: int) -> int:
+    """Silinen işletmenin sayaç satırları (bağlı kayıtlar cascade ile zaten düşülmüştür)."""
+    deleted, _ = StatusCounter.objects.filter(business_id=business).delete()
+    return deleted
@@ -0,0 +1,288 @@
+# pardonai/dashboard/cube.py
+"""
+ProductMetric üzerinde çok boyutlu agregasyon küpü.
+
+Boyutlar:
+  - product: gruplama anahtarı (groupby=name -> product_name, id -> product_id)
+  - bucket: gün / hafta / ay (Trunc); tarihsiz satırlar bucket içeren
+    kümelerde yer almaz, diğer kümelerin toplamlarına girer
+ProductMetric'in henüz işletme (Businesses) bağlantısı yoktur; bağlandığında
+DIMENSIONS'a bir kolon eklemek yeterlidir.
+
+Kümeler (grouping sets) tek sorguda hesaplanır:
+  - PostgreSQL: GROUP BY GROUPING SETS (...) + GROUPING() bit maskesi
+  - diğerleri (SQLite): en ince küme tek GROUP BY ile alınır, kaba kümeler
+    bellekte ondan toplanır (ölçüler toplamsal olduğu için birebir aynı)
+Kaynak, rollup güncelse product_metric_daily'dir.
+
+Önbelleğe alınan küp dims üzerindeki tüm alt kümeleri (CUBE) içerir;
+sets parametresi yalnızca yanıta konacak kümeleri seçer.
+
+Sonuç tipli dizilerdir (numpy varsa ndarray, yoksa array.array): boyut
+değerleri bir kez `levels` sözlüğünde tutulur, kümeler bu sözlüğe kod (int32)
+ve ölçü dizileri (float64 / int64) taşır. Pareto, top-N ve drift aynı küpten
+dilimlenir (Cube.ranked, Cube.get).
+"""
+from __future__ import annotations
+from array import array
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.db import connection
+from django.db.models import DateField, F, IntegerField, Value
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils.dateparse import parse_date
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+DIMENSIONS = ("product", "bucket")
+BUCKETS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+# ölçü -> (ham kolon, rollup kolonu, tip)
+MEASURES = {
+    "sum_profit": ("total_profit", "sum_profit", "float64"),
+    "sum_click": ("click", "sum_click", "int64"),
+    "sum_sales": ("sales", "sum_sales", "int64"),
+    "row_count": (None, "row_count", "int64"),
+}
+TOTAL = "total"  # boş küme (genel toplam) için sets parametresindeki ad
+
+GroupingSet = Tuple[str, ...]
+
+
+class CubeError(ValueError):
+    pass
+
+
+def _typed(values, kind: str):
+    if np is not None:
+        return np.asarray(values, dtype={"int32": np.int32, "int64": np.int64, "float64": np.float64}[kind])
+    return array({"int32": "i", "int64": "q", "float64": "d"}[kind], values)
+
+
+def parse_dims(raw: str) -> Tuple[str, ...]:
+    dims = tuple(d.strip().lower() for d in (raw or "product").split(",") if d.strip())
+    unknown = [d for d in dims if d not in DIMENSIONS]
+    if unknown or not dims or len(set(dims)) != len(dims):
+        raise CubeError(f"dims must be distinct values of: {', '.join(DIMENSIONS)}")
+    return dims
+
+
+def parse_sets(raw: str, dims: Sequence[str]) -> List[GroupingSet]:
+    """
+    sets=product:bucket,product,total  (":" boyutları birleştirir, total = genel
+    toplam). Boşsa ROLLUP(dims): (d1..dn), (d1..dn-1), ..., ().
+    """
+    if not (raw or "").strip():
+        return [tuple(dims[:i]) for i in range(len(dims), -1, -1)]
+    out: List[GroupingSet] = []
+    for part in raw.split(","):
+        part = part.strip().lower()
+        s = () if part == TOTAL else tuple(d for d in dims if d in part.split(":"))
+        if part != TOTAL and len(s) != len(part.split(":")):
+            raise CubeError(f"set {part!r} uses dimensions outside dims={','.join(dims)}")
+        if s not in out:
+            out.append(s)
+    return out
+
+
+def all_sets(dims: Sequence[str]) -> List[GroupingSet]:
+    """CUBE(dims): büyükten küçüğe tüm alt kümeler."""
+    return [s for n in range(len(dims), -1, -1) for s in combinations(tuple(dims), n)]
+
+
+class CubeSet:
+    """Bir grouping set: boyut başına kod dizisi + ölçü dizileri (aynı uzunlukta)."""
+
+    def __init__(self, dims: GroupingSet, codes: Dict[str, Any], measures: Dict[str, Any]):
+        self.dims = dims
+        self.codes = codes
+        self.measures = measures
+
+    def __len__(self) -> int:
+        return len(next(iter(self.measures.values()))) if self.measures else 0
+
+    def column(self, name: str) -> list:
+        """Kod ya da ölçü dizisi düz liste olarak (ndarray ve array.array ikisi de tolist bilir)."""
+        return (self.codes[name] if name in self.codes else self.measures[name]).tolist()
+
+
+class Cube:
+    def __init__(self, dims: Tuple[str, ...], levels: Dict[str, list], sets: Dict[GroupingSet, CubeSet],
+                 engine: str, bucket: Optional[str] = None):
+        self.dims = dims
+        self.levels = levels
+        self.sets = sets
+        self.engine = engine
+        self.bucket = bucket
+
+    def get(self, dims: Sequence[str]) -> CubeSet:
+        key = tuple(d for d in self.dims if d in dims)
+        if key not in self.sets:
+            raise CubeError(f"grouping set ({', '.join(key) or TOTAL}) was not computed")
+        return self.sets[key]
+
+    def ranked(self, dim: str = "product", measure: str = "sum_profit", **where) -> Tuple[list, List[float]]:
+        """
+        `dim` değerleri ve ölçü, ölçüye göre DESC (eşitlikte değer ASC);
+        where (ör. bucket=date) kümeyi diğer boyutların bir değerine kısıtlar.
+        _query_aggregate'in labels / profit çiftiyle aynı biçim.
+        """
+        cs = self.get((dim, *where))
+        mask = None
+        for d, value in where.items():
+            try:
+                code = self.levels[d].index(value)
+            except ValueError:
+                return [], []
+            hit = [c == code for c in cs.codes[d]]
+            mask = hit if mask is None else [a and b for a, b in zip(mask, hit)]
+        levels = self.levels[dim]
+        pairs = [
+            (levels[c], float(v))
+            for i, (c, v) in enumerate(zip(cs.codes[dim], cs.measures[measure]))
+            if mask is None or mask[i]
+        ]
+        pairs.sort(key=lambda t: (-t[1], t[0]))
+        return [p[0] for p in pairs], [p[1] for p in pairs]
+
+    def to_payload(self) -> Dict[str, Any]:
+        levels = {d: [v.isoformat() if hasattr(v, "isoformat") else v for v in vals] for d, vals in self.levels.items()}
+        return {
+            "dims": list(self.dims),
+            "bucket": self.bucket,
+            "engine": self.engine,
+            "levels": levels,
+            "sets": [
+                {
+                    "dims": list(s),
+                    "codes": {d: cs.column(d) for d in s},
+                    **{m: cs.column(m) for m in cs.measures},
+                }
+                for s, cs in self.sets.items()
+            ],
+        }
+
+
+# --------------------- sorgu ---------------------
+def _inner_sql(base, key: str, day_field: str, rollup: bool, dims, bucket: Optional[str]):
+    cols: Dict[str, Any] = {}
+    if "product" in dims:
+        cols["cube_product"] = F(key)
+    if "bucket" in dims:
+        cols["cube_bucket"] = BUCKETS[bucket](day_field, output_field=DateField())
+    for name, (raw_col, rollup_col, _) in MEASURES.items():
+        col = rollup_col if rollup else raw_col
+        cols[f"cube_{name}"] = F(col) if col else Value(1, output_field=IntegerField())
+    return base.values(**cols).order_by().query.sql_with_params()
+
+
+def build_cube(base, key: str, day_field: str, dims: Sequence[str], sets: Sequence[GroupingSet],
+               bucket: Optional[str] = None, max_cells: Optional[int] = None) -> Cube:
+    """
+    base: filtrelenmiş ProductMetric ya da ProductMetricDaily queryset'i
+    (pareto_query.grouped_source), key: product boyutunun kolonu.
+    """
+    dims = tuple(dims)
+    if "bucket" in dims and bucket not in BUCKETS:
+        raise CubeError(f"bucket must be one of: {', '.join(BUCKETS)}")
+    rollup = day_field == "day"
+    inner, params = _inner_sql(base, key, day_field, rollup, dims, bucket)
+    q = connection.ops.quote_name
+    dim_cols = [f"t.{q('cube_' + d)}" for d in dims]
+    sums = ", ".join(f"SUM(t.{q('cube_' + m)})" for m in MEASURES)
+
+    with connection.cursor() as cur:
+        if connection.vendor == "postgresql" and dims:
+            grouping = ", ".join(
+                "(" + ", ".join(f"t.{q('cube_' + d)}" for d in s) + ")" for s in sets
+            )
+            cur.execute(
+                f"SELECT {', '.join(dim_cols)}, GROUPING({', '.join(dim_cols)}), {sums} "
+                f"FROM ({inner}) t GROUP BY GROUPING SETS ({grouping})",
+                params,
+            )
+            rows = cur.fetchall()
+            engine = "grouping_sets"
+        else:
+            group = f" GROUP BY {', '.join(dim_cols)}" if dims else ""
+            cur.execute(f"SELECT {', '.join(dim_cols + [sums])} FROM ({inner}) t{group}", params)
+            rows = cur.fetchall()
+            engine = "emulated"
+
+    nd = len(dims)
+    if "bucket" in dims and connection.vendor != "postgresql":
+        # ham cursor: SQLite kova değerlerini 'YYYY-MM-DD' metni olarak döndürür
+        b = dims.index("bucket")
+        rows = [r[:b] + (parse_date(r[b][:10]) if isinstance(r[b], str) else r[b],) + r[b + 1:] for r in rows]
+    finest = [r for r in rows if r[nd] == 0] if engine == "grouping_sets" else rows
+    if max_cells is not None and len(finest) > max_cells:
+        raise CubeError(f"{len(finest)} cells (max {max_cells}); narrow the filters or use a wider bucket")
+
+    levels = {d: sorted({r[i] for r in finest if r[i] is not None}) for i, d in enumerate(dims)}
+    # NULL (tarihsiz satır) koda çevrilirken sözlüğün dışındaki son kodu alır
+    index = {d: {**{v: c for c, v in enumerate(levels[d])}, None: len(levels[d])} for d in dims}
+
+    out: Dict[GroupingSet, CubeSet] = {}
+    if engine == "grouping_sets":
+        # GROUPING(a, b): ilk boyut en anlamlı bit; 1 = o boyut toplanmış
+        by_mask: Dict[int, list] = {}
+        for r in rows:
+            by_mask.setdefault(r[nd], []).append(r)
+        for s in sets:
+            mask = sum(1 << (nd - 1 - i) for i, d in enumerate(dims) if d not in s)
+            part = [r for r in by_mask.get(mask, []) if all(r[dims.index(d)] is not None for d in s)]
+            out[s] = _make_set(s, {d: [index[d][r[dims.index(d)]] for r in part] for d in s},
+                               [[r[nd + 1 + j] for r in part] for j in range(len(MEASURES))])
+    else:
+        codes = {d: [index[d][r[i]] for r in finest] for i, d in enumerate(dims)}
+        values = [[r[nd + j] for r in finest] for j in range(len(MEASURES))]
+        sizes = {d: len(levels[d]) + 1 for d in dims}
+        for s in sets:
+            keep = [i for i in range(len(finest)) if all(codes[d][i] < sizes[d] - 1 for d in s)]
+            if len(keep) < len(finest):
+                s_codes = {d: [c[i] for i in keep] for d, c in codes.items()}
+                s_values = [[col[i] for i in keep] for col in values]
+            else:
+                s_codes, s_values = codes, values
+            out[s] = _rollup(s, dims, s_codes, s_values, sizes)
+    return Cube(dims, levels, out, engine, bucket if "bucket" in dims else None)
+
+
+def _make_set(s: GroupingSet, codes: Dict[str, list], values: List[list]) -> CubeSet:
+    measures = {
+        # PostgreSQL SUM(bigint) Decimal döndürür; array.array yalnızca int / float kabul eder
+        m: _typed([(float if kind == "float64" else int)(v or 0) for v in col], kind)
+        for (m, (_, _, kind)), col in zip(MEASURES.items(), values)
+    }
+    return CubeSet(s, {d: _typed(c, "int32") for d, c in codes.items()}, measures)
+
+
+def _rollup(s: GroupingSet, dims, codes: Dict[str, list], values: List[list], sizes: Dict[str, int]) -> CubeSet:
+    """En ince kümeden `s` kümesine toplama (GROUPING SETS emülasyonu)."""
+    if s == tuple(dims):
+        return _make_set(s, codes, values)
+    if np is not None and codes:
+        n = len(values[0])
+        if s:
+            flat = np.ravel_multi_index([np.asarray(codes[d], dtype=np.int64) for d in s], [sizes[d] for d in s])
+            keys, inverse = np.unique(flat, return_inverse=True)
+            parts = np.unravel_index(keys, [sizes[d] for d in s])
+        else:
+            inverse, parts = np.zeros(n, dtype=np.int64), ()
+        m = len(parts[0]) if s else (1 if n else 0)
+        sums = [np.bincount(inverse, weights=np.asarray([v or 0 for v in col], dtype=np.float64), minlength=m)
+                for col in values]
+        return _make_set(s, {d: p.tolist() for d, p in zip(s, parts)}, [x.tolist() for x in sums])
+
+    acc: Dict[Tuple[int, ...], List[float]] = {}
+    for i in range(len(values[0]) if values else 0):
+        k = tuple(codes[d][i] for d in s)
+        row = acc.setdefault(k, [0] * len(values))
+        for j, col in enumerate(values):
+            row[j] += col[i] or 0
+    keys = sorted(acc)
+    return _make_set(s, {d: [k[j] for k in keys] for j, d in enumerate(s)},
+                     [[acc[k][j] for k in keys] for j in range(len(values))])
@@ -0,0 +1,91 @@
+# pardonai/dashboard/exports.py
+"""
+Pareto dışa aktarımının ortak parçaları: CSV satır akışı, format seçimi,
+cursor parçaları ve Arrow/Parquet akışı (arrow_export).
+
+Gruplanmış satırlar DB cursor'ından parça parça okunur; bellek ürün ya da
+satır sayısından bağımsızdır.
+"""
+from __future__ import annotations
+
+from django.db import connection
+from django.db.models import Sum
+from django.http import StreamingHttpResponse
+
+from . import arrow_export
+from .pareto_query import get_params, get_product_ids, grouped_source
+
+
+EXPORT_CHUNK_SIZE = 2000  # dışa aktarımda cursor'dan tek seferde okunan satır
+RAW_EXPORT_CHUNK_SIZE = 20000  # ham satır parçası ve Arrow/Parquet record batch (row group) boyutu
+EXPORT_FORMATS = ("csv",) + tuple(arrow_export.FORMATS)
+
+class Echo:
+    """csv.writer için sahte dosya: yazılan satırı olduğu gibi döndürür."""
+    def write(self, value):
+        return value
+
+def export_stream(request):
+    """
+    Dışa aktarım için (total, satır üreteci). Toplam önceden tek SUM ile alınır;
+    gruplanmış satırlar DB cursor'ından parça parça okunur ve kümülatif yüzde
+    akış sırasında hesaplanır. Bellek ürün sayısından bağımsızdır.
+    Üreteç (label, row, cum_pct) verir.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    base, key, annotations, profit_field = grouped_source(
+        date_from, date_to, search, groupby, get_product_ids(request)
+    )
+    total = float(base.aggregate(t=Sum(profit_field))["t"] or 0.0)
+    # eşit kârlarda etikete göre: /api/pareto ve tablo ile aynı sıra (sum_profit DESC, label ASC)
+    grouped = base.values(key).annotate(**annotations).order_by("-sum_profit", key)
+
+    def rows():
+        run = 0.0
+        for r in grouped.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            run += float(r["sum_profit"] or 0)
+            yield r[key], r, (run / total * 100.0 if total else 0.0)
+
+    return total, rows()
+
+def export_format(request) -> str:
+    """format=csv|parquet|arrow; Arrow/Parquet pyarrow gerektirir (ValueError)."""
+    fmt = (request.GET.get("format") or "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt != "csv" and not arrow_export.available():
+        raise ValueError(f"format={fmt} requires pyarrow")
+    return fmt
+
+def cursor_chunks(qs, size: int):
+    """
+    Queryset'in satırlarını ORM dönüşümü olmadan, DB cursor'ından `size`'lık
+    demet listeleri olarak okur (PostgreSQL'de sunucu taraflı cursor).
+    """
+    sql, params = qs.query.sql_with_params()
+    with connection.chunked_cursor() as cur:
+        cur.execute(sql, params)
+        while True:
+            chunk = cur.fetchmany(size)
+            if not chunk:
+                return
+            yield chunk
+
+def binary_export(fmt: str, columns, column_batches, name: str) -> StreamingHttpResponse:
+    content_type, ext = arrow_export.FORMATS[fmt]
+    resp = StreamingHttpResponse(arrow_export.stream(fmt, columns, column_batches), content_type=content_type)
+    resp["Content-Disposition"] = f'attachment; filename="{name}.{ext}"'
+    return resp
+
+def aggregate_export(request, fmt: str, name: str) -> StreamingHttpResponse:
+    """Gruplanmış dışa aktarım (Arrow/Parquet): label + AGGREGATE_COLUMNS, yuvarlamasız."""
+    _, _, _, groupby, _ = get_params(request)
+    _total, rows = export_stream(request)
+    tuples = (
+        (label, float(r["sum_profit"] or 0), c, int(r["sum_click"] or 0), int(r["sum_sales"] or 0),
+         float(r["avg_cost"] or 0), float(r["avg_price"] or 0),
+         float(r["avg_unit_profit"] or 0), float(r["avg_ppc"] or 0))
+        for label, r, c in rows
+    )
+    columns = [arrow_export.label_column(groupby)] + arrow_export.AGGREGATE_COLUMNS
+    return binary_export(fmt, columns, arrow_export.batches(tuples, RAW_EXPORT_CHUNK_SIZE), f"{name}_{groupby}")
@@ -0,0 +1,62 @@
+# pardonai/dashboard/fastjson.py
+"""
+API yanıtları için JSON serileştirme ve columnar biçim.
+
+Serileştirici: orjson kuruluysa onunla (numpy dizileri dahil), değilse stdlib
+json ile. Her iki yol da kompakt çıktı üretir (boşluksuz, ensure_ascii=False);
+orjson'un bilmediği tipler (Decimal vb.) DjangoJSONEncoder'a düşer, böylece
+çıktı JsonResponse ile aynı kalır.
+
+format=columnar: satır başına sözlük yerine paralel diziler. Anahtar adları
+bir kez yazılır; scatter setleri etiket dizisini paylaşır.
+"""
+from __future__ import annotations
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from .timing import phase
+
+try:
+    import orjson  # type: ignore
+except Exception:  # orjson yoksa stdlib
+    orjson = None  # type: ignore
+
+_ENCODER = DjangoJSONEncoder()
+
+
+def backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=_ENCODER.default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return dumps_stdlib(data)
+
+
+def dumps_stdlib(data: Any) -> bytes:
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJsonResponse(HttpResponse):
+    """JsonResponse yerine: gövde dumps() ile üretilir."""
+
+    def __init__(self, data: Any, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        with phase("serialize"):
+            content = dumps(data)
+        super().__init__(content=content, **kwargs)
+
+
+def wants_columnar(request) -> bool:
+    return (request.GET.get("format") or "").lower() == "columnar"
+
+
+def columns(records: Sequence[Mapping[str, Any]], names: Optional[Iterable[str]] = None) -> Dict[str, List[Any]]:
+    """[{"a": 1, "b": 2}, ...] -> {"a": [1, ...], "b": [2, ...]}"""
+    if names is None:
+        names = records[0].keys() if records else ()
+    return {name: [r[name] for r in records] for name in names}
@@ -0,0 +1,90 @@
+# pardonai/dashboard/histogram.py
+"""
+Gruplanmış agregatların histogramı veritabanında.
+
+Girdi, gruplama anahtarı başına bir değer üreten bir queryset'tir (ör.
+values(key).annotate(avg_ppc=...)); bu sorgu alt sorgu olarak sarılır ve
+yalnızca kova sayıları döner. Aktarım ve bellek O(bins)'tir.
+
+Kovalama:
+  - PostgreSQL: width_bucket(v, lo, hi, bins)
+  - diğerleri (SQLite): CASE + CAST((v - lo) * bins / (hi - lo) AS INTEGER)
+  - quantile: NTILE(bins) OVER (ORDER BY v); her kova eşit sayıda grup içerir,
+    kenarlar kovaların min/maks değerlerinden gelir.
+  - log ölçek: LN(v) üzerinde eşit genişlik (yalnızca v > 0; diğerleri
+    excluded olarak sayılır). SQLite'ta LN, Django'nun bağlantıya kaydettiği
+    fonksiyondur.
+
+Kenarlar numpy.histogram ile aynıdır: [lo, hi] aralığı eşit bölünür, son
+kova hi'yi içerir; lo == hi ise aralık +-0.5 genişletilir.
+"""
+from __future__ import annotations
+from math import exp
+from typing import Any, Dict
+
+from django.db import connection
+
+
+def _is_postgres() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def sql_histogram(grouped_qs, field: str, bins: int = 10, scale: str = "linear", quantile: bool = False) -> Dict[str, Any]:
+    """grouped_qs'in `field` kolonunun histogramı: {"hist", "edges", "excluded"}."""
+    inner, inner_params = grouped_qs.query.sql_with_params()
+    col = f"t.{connection.ops.quote_name(field)}"
+    log = scale == "log" and not quantile
+    val = f"LN({col})" if log else col
+    cond = f"{col} IS NOT NULL" + (f" AND {col} > 0" if log else "")
+
+    with connection.cursor() as cur:
+        if quantile:
+            cur.execute(
+                f"SELECT tile, MIN(v), MAX(v), COUNT(*) FROM ("
+                f"SELECT {col} AS v, NTILE(%s) OVER (ORDER BY {col}) AS tile "
+                f"FROM ({inner}) t WHERE {cond}) q GROUP BY tile ORDER BY tile",
+                [bins, *inner_params],
+            )
+            tiles = cur.fetchall()
+            if not tiles:
+                return {"hist": [], "edges": [], "excluded": 0}
+            return {
+                "hist": [int(r[3]) for r in tiles],
+                "edges": [float(r[1]) for r in tiles] + [float(tiles[-1][2])],
+                "excluded": 0,
+            }
+
+        cur.execute(
+            f"SELECT MIN(CASE WHEN {cond} THEN {val} END), MAX(CASE WHEN {cond} THEN {val} END), "
+            f"SUM(CASE WHEN {cond} THEN 1 ELSE 0 END), "
+            f"SUM(CASE WHEN {col} IS NOT NULL AND NOT ({cond}) THEN 1 ELSE 0 END) "
+            f"FROM ({inner}) t",
+            inner_params,
+        )
+        lo, hi, count, excluded = cur.fetchone()
+        excluded = int(excluded or 0)
+        if not count:
+            return {"hist": [], "edges": [], "excluded": excluded}
+        lo, hi = float(lo), float(hi)
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+
+        if _is_postgres():
+            bucket = f"LEAST(width_bucket({val}, %s, %s, %s), %s) - 1"
+            bucket_params = [lo, hi, bins, bins]
+        else:
+            bucket = f"CASE WHEN {val} >= %s THEN %s ELSE CAST(({val} - %s) * %s / (%s - %s) AS INTEGER) END"
+            bucket_params = [hi, bins - 1, lo, float(bins), hi, lo]
+        cur.execute(
+            f"SELECT b, COUNT(*) FROM (SELECT {bucket} AS b FROM ({inner}) t WHERE {cond}) s GROUP BY b",
+            [*bucket_params, *inner_params],
+        )
+        hist = [0] * bins
+        for b, n in cur.fetchall():
+            hist[min(max(int(b), 0), bins - 1)] += int(n)
+
+    step = (hi - lo) / bins
+    edges = [lo + i * step for i in range(bins)] + [hi]
+    if log:
+        edges = [exp(e) for e in edges]
+    return {"hist": hist, "edges": edges, "excluded": excluded}
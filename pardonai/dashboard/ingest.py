@@ -0,0 +1,347 @@
+# pardonai/dashboard/ingest.py
+"""
+products.csv biçimindeki dosyaları product_metric'e toplu yükleme.
+
+Dosya parça parça okunur (CSV: pandas chunksize, XLSX: openpyxl read_only),
+başlıklar model alanlarına eşlenir, sayı/para birimi kolonları pandas ile
+vektörel ayrıştırılır ve her parça tek transaction'da yazılır:
+  - PostgreSQL: COPY ... FROM STDIN (CSV)
+  - diğerleri: parametreli çok satırlı INSERT (executemany)
+
+Upsert anahtarı (product_id, ts): tabloda benzersiz kısıt olmadığından
+(tarihsel veride aynı gün birden çok satır olabilir) ON CONFLICT yerine parça
+içindeki anahtarlara ait eski satırlar önce silinir, sonra yenileri eklenir.
+Parça içinde tekrar eden anahtarlarda son satır kazanır.
+
+Tarihler: YYYY-AA-GG (ISO) metinler her zaman açık ISO biçimiyle okunur;
+dayfirst (varsayılan açık, gg.aa.yyyy) yalnızca geri kalan biçimlere uygulanır.
+Böylece aynı dosyadaki "2025-03-04" ve "04.03.2025" aynı güne düşer.
+
+Bellek parça boyutuyla sınırlıdır; dosya boyutundan bağımsızdır.
+"""
+from __future__ import annotations
+import io
+import re
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+from django.db import connection, transaction
+
+from .models import ProductMetric
+from .pareto_cache import invalidate_all
+from .rollup import mark_dirty
+from .search import fold_search
+from .sketch import GROUPBY_FIELDS, merge_day_sums, rebuild_days as rebuild_sketch_days
+
+try:
+    import pandas as pd  # type: ignore
+    import numpy as np  # type: ignore
+except Exception:
+    pd = None  # type: ignore
+    np = None  # type: ignore
+
+DEFAULT_CHUNK_SIZE = 50_000
+DELETE_BATCH = 500  # SQLite parametre sınırı için IN (...) başına ürün sayısı
+
+# normalize başlık -> model alanı
+HEADER_MAP = {
+    "product id": "product_id",
+    "product name": "product_name",
+    "click": "click",
+    "sales": "sales",
+    "click/sales": "click_per_sale",
+    "cost (₺)": "cost",
+    "cost": "cost",
+    "sales price (₺)": "sales_price",
+    "sales price": "sales_price",
+    "unit profit": "unit_profit",
+    "total profit": "total_profit",
+    "profit/click": "profit_per_click",
+    "ts": "ts",
+    "date": "ts",
+    "tarih": "ts",
+}
+REQUIRED = ("product_id", "product_name", "click", "sales", "cost", "sales_price")
+INT_FIELDS = ("product_id", "click", "sales")
+FLOAT_FIELDS = ("click_per_sale", "cost", "sales_price", "unit_profit", "total_profit", "profit_per_click")
+LOAD_COLUMNS = [
+    "product_id", "product_name", "product_name_search", "click", "sales", "click_per_sale",
+    "cost", "sales_price", "unit_profit", "total_profit", "profit_per_click", "ts",
+]
+
+_NUMBER_NOISE = re.compile(r"[₺$€\s\u00a0]|TL", re.IGNORECASE)
+_ISO_DATE = r"^\d{4}-\d{1,2}-\d{1,2}(?:[T ].*)?$"
+
+
+class IngestError(ValueError):
+    pass
+
+
+def _norm_header(h) -> str:
+    return " ".join(str(h).replace("\ufeff", "").split()).lower()
+
+
+# --------------------- okuma ---------------------
+def read_chunks(path, chunk_size: int = DEFAULT_CHUNK_SIZE, sheet: Optional[str] = None) -> Iterator["pd.DataFrame"]:
+    """Dosyayı chunk_size satırlık DataFrame parçaları olarak verir."""
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        yield from _read_xlsx_chunks(path, chunk_size, sheet)
+        return
+    # utf-8-sig: BOM'u atar; tüm kolonlar metin okunur, ayrıştırma bizde
+    yield from pd.read_csv(
+        path, chunksize=chunk_size, dtype=str, encoding="utf-8-sig",
+        keep_default_na=False, na_values=[""], skipinitialspace=True,
+    )
+
+
+def _read_xlsx_chunks(path: Path, chunk_size: int, sheet: Optional[str]):
+    try:
+        from openpyxl import load_workbook  # type: ignore
+    except Exception as e:
+        raise IngestError("XLSX okumak için openpyxl gerekli") from e
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.active
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
+
+
+# --------------------- ayrıştırma ---------------------
+def _parse_text_numbers(s: "pd.Series", decimal: str) -> "pd.Series":
+    s = s.astype("string").str.replace(_NUMBER_NOISE, "", regex=True)
+    if decimal == ",":
+        s = s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    else:
+        s = s.str.replace(",", "", regex=False)
+    return pd.to_numeric(s, errors="coerce").astype("float64")
+
+
+def to_number(s: "pd.Series", decimal: str = ".") -> "pd.Series":
+    """'1.234,56 ₺' / '1,234.56' / 295.5 -> float64 (geçersizler NaN)."""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype("float64")
+    if s.dtype == object:
+        # XLSX: sayı hücreleri zaten sayı, yalnızca metin hücreleri ayrıştırılır
+        is_num = s.map(lambda v: isinstance(v, (int, float)) and not isinstance(v, bool))
+        if is_num.all():
+            return s.astype("float64")
+        if is_num.any():
+            out = _parse_text_numbers(s.where(~is_num), decimal)
+            out[is_num] = s[is_num].astype("float64")
+            return out
+    return _parse_text_numbers(s, decimal)
+
+
+def to_dates(s: "pd.Series", dayfirst: bool = True) -> "pd.Series":
+    """
+    Tarih kolonu -> datetime64 (geçersizler NaT). ISO metinler format="ISO8601"
+    ile, geri kalanlar (gg.aa.yyyy, XLSX tarih hücreleri ...) dayfirst ile.
+    """
+    text = s.astype("string").str.strip()
+    iso = text.str.match(_ISO_DATE).fillna(False).astype(bool)
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    if iso.any():
+        out[iso] = pd.to_datetime(text[iso], errors="coerce", format="ISO8601")
+    rest = ~iso & text.notna() & (text != "")
+    if rest.any():
+        out[rest] = pd.to_datetime(s[rest], errors="coerce", format="mixed", dayfirst=dayfirst)
+    return out
+
+
+def _safe_div(a, b):
+    return np.divide(a, b, out=np.zeros(len(a), dtype=np.float64), where=b != 0)
+
+
+def normalize_chunk(
+    df: "pd.DataFrame", decimal: str = ".", ts: Optional[date] = None, dayfirst: bool = True,
+) -> Tuple["pd.DataFrame", int]:
+    """
+    Ham parçayı LOAD_COLUMNS biçimine getirir. Eksik türetilmiş kolonlar
+    (unit_profit, total_profit, click_per_sale, profit_per_click) hesaplanır.
+    Dönüş: (temiz DataFrame, atlanan satır sayısı)
+    """
+    df = df.rename(columns={c: HEADER_MAP.get(_norm_header(c), _norm_header(c)) for c in df.columns})
+    missing = [c for c in REQUIRED if c not in df.columns]
+    if missing:
+        raise IngestError(f"eksik kolon(lar): {', '.join(missing)}")
+
+    out = pd.DataFrame(index=df.index)
+    for col in INT_FIELDS + FLOAT_FIELDS:
+        if col in df.columns:
+            out[col] = to_number(df[col], decimal)
+
+    names = df["product_name"].astype("string").str.strip()
+    valid = out["product_id"].notna() & names.notna() & (names != "")
+    skipped = int((~valid).sum())
+    out, names = out[valid], names[valid]
+
+    for col in INT_FIELDS:
+        out[col] = out[col].fillna(0).round().astype("int64")
+    for col in ("cost", "sales_price"):
+        out[col] = out[col].fillna(0.0)
+    sales = out["sales"].to_numpy(dtype=np.float64)
+    click = out["click"].to_numpy(dtype=np.float64)
+    if "unit_profit" not in out:
+        out["unit_profit"] = out["sales_price"] - out["cost"]
+    if "total_profit" not in out:
+        out["total_profit"] = out["unit_profit"] * sales
+    if "click_per_sale" not in out:
+        out["click_per_sale"] = _safe_div(click, sales)
+    if "profit_per_click" not in out:
+        out["profit_per_click"] = _safe_div(out["total_profit"].to_numpy(dtype=np.float64), click)
+    for col in FLOAT_FIELDS:
+        out[col] = out[col].fillna(0.0)
+
+    out["product_name"] = names.str.slice(0, 128)
+    folded = {n: fold_search(n) for n in pd.unique(out["product_name"])}
+    out["product_name_search"] = out["product_name"].map(folded)
+
+    if "ts" in df.columns:
+        parsed = to_dates(df.loc[valid, "ts"], dayfirst)
+        out["ts"] = [d.date() if not pd.isna(d) else None for d in parsed]
+        if ts is not None:
+            out["ts"] = [d if d is not None else ts for d in out["ts"]]
+    else:
+        out["ts"] = ts
+
+    # (product_id, ts) tekrarlarında son satır kazanır
+    out = out.drop_duplicates(subset=["product_id", "ts"], keep="last")
+    return out[LOAD_COLUMNS], skipped
+
+
+# --------------------- yazma ---------------------
+def _delete_existing(cur, df: "pd.DataFrame") -> Set[Optional[date]]:
+    """Parçadaki (product_id, ts) anahtarlarının eski satırlarını sil; etkilenen günleri döner."""
+    table = connection.ops.quote_name(ProductMetric._meta.db_table)
+    touched: Set[Optional[date]] = set()
+    for day, ids in df.groupby("ts", dropna=False, sort=False)["product_id"]:
+        day = None if pd.isna(day) else day
+        ids = ids.tolist()
+        for i in range(0, len(ids), DELETE_BATCH):
+            part = ids[i:i + DELETE_BATCH]
+            marks = ", ".join(["%s"] * len(part))
+            if day is None:
+                cur.execute(f"DELETE FROM {table} WHERE ts IS NULL AND product_id IN ({marks})", part)
+            else:
+                cur.execute(f"DELETE FROM {table} WHERE ts = %s AND product_id IN ({marks})", [day] + part)
+            if cur.rowcount:
+                touched.add(day)
+    return touched
+
+
+def _write_copy(cur, df: "pd.DataFrame") -> None:
+    buf = io.StringIO()
+    df.to_csv(buf, header=False, index=False)
+    buf.seek(0)
+    table = connection.ops.quote_name(ProductMetric._meta.db_table)
+    cols = ", ".join(connection.ops.quote_name(c) for c in LOAD_COLUMNS)
+    cur.copy_expert(f"COPY {table} ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _write_bulk(cur, df: "pd.DataFrame") -> None:
+    # bulk_create'in alan başına derleme maliyeti yükün çoğunu oluşturuyordu;
+    # aynı INSERT parametreli executemany ile, değerler doğrudan DataFrame'den
+    table = connection.ops.quote_name(ProductMetric._meta.db_table)
+    cols = ", ".join(connection.ops.quote_name(c) for c in LOAD_COLUMNS)
+    marks = ", ".join(["%s"] * len(LOAD_COLUMNS))
+    df = df.assign(ts=[connection.ops.adapt_datefield_value(d) for d in df["ts"]])
+    cur.executemany(f"INSERT INTO {table} ({cols}) VALUES ({marks})", df.to_numpy(dtype=object).tolist())
+
+
+def _update_sketches(df: "pd.DataFrame", rebuilt: Set[Optional[date]]) -> None:
+    """
+    approx=1 özetleri: eski satırı silinen günler ham tablodan yeniden üretilir,
+    diğer günlere parçanın günlük etiket toplamları birleştirilir.
+    """
+    if rebuilt:
+        rebuild_sketch_days(rebuilt)
+    fresh = df[~df["ts"].isin(rebuilt)] if rebuilt else df
+    if fresh.empty:
+        return
+    for groupby, field in GROUPBY_FIELDS.items():
+        sums = fresh.groupby(["ts", field], dropna=False, sort=False)["total_profit"].sum()
+        day_sums: Dict[Optional[date], Dict[str, float]] = {}
+        for (day, label), value in sums.items():
+            day_sums.setdefault(None if pd.isna(day) else day, {})[str(label)] = float(value)
+        merge_day_sums(day_sums, groupby)
+
+
+def resolve_method(method: str) -> str:
+    if method == "auto":
+        return "copy" if connection.vendor == "postgresql" else "bulk"
+    if method == "copy" and connection.vendor != "postgresql":
+        raise IngestError("COPY yalnızca PostgreSQL'de kullanılabilir")
+    return method
+
+
+def load_file(
+    path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    method: str = "auto",
+    decimal: str = ".",
+    ts: Optional[date] = None,
+    upsert: bool = True,
+    sheet: Optional[str] = None,
+    dayfirst: bool = True,
+    progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Dosyayı product_metric'e yükler. Her parça ayrı transaction'dır; hata
+    durumunda önceki parçalar yazılmış kalır. Dönüş: rows, skipped, chunks,
+    seconds, rows_per_sec, method.
+    """
+    if pd is None:
+        raise IngestError("load_product_metrics için pandas gerekli")
+    method = resolve_method(method)
+    t0 = perf_counter()
+    rows = skipped = chunks = 0
+    try:
+        for raw in read_chunks(path, chunk_size, sheet):
+            df, bad = normalize_chunk(raw, decimal=decimal, ts=ts, dayfirst=dayfirst)
+            skipped += bad
+            if df.empty:
+                continue
+            with transaction.atomic(), connection.cursor() as cur:
+                replaced: Set[Optional[date]] = _delete_existing(cur, df) if upsert else set()
+                if method == "copy":
+                    _write_copy(cur, df)
+                else:
+                    _write_bulk(cur, df)
+                _update_sketches(df, replaced)
+                # rollup: parçanın günleri parçayla aynı transaction'da kirli
+                # (sırasız commit olan id'ler su seviyesinin altında kalabilir)
+                mark_dirty(replaced | {None if pd.isna(d) else d for d in df["ts"].unique()})
+            rows += len(df)
+            chunks += 1
+            if progress:
+                elapsed = perf_counter() - t0
+                progress({"chunks": chunks, "rows": rows, "rows_per_sec": rows / elapsed if elapsed else 0.0})
+    finally:
+        # toplu yazım sinyal üretmez: önbellek boşaltılır
+        if rows:
+            invalidate_all()
+
+    seconds = perf_counter() - t0
+    return {
+        "rows": rows,
+        "skipped": skipped,
+        "chunks": chunks,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else 0.0,
+        "method": method,
+    }
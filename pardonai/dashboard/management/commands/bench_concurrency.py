@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pardonai.dashboard.bench import load, runner
+
+
+class Command(BaseCommand):
+    help = (
+        "Analitik endpoint'lerde süreç başına eşzamanlılığı ölçer: senkron (WSGI worker "
+        "modeli, tek tek) ve async (ASGI, tek event loop'ta --concurrency istek) modları "
+        "ayrı süreçlerde koşar; --url ile çalışan bir sunucuya HTTP yükü verir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", default="1,8,32", help="async/url için virgülle ayrılmış düzeyler")
+        parser.add_argument("--scenarios", default=",".join(load.DEFAULT_SCENARIOS),
+                            help=f"virgülle ayrılmış: {', '.join(load.SCENARIOS)}")
+        parser.add_argument("--modes", default="sync,async", help="sync,async (in-process)")
+        parser.add_argument("--url", default="", help="çalışan sunucu, ör. http://127.0.0.1:8000")
+        parser.add_argument("--db-latency-ms", type=float, default=0.0,
+                            help="in-process modlarda her sorguya eklenen bekleme (uzak DB benzetimi)")
+        parser.add_argument("--out", default="", help="JSON rapor yolu")
+        parser.add_argument("--worker", default="", help=argparse.SUPPRESS)  # alt süreç: "mod:eşzamanlılık"
+
+    def handle(self, *args, **opts):
+        try:
+            levels = [int(c) for c in opts["concurrency"].split(",") if c.strip()]
+        except ValueError:
+            raise CommandError("--concurrency virgülle ayrılmış tam sayılar olmalı")
+        scenarios = [s.strip() for s in opts["scenarios"].split(",") if s.strip()]
+        try:
+            requests = load.plan(opts["requests"], scenarios)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if opts["worker"]:
+            # alt süreç: tek mod, sonuç stdout'a JSON
+            mode, level = opts["worker"].split(":")
+            load.simulate_db_latency(opts["db_latency_ms"])
+            result = load.run_sync(requests) if mode == "sync" else load.run_async(requests, int(level))
+            self.stdout.write(json.dumps(result))
+            return
+
+        results = []
+        if opts["url"]:
+            for level in levels:
+                results.append(load.run_url(opts["url"], requests, level))
+                self.stdout.write(load.fmt(results[-1]))
+        else:
+            for mode in [m.strip() for m in opts["modes"].split(",") if m.strip()]:
+                if mode not in ("sync", "async"):
+                    raise CommandError(f"bilinmeyen mod: {mode}")
+                for level in ([1] if mode == "sync" else levels):
+                    results.append(self._spawn(mode, level, opts))
+                    self.stdout.write(load.fmt(results[-1]))
+
+        if opts["out"]:
+            runner.save_report({
+                "environment": runner.environment(), "scenarios": scenarios,
+                "db_latency_ms": opts["db_latency_ms"], "results": results,
+            }, opts["out"])
+            self.stdout.write(self.style.SUCCESS(f"rapor yazıldı: {opts['out']}"))
+
+    def _spawn(self, mode, level, opts):
+        """Her mod kendi sürecinde: URL'ler DASHBOARD_ASYNC_VIEWS'e göre kurulur."""
+        env = dict(os.environ, DASHBOARD_ASYNC_VIEWS="1" if mode == "async" else "0")
+        cmd = [
+            sys.executable, "-m", "django", "bench_concurrency", "--worker", f"{mode}:{level}",
+            "--requests", str(opts["requests"]), "--scenarios", opts["scenarios"],
+            "--db-latency-ms", str(opts["db_latency_ms"]),
+            "--settings", os.environ.get("DJANGO_SETTINGS_MODULE", "pardonai.settings"),
+        ]
+        out = subprocess.run(cmd, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if out.returncode != 0:
+            raise CommandError(f"{mode} c={level}: {out.stderr.strip()[-2000:]}")
+        return json.loads(out.stdout.strip().splitlines()[-1])
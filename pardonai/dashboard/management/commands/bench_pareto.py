@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pardonai.dashboard.bench import runner
+
+
+class Command(BaseCommand):
+    help = (
+        "Pareto endpoint'lerini sentetik veriyle (10k/100k/1M satır) ölçer; p50/p95 "
+        "gecikme, sorgu sayısı ve tepe belleği JSON rapora yazar. --compare eski.json "
+        "yeni.json iki raporu karşılaştırır. Ölçüm verisi transaction ile geri alınır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=",".join(str(s) for s in runner.DEFAULT_SIZES))
+        parser.add_argument("--scenarios", default="", help=f"virgülle ayrılmış: {', '.join(runner.SCENARIOS)}")
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf üssü; büyüdükçe kâr daha az ürüne yığılır")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--runs", type=int, default=10)
+        parser.add_argument("--warmup", type=int, default=1)
+        parser.add_argument("--warm", action="store_true", help="agregasyon önbelleğini istekler arasında boşaltma")
+        parser.add_argument("--out", default="", help="JSON rapor yolu")
+        parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="iki raporu karşılaştır (ölçüm yapmaz)")
+        parser.add_argument("--threshold", type=float, default=1.2, help="regresyon sayılan yeni/eski oranı")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **opts):
+        if opts["compare"]:
+            return self._compare(*opts["compare"], opts["threshold"], opts["fail_on_regression"])
+
+        try:
+            sizes = [int(s) for s in opts["sizes"].split(",") if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes virgülle ayrılmış tam sayılar olmalı")
+        scenarios = [s.strip() for s in opts["scenarios"].split(",") if s.strip()] or None
+        try:
+            report = runner.run(
+                sizes, scenarios,
+                products=opts["products"], days=opts["days"], skew=opts["skew"], seed=opts["seed"],
+                runs=opts["runs"], warmup=opts["warmup"], cold=not opts["warm"],
+                log=self.stdout.write,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if opts["out"]:
+            runner.save_report(report, opts["out"])
+            self.stdout.write(self.style.SUCCESS(f"rapor yazıldı: {opts['out']}"))
+
+    def _compare(self, old_path, new_path, threshold, fail):
+        rows = runner.compare(runner.load_report(old_path), runner.load_report(new_path), threshold)
+        if not rows:
+            raise CommandError("raporlarda ortak (boyut, senaryo) yok")
+        regressions = 0
+        for r in rows:
+            line = (
+                f"{r['size']:>9} {r['scenario']:18} p50 {r['p50_ms'][0]:9.2f} -> {r['p50_ms'][1]:9.2f}ms "
+                f"x{r['p50_ratio']:<6} p95 x{r['p95_ratio']:<6} q {r['queries'][0]}->{r['queries'][1]} "
+                f"peak x{r['peak_ratio']}"
+            )
+            if r["regression"]:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(line + "  REGRESSION"))
+            else:
+                self.stdout.write(line)
+        if regressions and fail:
+            raise CommandError(f"{regressions} regresyon (eşik x{threshold})")
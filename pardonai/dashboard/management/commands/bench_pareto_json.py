@@ -0,0 +1,70 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Max
+from django.test import RequestFactory
+
+from pardonai.dashboard import fastjson
+from pardonai.dashboard.bench.synthetic import load_rows
+from pardonai.dashboard.models import ProductMetric
+from pardonai.dashboard.pareto_cache import invalidate_all
+from pardonai.dashboard.pareto_query import filtered_qs
+from pardonai.dashboard.views_pareto import PAYLOAD_BUILDERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Pareto API yanıtlarının boyutunu ve JSON kodlama süresini ölçer: "
+        "satır (varsayılan) ve format=columnar biçimleri, stdlib json ve orjson."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200_000, help="0: mevcut veriyle ölç")
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--parts", default=",".join(PAYLOAD_BUILDERS))
+        parser.add_argument("--keep", action="store_true", help="üretilen satırları silme")
+
+    def handle(self, *args, **opts):
+        start_id = ProductMetric.objects.aggregate(m=Max("id"))["m"] or 0
+        if opts["rows"]:
+            t0 = perf_counter()
+            n = load_rows(opts["rows"], products=opts["products"])
+            invalidate_all()
+            self.stdout.write(f"{n} satır yüklendi ({perf_counter() - t0:.1f}s)")
+
+        try:
+            factory = RequestFactory()
+            agg = filtered_qs(factory.get("/api/pareto/bundle"))
+            self.stdout.write(f"{len(agg[0])} etiket, serileştirici: {fastjson.backend()}")
+            encoders = [("json", fastjson.dumps_stdlib)]
+            if fastjson.orjson is not None:
+                encoders.append(("orjson", fastjson.dumps))
+
+            self.stdout.write(f"{'part':8} {'format':9} {'bytes':>10} " + " ".join(f"{name + ' ms':>10}" for name, _ in encoders))
+            for part in [p.strip() for p in opts["parts"].split(",") if p.strip()]:
+                for fmt in ("rows", "columnar"):
+                    request = factory.get("/api/pareto/bundle", {"format": fmt} if fmt == "columnar" else {})
+                    payload = {"success": True, **PAYLOAD_BUILDERS[part](request, agg)}
+                    size = len(fastjson.dumps_stdlib(payload))
+                    times = [self._time(opts["runs"], encode, payload) for _, encode in encoders]
+                    self.stdout.write(
+                        f"{part:8} {fmt:9} {size:>10} " + " ".join(f"{t * 1000:>10.2f}" for t in times)
+                    )
+        finally:
+            if opts["rows"] and not opts["keep"]:
+                # .delete() satır başına sinyal gönderir; toplu silme doğrudan SQL ile
+                with connection.cursor() as cur:
+                    cur.execute(f"DELETE FROM {ProductMetric._meta.db_table} WHERE id > %s", [start_id])
+                invalidate_all()
+
+    @staticmethod
+    def _time(runs, encode, payload):
+        samples = []
+        for _ in range(runs):
+            t = perf_counter()
+            encode(payload)
+            samples.append(perf_counter() - t)
+        return median(samples)
@@ -0,0 +1,57 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Max
+
+from pardonai.dashboard.bench.synthetic import load_rows
+from pardonai.dashboard.models import ProductMetric
+from pardonai.dashboard.pareto_cache import invalidate_all
+from pardonai.dashboard.pareto_query import raw_annotations
+from pardonai.dashboard.search import name_search_q
+
+
+class Command(BaseCommand):
+    help = (
+        "Arama filtreli pareto agregasyonunu ölçer: eski product_name__icontains "
+        "taraması ile indeksli product_name_search yolu karşılaştırılır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--terms", default="çay,Kahve Ş,İNCİR,Börek Sü")
+        parser.add_argument("--keep", action="store_true", help="üretilen satırları silme")
+
+    def handle(self, *args, **opts):
+        start_id = ProductMetric.objects.aggregate(m=Max("id"))["m"] or 0
+        t0 = perf_counter()
+        n = load_rows(opts["rows"], products=opts["products"])
+        self.stdout.write(f"{n} satır yüklendi ({perf_counter() - t0:.1f}s)")
+
+        try:
+            for term in [t.strip() for t in opts["terms"].split(",") if t.strip()]:
+                old, old_n = self._time(opts["runs"], ProductMetric.objects.filter(product_name__icontains=term))
+                new, new_n = self._time(opts["runs"], ProductMetric.objects.filter(name_search_q(term)))
+                self.stdout.write(
+                    f"search={term!r:14} icontains p50={old * 1000:8.1f}ms ({old_n} ürün)   "
+                    f"indeksli p50={new * 1000:8.1f}ms ({new_n} ürün)   x{old / new if new else 0:.1f}"
+                )
+        finally:
+            if not opts["keep"]:
+                # .delete() satır başına sinyal gönderir; toplu silme doğrudan SQL ile
+                with connection.cursor() as cur:
+                    cur.execute(f"DELETE FROM {ProductMetric._meta.db_table} WHERE id > %s", [start_id])
+                invalidate_all()
+
+    @staticmethod
+    def _time(runs, qs):
+        grouped = qs.values("product_name").annotate(**raw_annotations()).order_by("-sum_profit")
+        samples, n = [], 0
+        for _ in range(runs):
+            t = perf_counter()
+            n = len(list(grouped.all()))
+            samples.append(perf_counter() - t)
+        return median(samples), n
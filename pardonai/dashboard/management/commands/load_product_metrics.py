@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from pardonai.dashboard.abc_snapshot import refresh as refresh_abc
+from pardonai.dashboard.ingest import DEFAULT_CHUNK_SIZE, IngestError, load_file
+
+
+class Command(BaseCommand):
+    help = (
+        "products.csv biçimindeki CSV/XLSX dosyasını product_metric'e parça parça yükler "
+        "(PostgreSQL'de COPY, diğerlerinde toplu INSERT; (product_id, ts) üzerinden upsert)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--ts", help="tarih kolonu yoksa ya da boşsa satırlara yazılacak gün (YYYY-MM-DD)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--method", choices=["auto", "copy", "bulk"], default="auto")
+        parser.add_argument("--decimal", choices=[".", ","], default=".",
+                            help="metin sayılarda ondalık ayırıcı (',' -> 1.234,56)")
+        parser.add_argument("--month-first", action="store_true",
+                            help="ISO dışı tarihler aa/gg/yyyy (varsayılan gg.aa.yyyy; YYYY-AA-GG her zaman ISO)")
+        parser.add_argument("--sheet", help="XLSX sayfa adı (varsayılan: aktif sayfa)")
+        parser.add_argument("--append", action="store_true", help="upsert yapma, yalnızca ekle")
+        parser.add_argument("--refresh-abc", action="store_true",
+                            help="yüklemeden sonra ABC snapshot'larını artımlı yenile (refresh_abc_snapshots)")
+
+    def handle(self, *args, **opts):
+        ts = None
+        if opts["ts"]:
+            ts = parse_date(opts["ts"])
+            if ts is None:
+                raise CommandError(f"geçersiz --ts: {opts['ts']}")
+
+        def progress(p):
+            if opts["verbosity"] > 1:
+                self.stdout.write(f"  parça {p['chunks']}: {p['rows']} satır ({p['rows_per_sec']:.0f} satır/sn)")
+
+        try:
+            res = load_file(
+                opts["path"],
+                chunk_size=opts["chunk_size"],
+                method=opts["method"],
+                decimal=opts["decimal"],
+                ts=ts,
+                upsert=not opts["append"],
+                sheet=opts["sheet"],
+                dayfirst=not opts["month_first"],
+                progress=progress,
+            )
+        except (IngestError, FileNotFoundError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{res['rows']} satır yüklendi, {res['skipped']} satır atlandı "
+            f"({res['method']}, {res['chunks']} parça, {res['seconds']:.2f}s, "
+            f"{res['rows_per_sec']:.0f} satır/sn)"
+        ))
+        if opts["refresh_abc"]:
+            abc = refresh_abc()
+            self.stdout.write(f"ABC snapshot: {abc['rebuilt']} dönem yeniden üretildi, {abc['kept']} değişmedi")
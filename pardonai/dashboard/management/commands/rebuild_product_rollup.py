@@ -0,0 +1,19 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from pardonai.dashboard.pareto_cache import invalidate_all
+from pardonai.dashboard.rollup import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "product_metric_daily rollup'ını ham tablodan baştan üretir."
+
+    def handle(self, *args, **options):
+        t0 = perf_counter()
+        res = rebuild_all()
+        invalidate_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"{res['days']} gün, {res['rows']} rollup satırı yazıldı "
+            f"(last_metric_id={res['last_metric_id']}, {perf_counter() - t0:.2f}s)"
+        ))
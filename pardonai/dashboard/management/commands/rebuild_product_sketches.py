@@ -0,0 +1,29 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from pardonai.dashboard.sketch import rebuild_all, rebuild_missing, rebuild_stale
+
+
+class Command(BaseCommand):
+    help = (
+        "approx=1 için günlük top-k özetlerini (product_metric_sketch) ham tablodan "
+        "baştan üretir. Sinyal üretmeyen toplu yazımlardan sonra çalıştırılmalı; --stale "
+        "tekil yazımların bayat bıraktığı günler için düzenli zamanlanır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--missing", action="store_true",
+                            help="yalnızca verisi olup özeti olmayan günleri üret (toplu yükleme sonrası)")
+        parser.add_argument("--stale", action="store_true",
+                            help="yalnızca stale işaretli günleri üret (tekil yazımlar sonrası, düzenli)")
+
+    def handle(self, *args, **options):
+        t0 = perf_counter()
+        if options["stale"]:
+            days = rebuild_stale()
+        elif options["missing"]:
+            days = rebuild_missing()
+        else:
+            days = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"{days} gün için özet üretildi ({perf_counter() - t0:.2f}s)"))
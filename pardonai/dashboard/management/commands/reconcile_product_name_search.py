@@ -0,0 +1,23 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from pardonai.dashboard.search import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Ürün adı arama kolonunu (product_name_search) fold_search(product_name) ile karşılaştırıp onarır. "
+        "save() çağırmayan yazımlardan (QuerySet.update(product_name=...), bulk_create) sonra çalıştırılmalı."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="sapmaları yaz, düzeltme")
+
+    def handle(self, *args, **opts):
+        t0 = perf_counter()
+        drift = reconcile(dry_run=opts["dry_run"])
+        for table, name, stored, rows in drift:
+            self.stdout.write(f"{table:22} {name!r} {stored!r} ({rows} satır)")
+        verb = "bulundu" if opts["dry_run"] else "düzeltildi"
+        self.stdout.write(self.style.SUCCESS(f"{len(drift)} arama kolonu sapması {verb} ({perf_counter() - t0:.2f}s)"))
@@ -0,0 +1,24 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from pardonai.dashboard.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = (
+        "Durum sayaçlarını (status_counter) gerçek sayımlarla karşılaştırıp onarır. Sinyal üretmeyen "
+        "toplu yazımlardan (QuerySet.update, bulk_create, loaddata) sonra ya da periyodik çalıştırılmalı."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business", type=int, default=None, help="yalnızca bu business_id")
+        parser.add_argument("--dry-run", action="store_true", help="sapmaları yaz, düzeltme")
+
+    def handle(self, *args, **opts):
+        t0 = perf_counter()
+        drift = reconcile(business=opts["business"], dry_run=opts["dry_run"])
+        for business, name, stored, actual in drift:
+            self.stdout.write(f"business={business:<7} {name:20} {stored if stored is not None else '-':>8} -> {actual}")
+        verb = "bulundu" if opts["dry_run"] else "düzeltildi"
+        self.stdout.write(self.style.SUCCESS(f"{len(drift)} sayaç sapması {verb} ({perf_counter() - t0:.2f}s)"))
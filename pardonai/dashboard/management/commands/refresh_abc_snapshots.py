@@ -0,0 +1,23 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from pardonai.dashboard.abc_snapshot import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Varsayılan ABC görünümü snapshot'larını (product_metric_abc_snapshot) artımlı "
+        "yeniler: yalnızca verisi değişen aylar ve 'all' yeniden üretilir. Yüklemeden sonra çalıştırılmalı."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="tüm dönemleri baştan üret")
+
+    def handle(self, *args, **opts):
+        t0 = perf_counter()
+        res = refresh(full=opts["full"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{res['rebuilt']} dönem yeniden üretildi ({res['rows']} satır), {res['kept']} dönem değişmedi, "
+            f"{res['removed']} dönem silindi ({perf_counter() - t0:.2f}s)"
+        ))
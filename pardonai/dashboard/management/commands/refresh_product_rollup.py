@@ -0,0 +1,17 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from pardonai.dashboard.rollup import refresh_incremental
+
+
+class Command(BaseCommand):
+    help = "product_metric_daily rollup'ını artımlı günceller (yeni satırlar + kirli günler)."
+
+    def handle(self, *args, **options):
+        t0 = perf_counter()
+        res = refresh_incremental()
+        self.stdout.write(self.style.SUCCESS(
+            f"{res['days']} gün yenilendi, {res['rows']} rollup satırı yazıldı "
+            f"(last_metric_id={res['last_metric_id']}, {perf_counter() - t0:.2f}s)"
+        ))
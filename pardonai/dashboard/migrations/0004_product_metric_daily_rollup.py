@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-17 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_businesses_productmetric_delete_sheet1'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductMetricDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True, unique=True)),
+            ],
+            options={
+                'db_table': 'product_metric_dirty_day',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='productmetricdirtyday',
+            constraint=models.UniqueConstraint(models.ExpressionWrapper(models.Q(('day__isnull', True)), output_field=models.BooleanField()), condition=models.Q(('day__isnull', True)), name='pmdd_undated_uniq'),
+        ),
+        migrations.CreateModel(
+            name='ProductMetricRollupState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_metric_id', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product_metric_rollup_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductMetricDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.IntegerField()),
+                ('product_name', models.CharField(max_length=128)),
+                ('day', models.DateField(blank=True, null=True)),
+                ('row_count', models.IntegerField(default=0)),
+                ('sum_profit', models.FloatField(default=0)),
+                ('sum_click', models.BigIntegerField(default=0)),
+                ('sum_sales', models.BigIntegerField(default=0)),
+                ('sum_cost', models.FloatField(default=0)),
+                ('sum_price', models.FloatField(default=0)),
+                ('sum_unit_profit', models.FloatField(default=0)),
+                ('sum_ppc', models.FloatField(default=0)),
+                ('sum_revenue', models.FloatField(default=0)),
+                ('sum_cogs', models.FloatField(default=0)),
+            ],
+            options={
+                'db_table': 'product_metric_daily',
+                'indexes': [models.Index(fields=['day', 'product_name'], name='pmd_day_name_idx'), models.Index(fields=['day', 'product_id'], name='pmd_day_pid_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.30 on 2026-10-17 14:20
+
+import unicodedata
+
+from django.db import migrations, models
+
+# search.fold_search'ün bu migration anındaki kopyası: canlı fonksiyon
+# sonradan değişse de backfill aynı sonucu üretir
+_TR_LOWER = str.maketrans({"İ": "i", "I": "ı"})
+_ASCII_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c"})
+
+
+def fold_search(text):
+    if not text:
+        return ""
+    s = str(text).translate(_TR_LOWER).lower().translate(_ASCII_FOLD)
+    s = unicodedata.normalize("NFKD", s)
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).strip()
+
+
+# (model, indeks adı) — gölge arama kolonu product_name_search üzerinde
+SEARCH_INDEXES = [
+    ("ProductMetric", "pm_name_search_idx"),
+    ("ProductMetricDaily", "pmd_name_search_idx"),
+]
+
+
+def backfill_search(apps, schema_editor):
+    # farklı ad sayısı satır sayısından çok küçük: ad başına tek UPDATE
+    for model_name, _ in SEARCH_INDEXES:
+        model = apps.get_model("dashboard", model_name)
+        names = model.objects.values_list("product_name", flat=True).distinct().order_by()
+        for name in names.iterator():
+            model.objects.filter(product_name=name).update(product_name_search=fold_search(name))
+
+
+def create_trigram_extension(apps, schema_editor):
+    # geri alınırken pg_trgm bırakılır: başka nesneler kullanıyor olabilir
+    if schema_editor.connection.vendor == "postgresql":
+        # contrib.postgres (ve psycopg2) yalnızca PostgreSQL'de gerekir
+        from django.contrib.postgres.operations import TrigramExtension
+
+        TrigramExtension().database_forwards("dashboard", schema_editor, None, None)
+
+
+def _search_index(connection, name):
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+
+        # LIKE '%x%' için pg_trgm GIN indeksi (eklenti create_trigram_extension ile)
+        return GinIndex(fields=["product_name_search"], name=name, opclasses=["gin_trgm_ops"])
+    # alt dize araması önce bu dar indekste taranır (search.name_search_q)
+    return models.Index(fields=["product_name_search"], name=name)
+
+
+def create_search_indexes(apps, schema_editor):
+    for model_name, name in SEARCH_INDEXES:
+        schema_editor.add_index(apps.get_model("dashboard", model_name), _search_index(schema_editor.connection, name))
+
+
+def drop_search_indexes(apps, schema_editor):
+    for model_name, name in SEARCH_INDEXES:
+        schema_editor.remove_index(apps.get_model("dashboard", model_name), _search_index(schema_editor.connection, name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_product_metric_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productmetric',
+            name='product_name_search',
+            field=models.CharField(default='', editable=False, max_length=128),
+        ),
+        migrations.AddField(
+            model_name='productmetricdaily',
+            name='product_name_search',
+            field=models.CharField(default='', editable=False, max_length=128),
+        ),
+        migrations.RunPython(create_trigram_extension, migrations.RunPython.noop),  # PostgreSQL dışında işlem yapmaz
+        migrations.RunPython(backfill_search, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
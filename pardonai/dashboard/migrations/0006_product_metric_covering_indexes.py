@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# pareto sorguları ts ile filtreleyip product_name / product_id ile gruplar;
+# toplanan kolonlar indekste taşındığı için tabloya dönülmez (index-only scan)
+METRIC_COLUMNS = [
+    "total_profit", "click", "sales", "cost", "sales_price", "unit_profit", "profit_per_click",
+]
+COVERING_INDEXES = [
+    ("pm_ts_name_cov_idx", ["ts", "product_name"]),
+    ("pm_ts_pid_cov_idx", ["ts", "product_id"]),
+]
+
+
+def create_covering_indexes(apps, schema_editor):
+    qn = schema_editor.quote_name
+    table = qn("product_metric")
+    include = ", ".join(qn(c) for c in METRIC_COLUMNS)
+    for name, keys in COVERING_INDEXES:
+        key_sql = ", ".join(qn(c) for c in keys)
+        if schema_editor.connection.features.supports_covering_indexes:
+            sql = f"CREATE INDEX IF NOT EXISTS {qn(name)} ON {table} ({key_sql}) INCLUDE ({include})"
+        else:
+            # INCLUDE desteklemeyen motorlarda (SQLite) kolonlar anahtara eklenir
+            sql = f"CREATE INDEX IF NOT EXISTS {qn(name)} ON {table} ({key_sql}, {include})"
+        schema_editor.execute(sql)
+
+
+def drop_covering_indexes(apps, schema_editor):
+    qn = schema_editor.quote_name
+    for name, _keys in COVERING_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {qn(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_product_name_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_covering_indexes, drop_covering_indexes),
+    ]
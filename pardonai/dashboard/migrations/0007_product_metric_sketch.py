@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_product_metric_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductMetricSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True)),
+                ('groupby', models.CharField(max_length=4)),
+                ('total', models.FloatField(default=0)),
+                ('loss', models.FloatField(default=0)),
+                ('data', models.BinaryField(default=b'')),
+                ('stale', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'product_metric_sketch',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='productmetricsketch',
+            constraint=models.UniqueConstraint(fields=('day', 'groupby'), name='pms_day_groupby_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='productmetricsketch',
+            constraint=models.UniqueConstraint(condition=models.Q(('day__isnull', True)), fields=('groupby',), name='pms_undated_groupby_uniq'),
+        ),
+    ]
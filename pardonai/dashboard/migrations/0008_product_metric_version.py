@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_product_metric_sketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductMetricVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product_metric_version',
+            },
+        ),
+    ]
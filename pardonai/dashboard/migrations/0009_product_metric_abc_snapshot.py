@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-17 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_product_metric_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductMetricAbcPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('groupby', models.CharField(max_length=4)),
+                ('period', models.CharField(max_length=7)),
+                ('version', models.BigIntegerField(default=0)),
+                ('stale', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product_metric_abc_period',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductMetricAbcSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('groupby', models.CharField(max_length=4)),
+                ('period', models.CharField(max_length=7)),
+                ('rank', models.IntegerField()),
+                ('label', models.CharField(max_length=128)),
+                ('profit', models.FloatField()),
+                ('cum_pct', models.FloatField()),
+                ('abc_class', models.CharField(max_length=1)),
+            ],
+            options={
+                'db_table': 'product_metric_abc_snapshot',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='productmetricabcsnapshot',
+            constraint=models.UniqueConstraint(fields=('groupby', 'period', 'rank'), name='pmas_groupby_period_rank_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='productmetricabcperiod',
+            constraint=models.UniqueConstraint(fields=('groupby', 'period'), name='pmap_groupby_period_uniq'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 15:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_product_metric_abc_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('business_id', models.IntegerField(default=0)),
+                ('name', models.CharField(max_length=32)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'status_counter',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='statuscounter',
+            constraint=models.UniqueConstraint(fields=('business_id', 'name'), name='sc_business_name_uniq'),
+        ),
+    ]
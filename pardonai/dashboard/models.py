@@ -1,5 +1,7 @@
 from django.db import models
 
+from .search import fold_search
+
 
 class ProductMetric(models.Model):
     product_id = models.IntegerField()
@@ -13,9 +15,146 @@ class ProductMetric(models.Model):
     total_profit = models.FloatField()
     profit_per_click = models.FloatField()
     ts = models.DateField(null=True, blank=True)
+    # arama için normalize ad (search.fold_search); indeksleri migration 0005'te.
+    # save() doldurur; QuerySet.update / bulk_create sonrası reconcile_product_name_search
+    product_name_search = models.CharField(max_length=128, default="", editable=False)
 
     class Meta:
         db_table = 'product_metric'
+        # (ts, product_name) / (ts, product_id) kapsayan indeksleri migration 0006'da:
+        # Index(include=...) SQLite'ta sessizce atlandığı için motor bazlı SQL ile kurulur
+
+    def save(self, *args, **kwargs):
+        self.product_name_search = fold_search(self.product_name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "product_name" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"product_name_search"}
+        super().save(*args, **kwargs)
+
+
+class ProductMetricDaily(models.Model):
+    """product_metric'in (product_id, product_name, gün) bazında özet tablosu (rollup.py)"""
+    product_id = models.IntegerField()
+    product_name = models.CharField(max_length=128)
+    product_name_search = models.CharField(max_length=128, default="", editable=False)
+    day = models.DateField(null=True, blank=True)
+    row_count = models.IntegerField(default=0)
+    sum_profit = models.FloatField(default=0)
+    sum_click = models.BigIntegerField(default=0)
+    sum_sales = models.BigIntegerField(default=0)
+    # ortalamalar için: AVG(x) = SUM(sum_x) / SUM(row_count)
+    sum_cost = models.FloatField(default=0)
+    sum_price = models.FloatField(default=0)
+    sum_unit_profit = models.FloatField(default=0)
+    sum_ppc = models.FloatField(default=0)
+    # what-if için satır bazlı çarpımlar: SUM(sales_price*sales), SUM(cost*sales)
+    sum_revenue = models.FloatField(default=0)
+    sum_cogs = models.FloatField(default=0)
+
+    class Meta:
+        db_table = 'product_metric_daily'
+        indexes = [
+            models.Index(fields=['day', 'product_name'], name='pmd_day_name_idx'),
+            models.Index(fields=['day', 'product_id'], name='pmd_day_pid_idx'),
+        ]
+
+
+class ProductMetricDirtyDay(models.Model):
+    """Rollup'ı yeniden hesaplanması gereken günler (sinyallerle işaretlenir)"""
+    day = models.DateField(null=True, blank=True, unique=True)
+
+    class Meta:
+        db_table = 'product_metric_dirty_day'
+        constraints = [
+            # unique=True NULL'ları ayrı sayar: tarihsiz gün için tek satır (day IS NULL kısmi indeksi)
+            models.UniqueConstraint(
+                models.ExpressionWrapper(models.Q(day__isnull=True), output_field=models.BooleanField()),
+                condition=models.Q(day__isnull=True), name='pmdd_undated_uniq',
+            ),
+        ]
+
+
+class ProductMetricRollupState(models.Model):
+    """Artımlı rollup yenilemesi için su seviyesi (tek satır)"""
+    last_metric_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'product_metric_rollup_state'
+
+
+class ProductMetricAbcSnapshot(models.Model):
+    """Varsayılan eşiklerle (80/95) önceden hesaplanmış ABC sınıfları (abc_snapshot.py)"""
+    groupby = models.CharField(max_length=4)  # name|id
+    period = models.CharField(max_length=7)   # all | YYYY-MM
+    rank = models.IntegerField()              # 1 = en kârlı
+    label = models.CharField(max_length=128)
+    profit = models.FloatField()
+    cum_pct = models.FloatField()
+    abc_class = models.CharField(max_length=1)
+
+    class Meta:
+        db_table = 'product_metric_abc_snapshot'
+        constraints = [
+            models.UniqueConstraint(fields=['groupby', 'period', 'rank'], name='pmas_groupby_period_rank_uniq'),
+        ]
+
+
+class ProductMetricAbcPeriod(models.Model):
+    """Snapshot dönemlerinin durumu: veri sürümü ve bayatlık (rollup günleri yeniden hesaplayınca)"""
+    groupby = models.CharField(max_length=4)
+    period = models.CharField(max_length=7)
+    version = models.BigIntegerField(default=0)          # ProductMetricVersion.version
+    stale = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'product_metric_abc_period'
+        constraints = [
+            models.UniqueConstraint(fields=['groupby', 'period'], name='pmap_groupby_period_uniq'),
+        ]
+
+
+class ProductMetricVersion(models.Model):
+    """ProductMetric veri sürümü (tek satır); her yazımda artar, ETag'lerin kaynağı"""
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'product_metric_version'
+
+
+class ProductMetricSketch(models.Model):
+    """Günlük top-k (Space-Saving) özeti; approx=1 pareto için (sketch.py)"""
+    day = models.DateField(null=True, blank=True)
+    groupby = models.CharField(max_length=4)  # name|id
+    total = models.FloatField(default=0)      # günün kesin kâr toplamı
+    loss = models.FloatField(default=0)       # etiket başına zararın üst sınırı (sayaçlara girmeyen)
+    data = models.BinaryField(default=b"")    # sıkıştırılmış (etiket, sayaç, hata) dizileri
+    stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'product_metric_sketch'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'groupby'], name='pms_day_groupby_uniq'),
+            # NULL günler birbirine eşit sayılmaz: tarihsiz özet için ayrı kısmi kısıt
+            models.UniqueConstraint(fields=['groupby'], condition=models.Q(day__isnull=True),
+                                    name='pms_undated_groupby_uniq'),
+        ]
+
+
+class StatusCounter(models.Model):
+    """Sinyallerle güncel tutulan işletme bazlı durum sayaçları (counters.py); global = SUM"""
+    business_id = models.IntegerField(default=0)  # Businesses.business_id, FK değil
+    name = models.CharField(max_length=32)        # pending_orders, active_menus, ...
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'status_counter'
+        constraints = [
+            models.UniqueConstraint(fields=['business_id', 'name'], name='sc_business_name_uniq'),
+        ]
 
 
 class ServiceType(models.TextChoices):
@@ -0,0 +1,194 @@
+# pardonai/dashboard/pareto_cache.py
+"""
+Pareto agregasyonu için süreç içi LRU + TTL önbellek.
+
+Gruplanmış kâr vektörü eşikten (threshold/threshold_b) bağımsızdır; bu yüzden
+(date_from, date_to, search, groupby, product_ids) anahtarıyla bir kez
+hesaplanıp saklanır. Eşik, ABC, treemap ve top-N istekleri DB'ye gitmeden
+buradan cevaplanır.
+
+Boyut: girdi sayısı (PARETO_CACHE_MAX_ENTRIES) ve yaklaşık bellek
+(PARETO_CACHE_MAX_BYTES) ile sınırlıdır. Girdinin boyutu put sırasında
+approx_size ile bir kez ölçülür; sınırı aşan en eski girdiler düşer, tek
+başına sınırdan büyük bir sonuç hiç saklanmaz (her istekte yeniden hesaplanır).
+
+Tutarlılık: anahtar ProductMetric veri sürümünü (conditional.data_version)
+içerir. Sürüm yazımın transaction'ı commit olunca artar; commit'ten önce eski
+satırları okuyup önbelleğe koyan bir istek eski sürümün anahtarına yazar ve
+commit'ten sonraki okumalar onu hiç görmez. Önbellek her worker sürecine
+özeldir ama sürüm paylaşılan tablodadır: diğer worker'lar da bir sonraki
+istekte yeni anahtara geçer. Eski sürümlerin girdileri LRU ile düşer; tekil
+yazımların sinyalleri (signals.py) ayrıca commit'te ilgili girdileri düşürür
+(invalidate_rows) ve süren hesaplamaların sonucunu geçersiz kılar.
+"""
+from __future__ import annotations
+import sys
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+
+from . import write_batch
+from .conditional import bump_data_version, data_version
+from .search import fold_search, name_matches
+
+CacheKey = Tuple[int, Optional[date], Optional[date], str, str, Tuple[int, ...]]
+
+
+def make_key(date_from, date_to, search: str, groupby: str, product_ids: Iterable[int] = (),
+             request=None) -> CacheKey:
+    """Veri sürümü istek üzerinde bir kez okunur (koşullu GET ile paylaşılır)."""
+    version, _ = data_version(request)
+    return (version, date_from, date_to, fold_search(search), groupby, tuple(sorted(set(product_ids))))
+
+
+def approx_size(value: Any) -> int:
+    """Değerin yaklaşık bellek boyutu (bayt): kapsayıcılar elemanlarıyla, numpy dizileri nbytes ile."""
+    total, seen, stack = 0, set(), [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        nbytes = getattr(obj, "nbytes", None)
+        if isinstance(nbytes, int):
+            total += nbytes
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class AggregateCache:
+    """Girdi sayısı ve yaklaşık bellekle sınırlı, süreli, thread-safe LRU önbellek."""
+
+    def __init__(self, max_entries: int = 64, ttl: float = 300.0, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes  # None: yalnızca girdi sayısı
+        self._data: "OrderedDict[CacheKey, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        # her invalidasyonda artar; hesaplama sürerken gelen yazımın
+        # bayat sonucu önbelleğe koymasını engeller
+        self._generation = 0
+
+    def get(self, key: CacheKey):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, size, value = item
+            if expires < monotonic():
+                del self._data[key]
+                self._bytes -= size
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: CacheKey, value: Any, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+        size = approx_size(value) if self.max_bytes is not None else 0  # kilit dışında: O(sonuç)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self._bytes -= evicted
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], Any]):
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = compute()  # kilit dışında: uzun sorgu diğer istekleri bekletmesin
+        self.put(key, value, generation)
+        return value
+
+    def invalidate(self, predicate: Callable[[CacheKey], bool]) -> int:
+        with self._lock:
+            self._generation += 1
+            stale = [k for k in self._data if predicate(k)]
+            for k in stale:
+                self._bytes -= self._data.pop(k)[1]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def row_affects(key: CacheKey, ts, product_id, product_name) -> bool:
+    """Bu ProductMetric satırı verilen önbellek girdisinin sonucunu değiştirir mi?"""
+    _version, date_from, date_to, search, _groupby, product_ids = key
+    if isinstance(ts, str):
+        ts = parse_date(ts)
+    if date_from or date_to:
+        if ts is None:
+            return False
+        if date_from and ts < date_from:
+            return False
+        if date_to and ts > date_to:
+            return False
+    if search and not name_matches(search, str(product_name or "")):
+        return False
+    if product_ids and product_id not in product_ids:
+        return False
+    return True
+
+
+aggregate_cache = AggregateCache(
+    max_entries=getattr(settings, "PARETO_CACHE_MAX_ENTRIES", 64),
+    ttl=getattr(settings, "PARETO_CACHE_TTL", 300),
+    max_bytes=getattr(settings, "PARETO_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+)
+
+
+def invalidate_row(ts, product_id, product_name) -> int:
+    return aggregate_cache.invalidate(lambda k: row_affects(k, ts, product_id, product_name))
+
+
+def invalidate_rows(rows: Iterable[Tuple]) -> int:
+    """(ts, product_id, product_name) satırlarının girdilerini tek geçişte düşürür."""
+    rows = list(rows)
+    return aggregate_cache.invalidate(lambda k: any(row_affects(k, *row) for row in rows))
+
+
+def schedule_invalidate(rows: Iterable[Tuple]) -> None:
+    """
+    Tekil yazım sinyalleri için: girdiler commit'te, transaction başına bir kez
+    düşer. Commit'ten önce düşürmek yetmez: arada eski satırları okuyan bir
+    istek sonucu yeniden önbelleğe koyardı.
+    """
+    write_batch.record(rows, None, invalidate_rows)
+
+
+def invalidate_all() -> None:
+    """bulk_create / queryset.update gibi sinyal üretmeyen yazımlardan sonra çağrılmalı."""
+    aggregate_cache.clear()
+    bump_data_version()  # diğer worker'lar ve tarayıcı ETag'leri için
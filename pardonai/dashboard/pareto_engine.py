@@ -0,0 +1,417 @@
+# pardonai/dashboard/pareto_engine.py
+"""
+Pareto hesap motoru.
+
+Gruplanmış kâr vektörü (DESC sıralı) üzerinde kümülatif yüzde, eşik indeksi,
+ABC sınıfları, Lorenz/Gini ve histogramı toplu (vektörel) hesaplar. numpy
+kuruluysa bitişik float64 dizileri kullanılır; yoksa aynı sonuçlar sade
+Python ile üretilir.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from itertools import accumulate
+from math import fsum
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+ABC_CLASSES = ("A", "B", "C")
+
+
+class ParetoEngine:
+    """
+    values: DESC sıralı kâr vektörü (etiket sırasıyla aynı).
+    Kümülatif toplam bir kez hesaplanır, diğer tüm çıktılar ondan türetilir.
+
+    Sayfa dilimi için offset (dilimden önceki satırların toplamı) ve total
+    (tüm vektörün toplamı) verilebilir; kümülatif yüzde ve ABC sınıfları
+    tam vektördekiyle aynı olur. Lorenz/Gini tam vektör ister.
+    """
+
+    def __init__(self, values: Sequence[float], offset: float = 0.0, total: float | None = None):
+        self.n = len(values)
+        if np is not None:
+            self._v = np.ascontiguousarray(values, dtype=np.float64)
+            self._cum = np.cumsum(self._v) + offset if offset else np.cumsum(self._v)
+            self.total = float(self._cum[-1]) if self.n else float(offset)
+        else:
+            self._v = [float(v) for v in values]
+            self._cum = list(accumulate(self._v, initial=offset))[1:] if offset else list(accumulate(self._v))
+            self.total = fsum(self._v) + offset
+        if total is not None:
+            self.total = float(total)
+
+    # ---------------- kümülatif yüzde ----------------
+    def _cum_pct_array(self, start: int = 0, stop: int | None = None):
+        cum = self._cum[start:stop]
+        if np is not None:
+            if not self.total:
+                return np.zeros(len(cum))
+            return cum / self.total * 100.0
+        if not self.total:
+            return [0.0] * len(cum)
+        return [c / self.total * 100.0 for c in cum]
+
+    def cum_pct(self, decimals: int | None = None, start: int = 0, stop: int | None = None) -> List[float]:
+        """[start:stop] aralığının kümülatif yüzdesi (sayfalama için dilim alınabilir)."""
+        cum = self._cum_pct_array(start, stop)
+        if np is not None:
+            return (np.round(cum, decimals) if decimals is not None else cum).tolist()
+        return [round(c, decimals) for c in cum] if decimals is not None else cum
+
+    def threshold_index(self, threshold: float) -> int:
+        """Kümülatif yüzdenin ilk kez threshold'a ulaştığı indeks, yoksa -1."""
+        if not self.n:
+            return -1
+        cum = self._cum_pct_array()
+        # negatif kârlar eğriyi monoton olmaktan çıkarır; koşan maksimum
+        # ilk ulaşma noktasını korur ve ikili aramaya uygun hale getirir
+        if np is not None:
+            run_max = np.maximum.accumulate(cum)
+            idx = int(np.searchsorted(run_max, threshold, side="left"))
+        else:
+            run_max = list(accumulate(cum, max))
+            idx = bisect_left(run_max, threshold)
+        return idx if idx < self.n else -1
+
+    # ---------------- ABC ----------------
+    def abc_labels(self, thr: float = 80, thr_b: float = 95, start: int = 0, stop: int | None = None) -> List[str]:
+        """A: cum <= thr, B: cum <= thr_b, C: kalan."""
+        cum = self._cum_pct_array(start, stop)
+        if np is not None:
+            codes = (cum > thr).astype(np.int8) + (cum > thr_b).astype(np.int8)
+            return np.array(ABC_CLASSES)[codes].tolist()
+        return ["A" if c <= thr else ("B" if c <= thr_b else "C") for c in cum]
+
+    def abc_summary(self, thr: float = 80, thr_b: float = 95, labels: List[str] | None = None) -> Dict[str, Any]:
+        labels = labels if labels is not None else self.abc_labels(thr, thr_b)
+        total = self.total or 1.0
+        summary: Dict[str, Any] = {}
+        if np is not None:
+            lab = np.asarray(labels)
+            for cls in ABC_CLASSES:
+                mask = lab == cls
+                s = float(self._v[mask].sum())
+                summary[cls] = {"count": int(mask.sum()), "sum": round(s, 2), "share_pct": round(s / total * 100, 2)}
+        else:
+            for cls in ABC_CLASSES:
+                vals = [v for v, l in zip(self._v, labels) if l == cls]
+                s = fsum(vals)
+                summary[cls] = {"count": len(vals), "sum": round(s, 2), "share_pct": round(s / total * 100, 2)}
+        summary["total"] = round(self.total, 2)
+        return summary
+
+    # ---------------- Lorenz + Gini ----------------
+    def _lorenz_arrays(self):
+        """Tam Lorenz eğrisi (x, y) ve Gini; numpy varsa diziler liste'ye çevrilmez."""
+        n = self.n
+        if np is not None:
+            asc = np.sort(self._v)
+            total = self.total or 1.0
+            y = np.empty(n + 1)
+            y[0] = 0.0
+            np.cumsum(asc, out=y[1:])
+            y /= total
+            x = np.arange(n + 1, dtype=np.float64) / n
+            area = float((y[:-1] + y[1:]).sum()) / (2 * n)
+            return x, y, 1 - 2 * area
+        asc = sorted(self._v)
+        total = self.total or 1.0
+        y = [0.0] + [c / total for c in accumulate(asc)]
+        x = [i / n for i in range(n + 1)]
+        area = fsum(y[i] + y[i + 1] for i in range(n)) / (2 * n)
+        return x, y, 1 - 2 * area
+
+    def lorenz(self, points: int | None = None, method: str = "lttb") -> Tuple[List[float], List[float], float]:
+        """
+        x: birikimli ürün oranı, y: küçükten büyüğe birikimli kâr oranı (0..1),
+        gini: trapez yaklaşımıyla 1 - 2*alan (her zaman tam vektör üzerinden).
+        points verilirse eğri en fazla o kadar noktaya indirgenir:
+        method="lttb" (şekli koruyan) ya da "quantile" (eşit aralıklı).
+        """
+        if self.n == 0:
+            return [], [], 0.0
+        x, y, gini = self._lorenz_arrays()
+        if points and len(x) > points:
+            if method == "quantile":
+                idx = quantile_indices(len(x), points)
+            else:
+                idx = lttb_indices(x, y, points)
+            if np is not None:
+                x, y = x[idx], y[idx]
+            else:
+                x, y = [x[i] for i in idx], [y[i] for i in idx]
+        if np is not None:
+            return x.tolist(), y.tolist(), gini
+        return list(x), list(y), gini
+
+    def gini(self) -> float:
+        return self.lorenz()[2]
+
+    # ---------------- histogram ----------------
+    @staticmethod
+    def histogram(vals: Sequence[float], bins: int = 10) -> Tuple[List[int], List[float]]:
+        if np is not None:
+            hist, edges = np.histogram(np.asarray(vals, dtype=np.float64), bins=bins)
+            return hist.tolist(), edges.tolist()
+        # sade Python fallback
+        if not vals:
+            return [], []
+        mn, mx = min(vals), max(vals)
+        if mx == mn:
+            return [len(vals)], [mn, mx]
+        step = (mx - mn) / bins
+        edges = [mn + i * step for i in range(bins + 1)]
+        hist = [0] * bins
+        for v in vals:
+            k = min(int((v - mn) / step), bins - 1)
+            hist[k] += 1
+        return hist, edges
+
+
+# ---------------- eğri seyreltme ----------------
+def quantile_indices(n: int, points: int) -> List[int]:
+    """0..n-1 aralığında uçlar dahil eşit aralıklı en fazla `points` indeks."""
+    if points >= n:
+        return list(range(n))
+    if points < 2:
+        return [0, n - 1][:max(points, 1)]
+    step = (n - 1) / (points - 1)
+    return sorted({int(round(i * step)) for i in range(points)})
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], points: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: ilk ve son nokta korunur, aradaki her
+    kovadan bir önceki seçili nokta ve sonraki kovanın ortalamasıyla en büyük
+    üçgeni kuran nokta seçilir. Kova içi alan hesabı numpy ile vektöreldir.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return quantile_indices(n, points)
+    every = (n - 2) / (points - 2)
+    a = 0
+    out = [0]
+    for i in range(points - 2):
+        lo, hi = int(i * every) + 1, int((i + 1) * every) + 1
+        nlo, nhi = hi, min(int((i + 2) * every) + 1, n)
+        if np is not None:
+            avg_x, avg_y = float(x[nlo:nhi].mean()), float(y[nlo:nhi].mean())
+            area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+            a = lo + int(np.argmax(area))
+        else:
+            cnt = nhi - nlo
+            avg_x, avg_y = fsum(x[nlo:nhi]) / cnt, fsum(y[nlo:nhi]) / cnt
+            best, a_next = -1.0, lo
+            for j in range(lo, hi):
+                area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+                if area > best:
+                    best, a_next = area, j
+            a = a_next
+        out.append(a)
+    out.append(n - 1)
+    return out
+
+
+# ---------------- zaman kovalı sıralama (drift) ----------------
+DRIFT_STATES = ("-",) + ABC_CLASSES  # geçiş matrisinde 0: o kovada yok
+
+
+def bucket_drift(
+    n_buckets: int,
+    n_labels: int,
+    cells: Sequence[Tuple[int, int, float]],
+    thr: float = 80,
+    thr_b: float = 95,
+    max_labels: int = 50,
+    movers: int = 10,
+) -> Dict[str, Any]:
+    """
+    cells: (kova, etiket, kâr) üçlüleri. Her kovada kâra göre DESC sıra
+    (eşitlikte etiket indeksi) ve kümülatif yüzde hesaplanır; ABC sınıfı
+    yüzdeden türetilir. Dönüş:
+      keep: matrisleri dönen etiket indeksleri (herhangi bir kovadaki en iyi
+            sıraya göre ilk max_labels),
+      rank / cum_pct / profit / state: keep x kova matrisleri (rank 0 ve
+            state 0 = o kovada yok; state 1..3 = A/B/C),
+      transitions: ardışık kova çiftleri için 4x4 sayım (DRIFT_STATES sırası),
+      movers: ilk ve son kovada bulunan etiketlerin sıra değişimi
+            (up: en çok yükselen, down: en çok düşen; (indeks, ilk, son)).
+    """
+    B, L = n_buckets, n_labels
+    if np is not None:
+        vals = np.zeros((B, L))
+        present = np.zeros((B, L), dtype=bool)
+        if len(cells):
+            arr = np.asarray(cells, dtype=np.float64)
+            bi, li = arr[:, 0].astype(np.int64), arr[:, 1].astype(np.int64)
+            vals[bi, li] = arr[:, 2]
+            present[bi, li] = True
+        rows = np.arange(B)[:, None]
+        order = np.argsort(np.where(present, -vals, np.inf), axis=1, kind="stable")
+        rank = np.empty((B, L), dtype=np.int64)
+        rank[rows, order] = np.arange(1, L + 1)
+        rank = np.where(present, rank, 0)
+
+        cum = np.cumsum(np.take_along_axis(vals, order, axis=1), axis=1)
+        total = cum[:, -1:] if L else np.zeros((B, 1))
+        pct_sorted = np.where(total != 0, cum / np.where(total != 0, total, 1.0) * 100.0, 0.0)
+        pct = np.empty((B, L))
+        pct[rows, order] = pct_sorted
+        pct = np.where(present, pct, 0.0)
+        state = np.where(present, 1 + (pct > thr).astype(np.int64) + (pct > thr_b), 0)
+
+        transitions = [
+            np.bincount(state[i] * 4 + state[i + 1], minlength=16).reshape(4, 4).tolist()
+            for i in range(B - 1)
+        ]
+        best = np.where(present, rank, L + 1).min(axis=0) if B else np.zeros(L, dtype=np.int64)
+        keep = np.argsort(best, kind="stable")[:max_labels]
+        keep = keep[best[keep] <= L]
+
+        up, down = [], []
+        if B:
+            both = np.flatnonzero(present[0] & present[-1])
+            delta = rank[0, both] - rank[-1, both]  # pozitif: sıra yükseldi
+            o = np.argsort(-delta, kind="stable")
+            up = [(int(both[j]), int(rank[0, both[j]]), int(rank[-1, both[j]])) for j in o[:movers] if delta[j] > 0]
+            o = np.argsort(delta, kind="stable")
+            down = [(int(both[j]), int(rank[0, both[j]]), int(rank[-1, both[j]])) for j in o[:movers] if delta[j] < 0]
+        return {
+            "keep": keep.tolist(),
+            "rank": rank[:, keep].T.tolist(),
+            "cum_pct": np.round(pct[:, keep].T, 2).tolist(),
+            "profit": np.round(vals[:, keep].T, 2).tolist(),
+            "state": state[:, keep].T.tolist(),
+            "transitions": transitions,
+            "movers": {"up": up, "down": down},
+        }
+
+    # sade Python fallback
+    by_bucket: List[Dict[int, float]] = [{} for _ in range(B)]
+    for b, l, v in cells:
+        by_bucket[int(b)][int(l)] = float(v)
+    rank_m = [[0] * L for _ in range(B)]
+    pct_m = [[0.0] * L for _ in range(B)]
+    state_m = [[0] * L for _ in range(B)]
+    for b, row in enumerate(by_bucket):
+        ordered = sorted(row, key=lambda l: (-row[l], l))
+        engine = ParetoEngine([row[l] for l in ordered])
+        for r, (l, c) in enumerate(zip(ordered, engine.cum_pct()), start=1):
+            rank_m[b][l] = r
+            pct_m[b][l] = c
+            state_m[b][l] = 1 + (c > thr) + (c > thr_b)
+    transitions = []
+    for b in range(B - 1):
+        t = [[0] * 4 for _ in range(4)]
+        for l in range(L):
+            t[state_m[b][l]][state_m[b + 1][l]] += 1
+        transitions.append(t)
+    best = [min((rank_m[b][l] for b in range(B) if rank_m[b][l]), default=L + 1) for l in range(L)]
+    keep = [l for l in sorted(range(L), key=lambda l: best[l])[:max_labels] if best[l] <= L]
+
+    up, down = [], []
+    if B:
+        both = [l for l in range(L) if rank_m[0][l] and rank_m[-1][l]]
+        moves = [(l, rank_m[0][l], rank_m[-1][l]) for l in both]
+        up = [m for m in sorted(moves, key=lambda m: -(m[1] - m[2]))[:movers] if m[1] > m[2]]
+        down = [m for m in sorted(moves, key=lambda m: m[1] - m[2])[:movers] if m[1] < m[2]]
+    return {
+        "keep": keep,
+        "rank": [[rank_m[b][l] for b in range(B)] for l in keep],
+        "cum_pct": [[round(pct_m[b][l], 2) for b in range(B)] for l in keep],
+        "profit": [[round(by_bucket[b].get(l, 0.0), 2) for b in range(B)] for l in keep],
+        "state": [[state_m[b][l] for b in range(B)] for l in keep],
+        "transitions": transitions,
+        "movers": {"up": up, "down": down},
+    }
+
+
+# ---------------- what-if senaryo ızgarası ----------------
+GRID_BLOCK_ELEMENTS = 2_000_000  # bir blokta (senaryo x ürün) en fazla eleman
+
+
+def _scenario_summary(values: Sequence[float], thr: float, thr_b: float) -> Dict[str, Any]:
+    engine = ParetoEngine(sorted(values, reverse=True))
+    summary = engine.abc_summary(thr, thr_b)
+    return {
+        "sum_profit": round(engine.total, 2),
+        "idx_threshold": engine.threshold_index(thr),
+        "shares": {c: summary[c]["share_pct"] for c in ABC_CLASSES},
+        "counts": {c: summary[c]["count"] for c in ABC_CLASSES},
+    }
+
+
+def scenario_grid(
+    revenue: Sequence[float],
+    cogs: Sequence[float],
+    selected: Sequence[bool],
+    price_deltas_pct: Sequence[float],
+    uplifts_pct: Sequence[float],
+    thr: float = 80,
+    thr_b: float = 95,
+) -> List[Dict[str, Any]]:
+    """
+    Ürün bazlı SUM(price*sales) ve SUM(cost*sales) dizileri üzerinde tüm
+    (fiyat değişimi x satış artışı) senaryolarını değerlendirir.
+    Seçili ürünler: (1+p)(1+u)*revenue - (1+u)*cogs, diğerleri: revenue - cogs.
+    Her senaryo kendi kârına göre yeniden sıralanır; çıktı satır öncelikli
+    (price_delta dış döngü) senaryo listesidir.
+    """
+    scenarios = [(p, u) for p in price_deltas_pct for u in uplifts_pct]
+    n = len(revenue)
+
+    if np is None or n == 0:
+        out = []
+        for p, u in scenarios:
+            k_rev, k_cogs = (1 + p / 100.0) * (1 + u / 100.0), 1 + u / 100.0
+            vals = [
+                (k_rev * r - k_cogs * c) if s else (r - c)
+                for r, c, s in zip(revenue, cogs, selected)
+            ]
+            out.append({"price_delta_pct": p, "sales_uplift_pct": u, **_scenario_summary(vals, thr, thr_b)})
+        return out
+
+    rev = np.ascontiguousarray(revenue, dtype=np.float64)
+    cg = np.ascontiguousarray(cogs, dtype=np.float64)
+    sel = np.asarray(selected, dtype=bool)
+    base = rev - cg
+    p_arr = np.array([s[0] for s in scenarios], dtype=np.float64)
+    u_arr = np.array([s[1] for s in scenarios], dtype=np.float64)
+    k_rev = (1 + p_arr / 100.0) * (1 + u_arr / 100.0)
+    k_cogs = 1 + u_arr / 100.0
+
+    out: List[Dict[str, Any]] = []
+    step = max(1, GRID_BLOCK_ELEMENTS // n)
+    for lo in range(0, len(scenarios), step):
+        hi = min(lo + step, len(scenarios))
+        # (blok, n) simülasyon matrisi; seçili olmayan sütunlar sabit kalır
+        sim = np.where(sel, k_rev[lo:hi, None] * rev - k_cogs[lo:hi, None] * cg, base)
+        sim = -np.sort(-sim, axis=1)  # DESC
+        cum = np.cumsum(sim, axis=1)
+        total = cum[:, -1]
+        safe = np.where(total != 0, total, 1.0)[:, None]
+        pct = np.where(total[:, None] != 0, cum / safe * 100.0, 0.0)
+
+        run_max = np.maximum.accumulate(pct, axis=1)
+        idx = (run_max < thr).sum(axis=1)
+        idx = np.where(idx < n, idx, -1)
+
+        is_a = pct <= thr
+        is_b = (pct > thr) & (pct <= thr_b)
+        is_c = ~(is_a | is_b)
+        share_div = np.where(total != 0, total, 1.0) / 100.0
+        for k, i in enumerate(range(lo, hi)):
+            masks = {"A": is_a[k], "B": is_b[k], "C": is_c[k]}
+            out.append({
+                "price_delta_pct": float(p_arr[i]),
+                "sales_uplift_pct": float(u_arr[i]),
+                "sum_profit": round(float(total[k]), 2),
+                "idx_threshold": int(idx[k]),
+                "shares": {c: round(float(sim[k][m].sum() / share_div[k]), 2) for c, m in masks.items()},
+                "counts": {c: int(m.sum()) for c, m in masks.items()},
+            })
+    return out
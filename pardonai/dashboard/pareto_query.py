@@ -0,0 +1,232 @@
+# pardonai/dashboard/pareto_query.py
+"""
+Pareto API'lerinin ortak sorgu katmanı: istek parametreleri, filtrelenmiş
+kaynak (rollup güncelse product_metric_daily, değilse product_metric),
+önbellekli gruplanmış agregasyon, what-if sorguları, uzun kuyruk katlama
+ve approx=1 yanıtı.
+
+views.py, views_pareto.py, views_async.py ve bench komutları bu modülü
+kullanır; view'lardan bağımsızdır (HTTP yanıtı üretmez).
+"""
+from __future__ import annotations
+from typing import List, Dict, Any, Optional, Tuple
+from math import fsum
+
+from django.db.models import Sum, Avg, Q, F, Case, When, Value, FloatField, ExpressionWrapper
+from django.utils.dateparse import parse_date
+
+from .models import ProductMetric, ProductMetricDaily
+from .search import name_search_q
+from .pareto_cache import aggregate_cache, make_key
+from .rollup import filtered_rollup, rollup_annotations, rollup_enabled, rollup_is_current
+from .sketch import approx_pareto
+from .timing import phase
+
+
+OTHERS_LABEL = "Others"   # max_points dışında kalan etiketlerin toplandığı kova
+
+# --------------------- parametreler ve kaynak ---------------------
+def safe_float(x, default=0.0) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return default
+
+def get_params(request):
+    date_from = parse_date(request.GET.get("date_from") or "")
+    date_to   = parse_date(request.GET.get("date_to") or "")
+    search    = (request.GET.get("search") or "").strip()
+    groupby   = "id" if (request.GET.get("groupby") or "").lower() == "id" else "name"  # name|id
+    threshold = int(safe_float(request.GET.get("threshold") or 80, 80))
+    threshold = max(50, min(threshold, 95))
+    return date_from, date_to, search, groupby, threshold
+
+def get_product_ids(request) -> List[int]:
+    raw = (request.GET.get("product_ids") or "").strip()
+    return [int(x) for x in raw.split(",") if x.strip().isdigit()]
+
+def filtered_qs(request):
+    """
+    Filtrelenmiş + gruplanmış agregasyon: (labels, profit, click, sales, rows).
+    Sonuç eşikten bağımsızdır ve aggregate_cache'te saklanır; dönen listeler
+    paylaşımlıdır, değiştirilmemelidir.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    product_ids = get_product_ids(request)
+    key = make_key(date_from, date_to, search, groupby, product_ids, request)
+    with phase("aggregate"):
+        return aggregate_cache.get_or_compute(
+            key, lambda: _query_aggregate(date_from, date_to, search, groupby, product_ids)
+        )
+
+def raw_annotations() -> Dict[str, Any]:
+    """product_metric üzerinde gruplanmış agregatlar (rollup_annotations ile aynı isimler)."""
+    return dict(
+        sum_profit=Sum("total_profit"),
+        sum_click=Sum("click"),
+        sum_sales=Sum("sales"),
+        avg_cost=Avg("cost"),
+        avg_price=Avg("sales_price"),
+        avg_unit_profit=Avg("unit_profit"),
+        avg_ppc=Avg("profit_per_click"),
+    )
+
+def grouped_source(date_from, date_to, search, groupby, product_ids):
+    """
+    Filtrelenmiş kaynak tablo + gruplama anahtarı + agregatlar.
+    Rollup güncelse product_metric_daily, değilse product_metric kullanılır.
+    Dönüş: (base_qs, key, annotations, profit_field)
+    """
+    key = "product_name" if groupby == "name" else "product_id"
+
+    if rollup_enabled() and rollup_is_current():
+        # günlük özet tablosu: ham satır sayısından bağımsız
+        base = filtered_rollup(date_from, date_to, search, product_ids)
+        return base, key, rollup_annotations(), "sum_profit"
+
+    return raw_filtered(date_from, date_to, search, product_ids), key, raw_annotations(), "total_profit"
+
+def raw_filtered(date_from, date_to, search, product_ids):
+    """Filtrelenmiş ham product_metric satırları."""
+    base = ProductMetric.objects.all()
+    if date_from:
+        base = base.filter(ts__gte=date_from)
+    if date_to:
+        base = base.filter(ts__lte=date_to)
+    if search:
+        base = base.filter(name_search_q(search, ProductMetric))
+    if product_ids:
+        base = base.filter(product_id__in=product_ids)
+    return base
+
+def aggregate_row(r, key) -> Dict[str, Any]:
+    """Gruplanmış satırın tablo/önbellek biçimi (TABLE_COLUMNS)."""
+    return {
+        "label": r[key],
+        "sum_profit": float(r["sum_profit"] or 0),
+        "sum_click": int(r["sum_click"] or 0),
+        "sum_sales": int(r["sum_sales"] or 0),
+        "avg_cost": float(r["avg_cost"] or 0),
+        "avg_price": float(r["avg_price"] or 0),
+        "avg_unit_profit": float(r["avg_unit_profit"] or 0),
+        "avg_ppc": float(r["avg_ppc"] or 0),
+    }
+
+def _query_aggregate(date_from, date_to, search, groupby, product_ids):
+    base, key, annotations, _ = grouped_source(date_from, date_to, search, groupby, product_ids)
+    # eşit kârlarda etikete göre: tablo sayfalaması ve dışa aktarımla aynı sıra (sum_profit DESC, label ASC)
+    rows = [aggregate_row(r, key) for r in base.values(key).annotate(**annotations).order_by("-sum_profit", key)]
+
+    labels = [r["label"] for r in rows]
+    profit = [r["sum_profit"] for r in rows]
+    click  = [r["sum_click"] for r in rows]
+    sales  = [r["sum_sales"] for r in rows]
+    return labels, profit, click, sales, rows
+
+# --------------------- what-if ---------------------
+def revenue_cogs(base):
+    """Satır bazlı SUM(sales_price*sales) ve SUM(cost*sales); rollup'ta hazır tutulur."""
+    if base.model is ProductMetricDaily:
+        return Sum("sum_revenue"), Sum("sum_cogs")
+    return (
+        Sum(F("sales_price") * F("sales"), output_field=FloatField()),
+        Sum(F("cost") * F("sales"), output_field=FloatField()),
+    )
+
+def whatif_query(request, price_delta_pct: float, sales_uplift_pct: float, selected) -> Tuple[List[str], List[float]]:
+    """
+    What-if simülasyonu tek GROUP BY sorgusunda:
+      seçili (ya da seçim yoksa tümü): SUM((price*(1+p) - cost) * sales*(1+u))
+                                      = (1+p)(1+u)*SUM(price*sales) - (1+u)*SUM(cost*sales)
+      diğerleri:                       SUM((price - cost) * sales)
+    Seçim CASE ile gruplama anahtarı üzerinde uygulanır. DESC sıralı (labels, profits) döner.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    base, key, _, _ = grouped_source(date_from, date_to, search, groupby, get_product_ids(request))
+    revenue, cogs = revenue_cogs(base)
+
+    k_rev = (1.0 + price_delta_pct / 100.0) * (1.0 + sales_uplift_pct / 100.0)
+    k_cogs = 1.0 + sales_uplift_pct / 100.0
+    simulated = Value(k_rev) * F("revenue") - Value(k_cogs) * F("cogs")
+    if selected:
+        if key == "product_id":
+            sel = [int(s) for s in selected if s.lstrip("-").isdigit()]
+        else:
+            sel = list(selected)
+        simulated = Case(
+            When(Q(**{f"{key}__in": sel}), then=simulated),
+            default=F("revenue") - F("cogs"),
+            output_field=FloatField(),
+        )
+
+    rows = (
+        base.values(key)
+        .annotate(revenue=revenue, cogs=cogs)
+        .annotate(sim_profit=ExpressionWrapper(simulated, output_field=FloatField()))
+        .order_by("-sim_profit")
+    )
+    labels: List[str] = []
+    profits: List[float] = []
+    with phase("aggregate"):
+        for r in rows:
+            labels.append(str(r[key]))
+            profits.append(float(r["sim_profit"] or 0.0))
+    return labels, profits
+
+def whatif_components(request) -> Tuple[List[str], List[float], List[float]]:
+    """Tek sorguda etiket bazlı SUM(price*sales) ve SUM(cost*sales); temel kâra göre DESC."""
+    date_from, date_to, search, groupby, _ = get_params(request)
+    base, key, _, _ = grouped_source(date_from, date_to, search, groupby, get_product_ids(request))
+    revenue, cogs = revenue_cogs(base)
+    rows = (
+        base.values(key)
+        .annotate(revenue=revenue, cogs=cogs)
+        .annotate(base_profit=ExpressionWrapper(F("revenue") - F("cogs"), output_field=FloatField()))
+        .order_by("-base_profit")
+    )
+    labels: List[str] = []
+    rev: List[float] = []
+    cg: List[float] = []
+    with phase("aggregate"):
+        for r in rows:
+            labels.append(str(r[key]))
+            rev.append(float(r["revenue"] or 0.0))
+            cg.append(float(r["cogs"] or 0.0))
+    return labels, rev, cg
+
+# --------------------- payload yardımcıları ---------------------
+def fold_long_tail(request, labels, profit, cum_pct, idx):
+    """
+    max_points=K: ilk K etiket korunur, kalanlar tek bir "Others" kovasında
+    toplanır. Toplam ve kümülatif yüzdeler tam vektör üzerinden hesaplandığı
+    için değişmez; kovanın kümülatifi son noktanınkidir (100). Eşik kovaya
+    düşüyorsa idx kovayı gösterir. Dönüş: (labels, profit, cum_pct, idx, others)
+    """
+    k = int(safe_float(request.GET.get("max_points"), 0))
+    n = len(labels)
+    if k <= 0 or k >= n:
+        return labels, profit, cum_pct, idx, None
+    rest = fsum(profit[k:])
+    others = {"label": OTHERS_LABEL, "count": n - k, "sum_profit": round(rest, 2)}
+    return (
+        list(labels[:k]) + [OTHERS_LABEL],
+        list(profit[:k]) + [rest],
+        list(cum_pct[:k]) + [cum_pct[-1]],
+        min(idx, k) if idx >= 0 else idx,
+        others,
+    )
+
+def approx_payload(request) -> Optional[Dict[str, Any]]:
+    """
+    approx=1: günlük top-k özetlerinden (sketch.py) tahmini pareto; ilk
+    max_points (yoksa özet kapasitesi) etiket, hata payları ve kesin toplam.
+    Özetler arama / ürün filtresi taşımaz: bu filtrelerle None döner ve
+    çağıran kesin agregasyona düşer.
+    """
+    if (request.GET.get("approx") or "").lower() not in ("1", "true"):
+        return None
+    date_from, date_to, search, groupby, threshold = get_params(request)
+    if search or get_product_ids(request):
+        return None
+    k = int(safe_float(request.GET.get("max_points"), 0))
+    return {"approx": True, **approx_pareto(date_from, date_to, groupby, k=k if k > 0 else None, threshold=threshold)}
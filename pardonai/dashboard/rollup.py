@@ -0,0 +1,254 @@
+# pardonai/dashboard/rollup.py
+"""
+product_metric -> product_metric_daily günlük özet tablosu.
+
+Her (product_id, product_name, gün) için toplamlar tutulur; pareto agregasyonu
+ham satırlar yerine bu tablodan yapılır, böylece gecikme ham geçmişin
+büyüklüğünden bağımsız kalır.
+
+Yenileme:
+  - ORM yazımları (signals.py) ve load_product_metrics etkilenen günleri
+    yazımla aynı transaction'da kirli işaretler; yeni eklenen satırlar
+    dahil. PostgreSQL'de sequence id'leri sırasız commit olabilir: su
+    seviyesinin altında kalan geç bir satırı da kirli gün yakalar.
+  - refresh_product_rollup düzenli (ör. dakikada bir) zamanlanmalıdır;
+    toplu yüklemeden sonra da bu komut gerekir. Varsayılan olarak istek
+    yolundaki yazımlar yalnızca günü kirli işaretler: commit sonrası
+    yenileme günün tüm ham satırlarını yeniden okur ve isteğin içinde
+    çalışır. Bedeli: yazımdan sonraki ilk yenilemeye kadar okumalar ham
+    tabloya döner (aşağıya bkz.). Yazımın çok seyrek olduğu kurulumlarda
+    PARETO_ROLLUP_REFRESH_ON_COMMIT=True ile her yazım transaction'ından
+    sonra bir kez (schedule_refresh) artımlı yenileme çalıştırılabilir.
+  - artımlı (refresh_product_rollup): su seviyesinden (last_metric_id) sonra
+    eklenen satırların günleri + kirli günler yeniden hesaplanır.
+  - tam (rebuild_product_rollup): tablo baştan üretilir. queryset.update()/
+    delete() / bulk_create gibi sinyal üretmeyen toplu değişikliklerden
+    sonra gerekir (ya da etkilenen günler için mark_dirty).
+    Aynı yazımlar ham tablonun arama kolonunu da güncellemez
+    (reconcile_product_name_search, search.py).
+
+Günlerin yeniden hesabı rollup durum satırını kilitler: eşzamanlı
+yenilemeler aynı günü iki kez yazamaz. Kirli işaretler aynı transaction'da,
+ham satırlar okunmadan önce silinir; yenileme sırasında gelen bir yazımın
+işareti kaybolmaz. Yeniden hesaplanan günlerin ABC snapshot dönemleri aynı
+transaction'da bayat işaretlenir (abc_snapshot.mark_stale).
+
+Rollup güncel değilse (yeni satır ya da kirli gün varsa) endpoint'ler ham
+tabloya döner; yanlış sonuç yerine yavaş sonuç.
+"""
+from __future__ import annotations
+from typing import Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, F, FloatField, Max, OuterRef, Q, Sum
+from django.db.models.functions import Cast, Greatest
+from django.utils import timezone
+
+from . import write_batch
+from .search import fold_search, name_search_q
+from .models import (
+    ProductMetric,
+    ProductMetricDaily,
+    ProductMetricDirtyDay,
+    ProductMetricRollupState,
+)
+
+DAY_CHUNK = 31       # bir transaction'da yeniden hesaplanan gün sayısı
+INSERT_BATCH = 5000
+
+
+def rollup_enabled() -> bool:
+    return getattr(settings, "PARETO_USE_ROLLUP", True)
+
+
+def mark_dirty(days: Iterable) -> None:
+    """Verilen günleri yeniden hesaplanacak olarak işaretle (ts None da olabilir)."""
+    objs = [ProductMetricDirtyDay(day=d) for d in set(days)]
+    if objs:
+        ProductMetricDirtyDay.objects.bulk_create(objs, ignore_conflicts=True)
+
+
+def schedule_refresh(days: Iterable) -> None:
+    """
+    Tekil yazımlar için: günler yazımın transaction'ında kirli işaretlenir
+    (transaction başına gün başına bir kez); PARETO_ROLLUP_REFRESH_ON_COMMIT
+    açıksa commit'te artımlı yenileme bir kez çalışır.
+    """
+    write_batch.record(days, mark_dirty, _refresh_on_commit)
+
+
+def _refresh_on_commit(days) -> None:
+    if rollup_enabled() and getattr(settings, "PARETO_ROLLUP_REFRESH_ON_COMMIT", False):
+        refresh_incremental()
+
+
+def _state() -> ProductMetricRollupState:
+    state, _ = ProductMetricRollupState.objects.get_or_create(pk=1)
+    return state
+
+
+def rollup_is_current() -> bool:
+    """
+    Rollup ham tabloyla birebir mi? Tek sorgu: durum satırı, su seviyesinden
+    sonra satır var mı (PK aralığı, EXISTS) ve kirli gün var mı (EXISTS).
+    Rollup hiç üretilmemişse False.
+    """
+    row = (
+        ProductMetricRollupState.objects.filter(pk=1)
+        .annotate(
+            newer=Exists(ProductMetric.objects.filter(id__gt=OuterRef("last_metric_id"))),
+            dirty=Exists(ProductMetricDirtyDay.objects.all()),
+        )
+        .values_list("newer", "dirty")
+        .first()
+    )
+    return row is not None and not any(row)
+
+
+def _day_filter(days: Sequence) -> Q:
+    real = [d for d in days if d is not None]
+    q = Q(ts__in=real) if real else Q(pk__in=[])
+    if len(real) != len(days):
+        q |= Q(ts__isnull=True)
+    return q
+
+
+def _rebuild_days(days: Sequence) -> int:
+    """
+    Verilen günlerin rollup satırlarını ham tablodan yeniden üret. Durum
+    satırı kilitlenir (eşzamanlı yenilemeler sıraya girer); günlerin kirli
+    işaretleri ham satırlar okunmadan önce aynı transaction'da silinir,
+    ABC dönemleri bayat işaretlenir.
+    """
+    raw = (
+        ProductMetric.objects.filter(_day_filter(days))
+        .values("product_id", "product_name", "ts")
+        .annotate(
+            row_count=Count("id"),
+            sum_profit=Sum("total_profit"),
+            sum_click=Sum("click"),
+            sum_sales=Sum("sales"),
+            sum_cost=Sum("cost"),
+            sum_price=Sum("sales_price"),
+            sum_unit_profit=Sum("unit_profit"),
+            sum_ppc=Sum("profit_per_click"),
+            sum_revenue=Sum(F("sales_price") * F("sales"), output_field=FloatField()),
+            sum_cogs=Sum(F("cost") * F("sales"), output_field=FloatField()),
+        )
+        .order_by()
+    )
+    written = 0
+    from . import abc_snapshot  # döngüsel: abc_snapshot rollup'ı içe aktarır
+
+    with transaction.atomic():
+        list(ProductMetricRollupState.objects.select_for_update().filter(pk=1).values_list("pk", flat=True))
+        rollup_days = Q(day__in=[d for d in days if d is not None])
+        if None in days:
+            rollup_days |= Q(day__isnull=True)
+        ProductMetricDirtyDay.objects.filter(rollup_days).delete()
+        ProductMetricDaily.objects.filter(rollup_days).delete()
+        abc_snapshot.mark_stale(days)
+
+        batch: List[ProductMetricDaily] = []
+        for r in raw.iterator(chunk_size=INSERT_BATCH):
+            batch.append(ProductMetricDaily(
+                product_id=r["product_id"],
+                product_name=r["product_name"],
+                product_name_search=fold_search(r["product_name"]),
+                day=r["ts"],
+                row_count=r["row_count"],
+                sum_profit=r["sum_profit"] or 0.0,
+                sum_click=r["sum_click"] or 0,
+                sum_sales=r["sum_sales"] or 0,
+                sum_cost=r["sum_cost"] or 0.0,
+                sum_price=r["sum_price"] or 0.0,
+                sum_unit_profit=r["sum_unit_profit"] or 0.0,
+                sum_ppc=r["sum_ppc"] or 0.0,
+                sum_revenue=r["sum_revenue"] or 0.0,
+                sum_cogs=r["sum_cogs"] or 0.0,
+            ))
+            if len(batch) >= INSERT_BATCH:
+                ProductMetricDaily.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            ProductMetricDaily.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+def _rebuild_in_chunks(days: List) -> int:
+    days = sorted(days, key=lambda d: (d is not None, d))
+    written = 0
+    for i in range(0, len(days), DAY_CHUNK):
+        written += _rebuild_days(days[i:i + DAY_CHUNK])
+    return written
+
+
+def refresh_incremental() -> dict:
+    """Yeni eklenen satırların ve kirli günlerin rollup'ını güncelle."""
+    state = _state()
+    max_id = ProductMetric.objects.aggregate(m=Max("id"))["m"] or 0
+
+    new_days = set(
+        ProductMetric.objects.filter(id__gt=state.last_metric_id, id__lte=max_id)
+        .values_list("ts", flat=True).distinct().order_by()
+    )
+    days = new_days | set(ProductMetricDirtyDay.objects.values_list("day", flat=True))
+
+    # kirli işaretler gün gün, yeniden hesapla aynı transaction'da silinir;
+    # yenileme sırasında işaretlenen yeni kirli günler bir sonraki tura kalır
+    written = _rebuild_in_chunks(list(days))
+
+    # eşzamanlı bir yenileme su seviyesini geri çekemez
+    ProductMetricRollupState.objects.filter(pk=1).update(
+        last_metric_id=Greatest(F("last_metric_id"), max_id), refreshed_at=timezone.now(),
+    )
+    return {"days": len(days), "rows": written, "last_metric_id": max(state.last_metric_id, max_id)}
+
+
+def rebuild_all() -> dict:
+    """Rollup tablosunu sıfırdan üret."""
+    max_id = ProductMetric.objects.aggregate(m=Max("id"))["m"] or 0
+    ProductMetricDirtyDay.objects.all().delete()
+    ProductMetricDaily.objects.all().delete()
+    days = list(ProductMetric.objects.filter(id__lte=max_id).values_list("ts", flat=True).distinct().order_by())
+    written = _rebuild_in_chunks(days)
+
+    state = _state()
+    state.last_metric_id = max_id
+    state.refreshed_at = timezone.now()
+    state.save(update_fields=["last_metric_id", "refreshed_at"])
+    return {"days": len(days), "rows": written, "last_metric_id": max_id}
+
+
+def filtered_rollup(date_from=None, date_to=None, search: str = "", product_ids: Optional[Sequence[int]] = None):
+    """_query_aggregate filtrelerinin rollup karşılığı (ts -> day)."""
+    qs = ProductMetricDaily.objects.all()
+    if date_from:
+        qs = qs.filter(day__gte=date_from)
+    if date_to:
+        qs = qs.filter(day__lte=date_to)
+    if search:
+        qs = qs.filter(name_search_q(search, ProductMetricDaily))
+    if product_ids:
+        qs = qs.filter(product_id__in=product_ids)
+    return qs
+
+
+def _avg(field: str):
+    return Cast(Sum(field), FloatField()) / Cast(Sum("row_count"), FloatField())
+
+
+def rollup_annotations() -> dict:
+    """Ham tablodaki annotate(...) ile aynı isimli agregatlar."""
+    return {
+        "sum_profit": Sum("sum_profit"),
+        "sum_click": Sum("sum_click"),
+        "sum_sales": Sum("sum_sales"),
+        "avg_cost": _avg("sum_cost"),
+        "avg_price": _avg("sum_price"),
+        "avg_unit_profit": _avg("sum_unit_profit"),
+        "avg_ppc": _avg("sum_ppc"),
+    }
@@ -0,0 +1,87 @@
+# pardonai/dashboard/search.py
+"""
+Ürün adı araması için normalize edilmiş gölge kolon (product_name_search).
+
+fold_search: Türkçe kurallarıyla küçük harfe çevirir (İ -> i, I -> ı) ve ASCII'ye
+indirger (ı -> i, ş -> s, ğ -> g, ü -> u, ö -> o, ç -> c, diğer aksanlar atılır).
+Böylece "İSTANBUL", "istanbul" ve "Istanbul" aynı anahtara düşer.
+
+Arama her motorda alt dize aramasıdır ("ahve" -> "Kahve"):
+  - PostgreSQL: gölge kolonda pg_trgm GIN indeksi; LIKE '%x%' doğrudan.
+  - Diğerleri (SQLite): LIKE '%x%' B-tree kullanamaz. Koşul önce gölge
+    kolonun dar indeksinde (covering index taraması, tablo okunmaz) eşleşen
+    farklı değerlere uygulanır, satırlar bu değerlerle indeksten aranır:
+    col IN (SELECT DISTINCT col ... WHERE col LIKE '%x%').
+
+Eşitleme: gölge kolon veritabanında hesaplanmaz (Türkçe katlama ve aksan
+atma SQL'de motorlar arası aynı yapılamaz). ProductMetric.save(),
+load_product_metrics ve rollup yeniden hesabı onu doldurur. Sinyal üretmeyen
+yazımlar doldurmaz: QuerySet.update(product_name=...) ve save() çağırmayan
+bulk_create sonrası satırlar aramada sessizce kaybolur. Bu yazımlarda
+product_name_search da verilmeli ya da reconcile_product_name_search
+çalıştırılmalıdır (--dry-run: yalnızca raporlar). Rollup ve özetlerin aynı
+yazımlar için yeniden üretilmesi gibi (rollup.py, sketch.py).
+"""
+from __future__ import annotations
+import unicodedata
+from typing import List, Tuple
+
+from django.db import connection
+from django.db.models import Q
+
+SEARCH_FIELD = "product_name_search"
+
+_TR_LOWER = str.maketrans({"İ": "i", "I": "ı"})
+_ASCII_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c"})
+
+
+def fold_search(text) -> str:
+    if not text:
+        return ""
+    s = str(text).translate(_TR_LOWER).lower().translate(_ASCII_FOLD)
+    s = unicodedata.normalize("NFKD", s)
+    return "".join(ch for ch in s if not unicodedata.combining(ch)).strip()
+
+
+def uses_trigram() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def name_search_q(search: str, model, field: str = SEARCH_FIELD) -> Q:
+    """Normalize edilmiş terimle alt dize filtresi; model, filtrelenen tablonun modeli."""
+    term = fold_search(search)
+    if not term:
+        return Q()
+    contains = Q(**{f"{field}__contains": term})
+    if uses_trigram():
+        return contains
+    values = model.objects.filter(contains).values(field).distinct().order_by()
+    return Q(**{f"{field}__in": values})
+
+
+def name_matches(search: str, name: str) -> bool:
+    """name_search_q'nun Python karşılığı (önbellek invalidasyonu için, geniş tutulur)."""
+    return fold_search(search) in fold_search(name)
+
+
+def reconcile(dry_run: bool = False) -> List[Tuple[str, str, str, int]]:
+    """
+    Gölge kolonu fold_search(product_name) ile karşılaştırıp onarır; farklı
+    (ad, gölge) çifti başına tek UPDATE. Dönüş: (tablo, ad, saklanan, satır sayısı).
+    """
+    from .models import ProductMetric, ProductMetricDaily  # döngüsel: models bu modülü içe aktarır
+    from .pareto_cache import invalidate_all
+
+    drift = []
+    for model in (ProductMetric, ProductMetricDaily):
+        pairs = model.objects.values_list("product_name", SEARCH_FIELD).distinct().order_by()
+        for name, stored in pairs.iterator():
+            expected = fold_search(name)
+            if stored == expected:
+                continue
+            rows = model.objects.filter(product_name=name, **{SEARCH_FIELD: stored})
+            count = rows.count() if dry_run else rows.update(**{SEARCH_FIELD: expected})
+            drift.append((model._meta.db_table, name, stored, count))
+    if drift and not dry_run:
+        invalidate_all()  # aramalı önbellek girdileri ve ETag'ler
+    return drift
@@ -0,0 +1,81 @@
+# pardonai/dashboard/signals.py
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import counters, stats
+from .conditional import schedule_bump
+from .models import Businesses as CoreBusinesses, ProductMetric
+from .pareto_cache import schedule_invalidate
+from .rollup import schedule_refresh
+from .sketch import schedule_rebuild
+
+
+@receiver(pre_save, sender=ProductMetric)
+def _remember_old_metric(sender, instance, raw=False, **kwargs):
+    # güncellemede eski ts/ürün, artık eşleşmeyen önbellek girdilerini de etkiler
+    instance._pareto_old = None
+    if instance.pk and not raw:
+        instance._pareto_old = (
+            ProductMetric.objects.filter(pk=instance.pk)
+            .values_list("ts", "product_id", "product_name")
+            .first()
+        )
+
+
+@receiver(post_save, sender=ProductMetric)
+def _invalidate_on_save(sender, instance, **kwargs):
+    old = getattr(instance, "_pareto_old", None)
+    # önbellek commit'te düşer: commit'ten önce eski satırları okuyan istek yeniden dolduramaz
+    schedule_invalidate([(instance.ts, instance.product_id, instance.product_name)] + ([old] if old else []))
+    days = [instance.ts] + ([old[0]] if old else [])
+    # yeni satırlar da: sırasız commit olan bir id su seviyesinin altında kalabilir
+    schedule_refresh(days)
+    schedule_rebuild(days)
+    schedule_bump()
+
+
+@receiver(post_delete, sender=ProductMetric)
+def _invalidate_on_delete(sender, instance, **kwargs):
+    schedule_invalidate([(instance.ts, instance.product_id, instance.product_name)])
+    schedule_refresh([instance.ts])
+    schedule_rebuild([instance.ts])
+    schedule_bump()
+
+
+# durum sayaçları (counters.py): eski durum yazımdan önce, fark yazımdan sonra
+def _counter_old_state(sender, instance, raw=False, **kwargs):
+    instance._counter_old = None
+    if instance.pk and not raw:
+        instance._counter_old = counters.load_state(sender, instance.pk)
+
+
+def _counter_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # loaddata: reconcile_status_counters ile onarılır
+    old, new = getattr(instance, "_counter_old", None), counters.load_state(sender, instance.pk)
+    # menü taşınınca ürün sayaçları da taşınır; sayaç adları ayrık, birleşim çakışmaz
+    counters.apply({**counters.deltas(old, new), **counters.moved_deltas(sender, instance.pk, old, new)})
+
+
+def _counter_on_delete(sender, instance, **kwargs):
+    counters.apply(counters.deltas(getattr(instance, "_counter_old", None), None))
+
+
+for _model in counters.COUNTERS:
+    _label = _model._meta.label
+    pre_save.connect(_counter_old_state, sender=_model, dispatch_uid=f"status_counter_pre_save_{_label}")
+    post_save.connect(_counter_on_save, sender=_model, dispatch_uid=f"status_counter_save_{_label}")
+    pre_delete.connect(_counter_old_state, sender=_model, dispatch_uid=f"status_counter_pre_delete_{_label}")
+    post_delete.connect(_counter_on_delete, sender=_model, dispatch_uid=f"status_counter_delete_{_label}")
+
+
+@receiver(post_delete, sender=CoreBusinesses)
+def _forget_business_counters(sender, instance, **kwargs):
+    counters.forget_business(instance.pk)
+
+
+# dashboard sayaçları: ilgili tablolara her tekil yazım anlık görüntüyü commit'te düşürür
+for _model in stats.MODELS:
+    _label = _model._meta.label
+    post_save.connect(stats.schedule_invalidate, sender=_model, dispatch_uid=f"dashboard_stats_save_{_label}")
+    post_delete.connect(stats.schedule_invalidate, sender=_model, dispatch_uid=f"dashboard_stats_delete_{_label}")
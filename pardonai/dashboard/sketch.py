@@ -0,0 +1,334 @@
+# pardonai/dashboard/sketch.py
+"""
+approx=1 pareto için gün başına top-k (Space-Saving) özetleri.
+
+Her (gün, groupby) için en fazla `capacity` etiketin kâr sayacı ve hata payı
+tutulur. Özetler birleştirilebilir (mergeable summaries): bir etiket özette
+yoksa değeri o özetin tabanını (floor: dolu özette en küçük sayaç, değilse 0)
+geçemez. Birleştirmede eksik etiketlere taban eklenir, en büyük `capacity`
+sayaç kalır.
+
+Sayaçlara yalnızca pozitif kâr katkıları girer. Negatif katkılar ayrı bir
+zarar tabanıyla (loss) sınırlanır: özetteki herhangi bir etiketin toplam
+zararı loss'u geçemez. Kesin toplamlardan üretilen özette loss en büyük tekil
+zarardır; birleştirmede loss'lar toplanır. Böylece:
+  - sayaç (count) gerçek değerin üst sınırıdır,
+  - count - error - loss alt sınırdır (+100 ve -80'lik iki günü olan etiket
+    için count=100, loss>=80),
+  - listede olmayan her etiketin değeri unlisted_max'ı geçemez.
+
+Toplam (total) negatifler dahil kesindir, kümülatif eğri bu toplama göre
+tahmin edilir.
+
+Güncelleme:
+  - load_product_metrics her parçadan sonra günlük etiket toplamlarını
+    özetlere birleştirir (merge_day_sums).
+  - ORM ile tekil yazımlar günü yazımla aynı transaction'da stale işaretler
+    (schedule_rebuild, signals.py; gün başına bir kez, write_batch). Okuma
+    yolu hiç yazmaz (read-only replika uyumlu): stale günlerin özetleri
+    kullanılmaz, o günler ham tablodan kesin hesaplanır.
+  - stale günler `rebuild_product_sketches --stale` ile yeniden üretilir;
+    refresh_product_rollup ile birlikte düzenli zamanlanmalıdır. Yeniden
+    üretim günün tüm ham satırlarını okur; istek yolunda çalışmaması için
+    commit'te yeniden üretim varsayılan olarak kapalıdır
+    (PARETO_SKETCH_REBUILD_ON_COMMIT=True: transaction başına bir kez).
+  - rebuild_product_sketches tüm özetleri baştan üretir (--missing: yalnızca
+    özeti olmayan günler).
+
+Kapsam: okuma sırasında aralıkta verisi olan günler güncel özeti olan
+günlerle karşılaştırılır; özeti olmayan ya da stale günler (toplu yükleme,
+0007 öncesi veri, commit'i bekleyen yeniden üretim) ham tablodan kesin
+toplamlarla hesaplanıp birleştirilir. Özet hiç yoksa sonuç
+kesin yolla aynıdır, yalnızca capacity ile sınırlıdır; boş sonuç yalnızca
+aralıkta veri yoksa döner.
+"""
+from __future__ import annotations
+import struct
+import zlib
+from itertools import accumulate
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import ProductMetric, ProductMetricSketch
+from . import write_batch
+from .rollup import filtered_rollup, rollup_enabled, rollup_is_current
+
+GROUPBY_FIELDS = {"name": "product_name", "id": "product_id"}
+DAY_BATCH = 500  # SQLite parametre sınırı için IN (...) başına gün sayısı
+_SEP = "\x1f"
+
+
+def sketch_capacity() -> int:
+    return getattr(settings, "PARETO_SKETCH_CAPACITY", 512)
+
+
+class TopKSketch:
+    """Ağırlıklı Space-Saving özeti: etiket -> (sayaç, hata)."""
+
+    def __init__(self, capacity: int, counts: Optional[Dict[str, float]] = None,
+                 errors: Optional[Dict[str, float]] = None, total: float = 0.0, loss: float = 0.0):
+        self.capacity = capacity
+        self.counts: Dict[str, float] = counts or {}
+        self.errors: Dict[str, float] = errors or {}
+        self.total = total
+        self.loss = loss  # herhangi bir etiketin sayaca girmeyen toplam zararının üst sınırı
+
+    @property
+    def floor(self) -> float:
+        """Özette olmayan bir etiketin alabileceği en büyük değer."""
+        if len(self.counts) < self.capacity:
+            return 0.0
+        return min(self.counts.values())
+
+    @classmethod
+    def from_sums(cls, sums: Mapping[str, float], capacity: int, total: Optional[float] = None) -> "TopKSketch":
+        """Kesin etiket toplamlarından (hata 0) özet."""
+        positive = {k: float(v) for k, v in sums.items() if v and v > 0}
+        loss = max((-float(v) for v in sums.values() if v and v < 0), default=0.0)
+        sk = cls(capacity, positive, {k: 0.0 for k in positive},
+                 float(sum(sums.values())) if total is None else total, loss)
+        sk._truncate()
+        return sk
+
+    def merge(self, other: "TopKSketch") -> "TopKSketch":
+        fa, fb = self.floor, other.floor
+        counts: Dict[str, float] = {}
+        errors: Dict[str, float] = {}
+        for label in self.counts.keys() | other.counts.keys():
+            counts[label] = self.counts.get(label, fa) + other.counts.get(label, fb)
+            errors[label] = self.errors.get(label, fa) + other.errors.get(label, fb)
+        merged = TopKSketch(max(self.capacity, other.capacity), counts, errors,
+                            self.total + other.total, self.loss + other.loss)
+        merged._truncate()
+        return merged
+
+    def _truncate(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        keep = sorted(self.counts, key=self.counts.__getitem__, reverse=True)[: self.capacity]
+        self.counts = {k: self.counts[k] for k in keep}
+        self.errors = {k: self.errors[k] for k in keep}
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[str, float, float]]:
+        """(etiket, sayaç, hata), sayaca göre DESC; alt sınır için hataya loss da eklenmelidir."""
+        items = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        if k is not None:
+            items = items[:k]
+        return [(label, count, self.errors[label]) for label, count in items]
+
+    # ---------------- serileştirme ----------------
+    def to_bytes(self) -> bytes:
+        labels = list(self.counts)
+        n = len(labels)
+        body = struct.pack(f"<I{n}d{n}d", n, *(self.counts[l] for l in labels), *(self.errors[l] for l in labels))
+        return zlib.compress(body + _SEP.join(labels).encode("utf-8"))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, capacity: int, total: float = 0.0, loss: float = 0.0) -> "TopKSketch":
+        if not raw:
+            return cls(capacity, total=total, loss=loss)
+        body = zlib.decompress(bytes(raw))
+        (n,) = struct.unpack_from("<I", body)
+        values = struct.unpack_from(f"<{2 * n}d", body, 4)
+        labels = body[4 + 16 * n:].decode("utf-8").split(_SEP) if n else []
+        return cls(capacity, dict(zip(labels, values[:n])), dict(zip(labels, values[n:])), total, loss)
+
+
+# --------------------- saklama ---------------------
+def _day_q(day):
+    return {"day__isnull": True} if day is None else {"day": day}
+
+
+def _load(day, groupby: str, capacity: int) -> Optional[TopKSketch]:
+    row = (
+        ProductMetricSketch.objects.filter(groupby=groupby, **_day_q(day))
+        .values_list("data", "total", "loss").first()
+    )
+    return TopKSketch.from_bytes(row[0], capacity, row[1], row[2]) if row else None
+
+
+def _store(day, groupby: str, sk: TopKSketch) -> None:
+    updated = ProductMetricSketch.objects.filter(groupby=groupby, **_day_q(day)).update(
+        data=sk.to_bytes(), total=sk.total, loss=sk.loss, stale=False,
+    )
+    if not updated:
+        ProductMetricSketch.objects.bulk_create(
+            [ProductMetricSketch(day=day, groupby=groupby, data=sk.to_bytes(), total=sk.total, loss=sk.loss)],
+            ignore_conflicts=True,
+        )
+
+
+def _exact_day_sums(day, groupby: str) -> Dict[str, float]:
+    key = GROUPBY_FIELDS[groupby]
+    rows = (
+        ProductMetric.objects.filter(**({"ts__isnull": True} if day is None else {"ts": day}))
+        .values(key).annotate(s=Sum("total_profit")).order_by()
+    )
+    return {str(r[key]): float(r["s"] or 0.0) for r in rows}
+
+
+def rebuild_days(days: Iterable) -> int:
+    """
+    Verilen günlerin özetlerini ham tablodan kesin toplamlarla yeniden üret.
+    Günün özet satırları önce kilitlenir: aynı güne eşzamanlı yeniden üretim
+    ya da stale işaretleme sıraya girer, eski toplam yenisinin üstüne yazılmaz.
+    """
+    capacity = sketch_capacity()
+    n = 0
+    for day in set(days):
+        with transaction.atomic():
+            list(ProductMetricSketch.objects.select_for_update().filter(**_day_q(day)).values_list("pk", flat=True))
+            for groupby in GROUPBY_FIELDS:
+                sums = _exact_day_sums(day, groupby)
+                if sums:
+                    _store(day, groupby, TopKSketch.from_sums(sums, capacity))
+                else:
+                    ProductMetricSketch.objects.filter(groupby=groupby, **_day_q(day)).delete()
+        n += 1
+    return n
+
+
+def rebuild_all() -> int:
+    ProductMetricSketch.objects.all().delete()
+    days = ProductMetric.objects.values_list("ts", flat=True).distinct().order_by()
+    return rebuild_days(list(days))
+
+
+def rebuild_stale() -> int:
+    """Stale işaretli günler (tekil yazımlardan sonra, düzenli çalıştırılır)."""
+    return rebuild_days(set(ProductMetricSketch.objects.filter(stale=True).values_list("day", flat=True)))
+
+
+def rebuild_missing() -> int:
+    """Verisi olup hiç özeti olmayan günler (toplu yükleme sonrası geri doldurma)."""
+    return rebuild_days(_data_days() - set(ProductMetricSketch.objects.values_list("day", flat=True)))
+
+
+def _data_days(date_from=None, date_to=None) -> set:
+    """Aralıkta satırı olan günler; rollup güncelse özet tablodan (gün başına bir grup)."""
+    if rollup_enabled() and rollup_is_current():
+        qs = filtered_rollup(date_from, date_to).values_list("day", flat=True)
+    else:
+        qs = ProductMetric.objects.all()
+        if date_from:
+            qs = qs.filter(ts__gte=date_from)
+        if date_to:
+            qs = qs.filter(ts__lte=date_to)
+        qs = qs.values_list("ts", flat=True)
+    return set(qs.distinct().order_by())
+
+
+def _exact_sums(days: Iterable, groupby: str) -> Dict[str, float]:
+    """Verilen günlerin etiket toplamları (gün grupları birleşik, kesin)."""
+    key = GROUPBY_FIELDS[groupby]
+    days = list(days)
+    sums: Dict[str, float] = {}
+    if None in days:
+        days.remove(None)
+        sums = _exact_day_sums(None, groupby)
+    for i in range(0, len(days), DAY_BATCH):
+        rows = (
+            ProductMetric.objects.filter(ts__in=days[i:i + DAY_BATCH])
+            .values(key).annotate(s=Sum("total_profit")).order_by()
+        )
+        for r in rows:
+            label = str(r[key])
+            sums[label] = sums.get(label, 0.0) + float(r["s"] or 0.0)
+    return sums
+
+
+def merge_day_sums(day_sums: Mapping, groupby: str) -> None:
+    """
+    {gün: {etiket: kâr toplamı}} biçimindeki yeni satır toplamlarını mevcut
+    günlük özetlere birleştir (toplu yükleme yolu).
+    """
+    capacity = sketch_capacity()
+    stale = set(
+        ProductMetricSketch.objects.filter(groupby=groupby, stale=True, day__in=[d for d in day_sums if d is not None])
+        .values_list("day", flat=True)
+    )
+    for day, sums in day_sums.items():
+        if day in stale:
+            continue  # bekleyen yeniden üretim yeni satırları da kapsar; okuma o günü kesin hesaplar
+        fresh = TopKSketch.from_sums(sums, capacity)
+        current = _load(day, groupby, capacity)
+        _store(day, groupby, current.merge(fresh) if current is not None else fresh)
+
+
+def mark_stale(days: Iterable) -> None:
+    """Tekil yazımlarda: gün yeniden üretilene kadar okumada kesin hesaplanır."""
+    for day in set(days):
+        if not ProductMetricSketch.objects.filter(**_day_q(day)).update(stale=True):
+            # bu gün için henüz özet yok; boş ve stale kayıtlar açılır
+            ProductMetricSketch.objects.bulk_create(
+                [ProductMetricSketch(day=day, groupby=g, stale=True) for g in GROUPBY_FIELDS],
+                ignore_conflicts=True,
+            )
+
+
+def schedule_rebuild(days: Iterable) -> None:
+    """
+    Günleri stale işaretler. Transaction başına toplanır (write_batch): her gün
+    bir kez işaretlenir; PARETO_SKETCH_REBUILD_ON_COMMIT açıksa commit'te tüm
+    günler tek seferde üretilir. Özet hatası yazımı bozmaz, gün stale kalır
+    (rebuild_product_sketches --stale).
+    """
+    write_batch.record(days, mark_stale, _rebuild_on_commit)
+
+
+def _rebuild_on_commit(days) -> None:
+    if getattr(settings, "PARETO_SKETCH_REBUILD_ON_COMMIT", False):
+        rebuild_days(days)
+
+
+# --------------------- sorgu ---------------------
+def approx_pareto(date_from=None, date_to=None, groupby: str = "name",
+                  k: Optional[int] = None, threshold: float = 80) -> Dict:
+    """
+    Tarih aralığındaki günlük özetleri birleştirip tahmini pareto döner:
+    labels / profit (üst sınır tahmin) / error (profit - error alt sınırdır;
+    zarar tabanı dahil), kesin sum_profit, tahmini
+    cum_pct, idx_threshold, unlisted_max, verisi olan gün sayısı (days) ve
+    bunlardan özeti olmadığı için ham tablodan hesaplananlar (exact_days).
+    """
+    capacity = sketch_capacity()
+    qs = ProductMetricSketch.objects.filter(groupby=groupby)
+    if date_from:
+        qs = qs.filter(day__gte=date_from)
+    if date_to:
+        qs = qs.filter(day__lte=date_to)
+
+    merged = TopKSketch(capacity)
+    covered = set()
+    for day, raw, total, loss in qs.filter(stale=False).values_list("day", "data", "total", "loss").iterator():
+        merged = merged.merge(TopKSketch.from_bytes(raw, capacity, total, loss))
+        covered.add(day)
+
+    data_days = _data_days(date_from, date_to)
+    if date_from or date_to:
+        data_days.discard(None)
+    missing = data_days - covered
+    if missing:
+        merged = merged.merge(TopKSketch.from_sums(_exact_sums(missing, groupby), capacity))
+
+    top = merged.top(k)
+    labels = [int(l) if groupby == "id" else l for l, _, _ in top]
+    profit = [c for _, c, _ in top]
+    total = merged.total
+    cum = [min(c / total * 100.0, 100.0) if total else 0.0 for c in accumulate(profit)]
+    idx = next((i for i, c in enumerate(cum) if c >= threshold), -1)
+    return {
+        "labels": labels,
+        "profit": [round(p, 2) for p in profit],
+        "error": [round(e + merged.loss, 2) for _, _, e in top],
+        "cum_pct": [round(c, 2) for c in cum],
+        "sum_profit": round(total, 2),
+        "idx_threshold": idx,
+        # listede olmayan herhangi bir etiketin kârı için üst sınır
+        "unlisted_max": round(profit[-1] if len(top) < len(merged.counts) else merged.floor, 2),
+        "days": len(data_days),
+        "exact_days": len(missing),
+    }
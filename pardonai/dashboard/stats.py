@@ -0,0 +1,117 @@
+# pardonai/dashboard/stats.py
+"""
+Dashboard / performans sayfalarının sayaçları: tek sorgu + kısa süreli önbellek.
+
+Her tablo için koşullu agregasyonlar (COUNT(*) ve COUNT(*) FILTER (...)) tek
+satırlık birer SELECT'tir; menü / sipariş / hedef sayaçları ise taranmadan
+status_counter'ın işletme satırlarının toplamından gelir (counters.py). Hepsi UNION ALL
+ile birleştirilip tek gidiş-dönüşte okunur. Aktif işletme sayımı üyelik
+join'i + DISTINCT yerine EXISTS alt sorgusudur (işletme başına en fazla bir
+eşleşme, sıralama/tekilleştirme yok).
+
+Sonuç süreç içi bir anlık görüntü olarak DASHBOARD_STATS_TTL saniye saklanır:
+ana sayfa önbellek sıcakken 0, soğukken 1 sorgu yapar. İlgili modellerdeki
+save/delete sinyalleri (signals.py) anlık görüntüyü yazımın transaction'ı
+commit olunca düşürür (schedule_invalidate); commit'ten önce düşürmek, arada
+eski sayıları okuyan bir isteğin onları TTL boyunca geri koymasına izin
+verirdi. Sinyal üretmeyen
+toplu yazımlarda (QuerySet.update, bulk_create) ve diğer worker süreçlerinde
+bayatlık en fazla TTL kadar sürer.
+"""
+from __future__ import annotations
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Q, Value
+
+from accounts.models import Businesses, BusinessMembership
+from pardonai.menu.models import Menu
+from pardonai.orders.models import Order
+from pardonai.performance.models import Goal, PerformanceMetric
+from . import counters, write_batch
+from .models import Businesses as CoreBusinesses, Status
+from .pareto_cache import AggregateCache
+
+# kaynak adı -> (model, ikinci sayaç anahtarı, ikinci sayacın koşulu)
+# her kaynak "total_<ad>" ve (varsa) ikinci anahtarı üretir
+SOURCES: Dict[str, Tuple] = {
+    "businesses": (
+        Businesses, "active_businesses",
+        Exists(BusinessMembership.objects.filter(business=OuterRef("pk"), is_active=True)),
+    ),
+    "core_businesses": (CoreBusinesses, "active_core_businesses", Q(status=Status.ACTIVE)),
+    "metrics": (PerformanceMetric, None, None),
+}
+# sayaç tablosundan okunanlar (işletme satırlarının toplamı)
+COUNTER_KEYS = (
+    "total_menus", "active_menus",
+    "total_orders", "pending_orders",
+    "total_goals", "achieved_goals",
+)
+
+# dashboard.html / test.html / api/dashboard/stats'ın kullandığı anahtarlar
+DASHBOARD_KEYS = (
+    "total_businesses", "active_businesses",
+    "total_menus", "active_menus",
+    "total_orders", "pending_orders",
+    "total_metrics", "total_goals",
+)
+MODELS = tuple({model for model, _, _ in SOURCES.values()} | {BusinessMembership, Menu, Order, Goal})
+
+_snapshot = AggregateCache(max_entries=1, ttl=getattr(settings, "DASHBOARD_STATS_TTL", 30))
+_KEY = ("dashboard_stats",)
+
+
+def _part(name: str, model, condition):
+    """Tabloya ait tek satır: (ad, toplam, koşullu sayım); GROUP BY yok."""
+    extra = Count("pk", filter=condition) if condition is not None else Value(0)
+    return (
+        model.objects.order_by()
+        .values(source=Value(name))
+        .annotate(total=Count("pk"), extra=extra)
+        .values_list("source", "total", "extra")
+    )
+
+
+def query_counts() -> Dict[str, int]:
+    """Tüm sayaçlar tek UNION ALL sorgusuyla (önbelleksiz)."""
+    first, *rest = (_part(name, model, cond) for name, (model, _, cond) in SOURCES.items())
+    stored = counters.global_values(COUNTER_KEYS).annotate(extra=Value(0)).values_list("name", "value", "extra")
+    counts: Dict[str, int] = {}
+    for name, total, extra in first.union(*rest, stored, all=True):
+        if name not in SOURCES:
+            counts[name] = total
+            continue
+        counts[f"total_{name}"] = total
+        key = SOURCES[name][1]
+        if key:
+            counts[key] = extra
+    missing = [key for key in COUNTER_KEYS if key not in counts]
+    if missing:
+        # henüz oluşturulmamış sayaç satırları (ilk çalıştırma) canlı sayımla yazılır
+        counts.update(counters.get(missing))
+    return counts
+
+
+def snapshot() -> Dict[str, int]:
+    """Önbellekteki sayaçlar; süresi dolmuş ya da düşürülmüşse tek sorguyla yenilenir."""
+    return dict(_snapshot.get_or_compute(_KEY, query_counts))
+
+
+def dashboard_counts() -> Dict[str, int]:
+    counts = snapshot()
+    return {key: counts[key] for key in DASHBOARD_KEYS}
+
+
+def invalidate(*args, **kwargs) -> None:
+    """Anlık görüntüyü hemen düşürür."""
+    _snapshot.clear()
+
+
+def _invalidate_on_commit(_days) -> None:
+    _snapshot.clear()
+
+
+def schedule_invalidate(sender=None, using=None, **kwargs) -> None:
+    """Sinyal alıcısı: anlık görüntü commit'te, transaction başına bir kez düşer."""
+    write_batch.record((), None, _invalidate_on_commit, using=using)
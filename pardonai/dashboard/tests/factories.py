@@ -0,0 +1,34 @@
+# pardonai/dashboard/tests/factories.py
+"""Testler için küçük, elle kurulan ProductMetric satırları ve işletmeler."""
+from __future__ import annotations
+from datetime import date
+from typing import Optional
+
+from django.utils import timezone
+
+from ..models import Businesses, ProductMetric
+from ..search import fold_search
+
+
+def metric(product_id: int, name: str, profit: float, ts: Optional[date], sales: int = 1, click: int = 2,
+           cost: float = 1.0, price: Optional[float] = None) -> ProductMetric:
+    """Kaydedilmemiş satır; bulk_create save() çağırmadığı için arama sütunu burada doldurulur."""
+    price = cost + profit / sales if price is None and sales else (price or cost)
+    unit = price - cost
+    return ProductMetric(
+        product_id=product_id, product_name=name, product_name_search=fold_search(name),
+        click=click, sales=sales, click_per_sale=click / sales if sales else 0.0,
+        cost=cost, sales_price=price, unit_profit=unit, total_profit=profit,
+        profit_per_click=profit / click if click else 0.0, ts=ts,
+    )
+
+
+def business(n: int, **fields) -> Businesses:
+    """Zorunlu alanları doldurulmuş, kaydedilmiş çekirdek işletme."""
+    defaults = dict(
+        business_name=f"İşletme {n}", business_address="-", owner_first_name="A", owner_last_name="B",
+        business_phone="0", owner_phone="0", interest_solutions="-", subject="-", interest_products="-",
+        email=f"b{n}@example.com", tax_number=f"T{n}", registration_date=timezone.now(),
+    )
+    defaults.update(fields)
+    return Businesses.objects.create(**defaults)
@@ -0,0 +1,110 @@
+# pardonai/dashboard/tests/test_abc_snapshot.py
+"""Önceden hesaplanmış ABC snapshot'larının artımlı yenilenmesi."""
+from datetime import date
+
+from django.test import TestCase, override_settings
+
+from .. import abc_snapshot, rollup
+from ..models import ProductMetric
+from ..pareto_cache import invalidate_all
+from ..pareto_query import _query_aggregate
+from .factories import metric
+
+MARCH = "2025-03"
+
+
+@override_settings(PARETO_USE_ROLLUP=True, PARETO_ROLLUP_REFRESH_ON_COMMIT=False)
+class AbcSnapshotRefreshTests(TestCase):
+
+    def setUp(self):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 3, 5)),
+            metric(2, "Çay", 50.0, date(2025, 3, 6)),
+            metric(3, "Su", 10.0, date(2025, 4, 1)),
+        ])
+        invalidate_all()
+        abc_snapshot.refresh()
+
+    def _labels(self, period=MARCH, groupby="name"):
+        snap = abc_snapshot.load(groupby, period)
+        self.assertIsNotNone(snap, "snapshot güncel değil")
+        return list(snap.labels), list(snap.profit)
+
+    def _save(self, product_id, **fields):
+        row = ProductMetric.objects.get(product_id=product_id)
+        for name, value in fields.items():
+            setattr(row, name, value)
+        row.save()  # sinyal: gün kirli
+        invalidate_all()
+
+    def test_unchanged_data_keeps_every_period(self):
+        invalidate_all()
+        with self.assertNumQueries(9):  # ham satırlar taranmaz
+            res = abc_snapshot.refresh()
+        self.assertEqual(res["rebuilt"], 0)
+        self.assertEqual(self._labels(), (["Kahve", "Çay"], [100.0, 50.0]))
+
+    def test_tied_profits_follow_live_order(self):
+        # eşit kârlar: sıra live yol gibi veritabanında belirlenir (collation)
+        ProductMetric.objects.bulk_create([
+            metric(4, name, 10.0, date(2025, 4, 2)) for name in ("ayran", "Zeytin", "Çorba", "su")
+        ])
+        invalidate_all()
+        abc_snapshot.refresh(full=True)
+        live = _query_aggregate(None, None, "", "name", [])[0]
+        self.assertEqual(self._labels(abc_snapshot.PERIOD_ALL)[0], live)
+
+    def test_profit_swap_rebuilds_month(self):
+        # satır sayısı ve kâr toplamı aynı kalır
+        self._save(1, total_profit=50.0)
+        self._save(2, total_profit=100.0)
+        res = abc_snapshot.refresh()
+        # mart + "all", iki gruplama modu için; nisan korunur
+        self.assertEqual((res["rebuilt"], res["kept"]), (4, 2))
+        self.assertEqual(self._labels(), (["Çay", "Kahve"], [100.0, 50.0]))
+        self.assertEqual(self._labels("2025-04"), (["Su"], [10.0]))
+
+    def test_rename_rebuilds_month(self):
+        self._save(1, product_name="Filtre Kahve")
+        abc_snapshot.refresh()
+        self.assertEqual(self._labels()[0], ["Filtre Kahve", "Çay"])
+        self.assertEqual(self._labels(abc_snapshot.PERIOD_ALL)[0], ["Filtre Kahve", "Çay", "Su"])
+
+    def test_emptied_month_is_removed(self):
+        ProductMetric.objects.get(product_id=3).delete()
+        invalidate_all()
+        res = abc_snapshot.refresh()
+        self.assertEqual((res["removed"], res["rebuilt"]), (2, 2))
+        self.assertIsNone(abc_snapshot.load("name", "2025-04"))
+        self.assertEqual(self._labels(abc_snapshot.PERIOD_ALL)[0], ["Kahve", "Çay"])
+
+    def test_bulk_update_needs_marked_days(self):
+        ProductMetric.objects.filter(product_id=2).update(total_profit=500.0)  # sinyal yok
+        rollup.mark_dirty([date(2025, 3, 6)])
+        invalidate_all()
+        self.assertEqual(abc_snapshot.refresh()["rebuilt"], 4)
+        self.assertEqual(self._labels(), (["Çay", "Kahve"], [500.0, 100.0]))
+
+    def test_stale_version_is_not_served(self):
+        ProductMetric.objects.filter(product_id=2).update(total_profit=500.0)
+        invalidate_all()
+        self.assertIsNone(abc_snapshot.load("name", MARCH))
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_without_rollup_version_change_rebuilds_all(self):
+        self.assertEqual(abc_snapshot.refresh()["rebuilt"], 0)
+        ProductMetric.objects.filter(product_id=2).update(total_profit=500.0)
+        invalidate_all()
+        res = abc_snapshot.refresh()
+        self.assertEqual((res["rebuilt"], res["kept"]), (6, 0))
+        self.assertEqual(self._labels(), (["Çay", "Kahve"], [500.0, 100.0]))
+
+    def test_abc_view_snapshot_matches_live(self):
+        march = {"date_from": "2025-03-01", "date_to": "2025-03-31"}
+        with self.assertNumQueries(3):  # veri sürümü, dönem sürümü, snapshot satırları
+            snap = self.client.get("/api/pareto/abc", march).json()
+        # ürün filtresi snapshot'ı devre dışı bırakır: canlı agregasyon
+        live = self.client.get("/api/pareto/abc", {**march, "product_ids": "1,2"}).json()
+        self.assertEqual(snap["items"], live["items"])
+        self.assertEqual(snap["summary"], live["summary"])
+        self.assertEqual([i["label"] for i in snap["items"]], ["Kahve", "Çay"])
@@ -0,0 +1,175 @@
+# pardonai/dashboard/tests/test_async_views.py
+"""
+Async (ASGI) view'lar ve statik dosyalar: WSGI (Client) ile ASGI (AsyncClient)
+altında aynı yanıtlar.
+
+Havuz iş parçacıkları (aio.run_sync) ayrı DB bağlantısı kullanır, bu yüzden
+veri transaction içinde değil, commit edilmiş olmalı: TransactionTestCase.
+İki URL eşlemesi de (senkron / async view'lar) ayardan bağımsız olarak bu
+modülde kurulur; ROOT_URLCONF ile seçilir.
+"""
+from datetime import date
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.test import AsyncClient, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import path, resolve
+
+from .. import aio, urls as dashboard_urls
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..views_async import ASYNC_VIEWS
+from .factories import metric
+
+SYNC_VIEWS = {async_view: view for view, async_view in ASYNC_VIEWS.items()}
+
+
+class SyncUrls:
+    """DASHBOARD_ASYNC_VIEWS=False iken urls.py'nin kurduğu eşleme."""
+    urlpatterns = [path(str(p.pattern), SYNC_VIEWS.get(p.callback, p.callback), name=p.name) for p in dashboard_urls.urlpatterns]
+
+
+class AsyncUrls:
+    """DASHBOARD_ASYNC_VIEWS=True iken urls.py'nin kurduğu eşleme."""
+    urlpatterns = [path(str(p.pattern), ASYNC_VIEWS.get(p.callback, p.callback), name=p.name) for p in SyncUrls.urlpatterns]
+
+
+SYNC_WHITENOISE = "whitenoise.middleware.WhiteNoiseMiddleware"
+ASYNC_WHITENOISE = "pardonai.dashboard.aio.WhiteNoiseMiddleware"
+ASYNC_MIDDLEWARE = [ASYNC_WHITENOISE if m == SYNC_WHITENOISE else m for m in settings.MIDDLEWARE]
+SYNC_MIDDLEWARE = [SYNC_WHITENOISE if m == ASYNC_WHITENOISE else m for m in settings.MIDDLEWARE]
+
+ENDPOINTS = [
+    ("/api/pareto", {"threshold": "70"}),
+    ("/api/pareto", {"max_points": "2"}),
+    ("/api/pareto/topn", {"n": "2"}),
+    ("/api/pareto/abc", {"groupby": "id"}),
+    ("/api/pareto/lorenz", {}),
+    ("/api/pareto/hist", {"bins": "3"}),
+    ("/api/pareto/bundle", {}),
+    ("/api/pareto/table", {"limit": "2"}),
+    ("/api/pareto/table", {"limit": "1", "cursor": "WzEyNS4wLCAiS2FodmUiXQ"}),  # (125.0, "Kahve") sonrası
+    ("/api/pareto/whatif", {"selected": "Kahve", "price_delta_pct": "10", "sales_uplift_pct": "-5"}),
+    ("/api/dashboard/stats", {}),
+]
+
+
+@override_settings(PARETO_USE_ROLLUP=False, ROOT_URLCONF=SyncUrls, MIDDLEWARE=SYNC_MIDDLEWARE)
+class AsyncViewParityTests(TransactionTestCase):
+
+    def setUp(self):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 5, 1)),
+            metric(2, "Çay", 40.0, date(2025, 5, 1), sales=4),
+            metric(3, "Su", 10.0, date(2025, 5, 2)),
+            metric(1, "Kahve", 25.0, date(2025, 5, 2)),
+        ])
+        self.async_client = AsyncClient()
+
+    def tearDown(self):
+        aggregate_cache.clear()
+
+    def _async_get(self, url, params=None, method="get", **extra):
+        """ASGI isteği; akış yanıtlarında gövde event loop içinde okunur (resp.body)."""
+        async def run():
+            with override_settings(ROOT_URLCONF=AsyncUrls, MIDDLEWARE=ASYNC_MIDDLEWARE):
+                resp = await getattr(self.async_client, method)(url, params, **extra)
+                if resp.streaming:
+                    resp.body = b"".join([chunk async for chunk in resp.streaming_content])
+                return resp
+        return async_to_sync(run)()
+
+    def _sync_json(self, url, params):
+        aggregate_cache.clear()
+        resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return resp.json(), resp["ETag"] if resp.has_header("ETag") else None
+
+    def test_json_matches_sync(self):
+        for url, params in ENDPOINTS:
+            with self.subTest(url=url, params=params):
+                self.assertTrue(iscoroutinefunction(resolve(url, AsyncUrls).func))
+                expected, etag = self._sync_json(url, params)
+                aggregate_cache.clear()  # async yolu da sorguyu kendisi çalıştırsın
+                resp = self._async_get(url, params)
+                self.assertEqual(resp.status_code, 200, resp.content)
+                self.assertEqual(resp.json(), expected)
+                self.assertEqual(resp["ETag"] if resp.has_header("ETag") else None, etag)
+
+    def test_table_runs_page_and_totals_together(self):
+        gathered = []
+
+        async def spy(*calls):
+            results = await real_gather(*calls)
+            gathered.append(results)
+            return results
+
+        real_gather = aio.gather
+        with mock.patch.object(aio, "gather", spy):
+            resp = self._async_get("/api/pareto/table", {"limit": "1"})
+        self.assertEqual(resp.status_code, 200, resp.content)
+        (rows, totals), = gathered  # tek gather, iki sorgu
+        self.assertEqual([r["label"] for r in rows], ["Kahve", "Çay"])  # limit + 1
+        self.assertEqual((totals["count"], totals["total"]), (3, 175.0))
+        self.assertEqual(resp.json()["count"], 3)
+
+    def test_conditional_get(self):
+        first = self._async_get("/api/pareto")
+        again = self._async_get("/api/pareto", headers={"if-none-match": first["ETag"]})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+
+    def test_post_not_allowed(self):
+        for url in ("/api/pareto", "/api/pareto/bundle", "/api/dashboard/stats"):
+            with self.subTest(url=url):
+                self.assertEqual(self._async_get(url, method="post").status_code, 405)
+
+    def test_csv_export_streams_same_rows(self):
+        sync = self.client.get("/api/pareto/export", {"groupby": "name"})
+        resp = self._async_get("/api/pareto/export", {"groupby": "name"})
+        self.assertTrue(resp.is_async)  # aio.iter_sync: tamponlanmadan akar
+        self.assertEqual(resp.body, b"".join(sync.streaming_content))
+        self.assertEqual(resp["Content-Disposition"], sync["Content-Disposition"])
+
+
+class MiddlewareSettingsTests(SimpleTestCase):
+
+    def test_async_subclass_only_with_async_views(self):
+        used = ASYNC_WHITENOISE if settings.DASHBOARD_ASYNC_VIEWS else SYNC_WHITENOISE
+        unused = SYNC_WHITENOISE if settings.DASHBOARD_ASYNC_VIEWS else ASYNC_WHITENOISE
+        self.assertIn(used, settings.MIDDLEWARE)
+        self.assertNotIn(unused, settings.MIDDLEWARE)
+
+
+@override_settings(WHITENOISE_USE_FINDERS=True, WHITENOISE_AUTOREFRESH=True, MIDDLEWARE=SYNC_MIDDLEWARE)
+class StaticFilesTests(TransactionTestCase):
+    """Statik dosya: WSGI'de whitenoise'un kendisi, ASGI'de aio alt sınıfı aynı yanıtı verir."""
+
+    PATH = "/static/css/styles.css"
+
+    def test_static_same_under_wsgi_and_asgi(self):
+        sync = self.client.get(self.PATH)
+        self.assertEqual(sync.status_code, 200)
+        expected = b"".join(sync.streaming_content)
+        self.assertTrue(expected)
+
+        async def run():
+            with override_settings(MIDDLEWARE=ASYNC_MIDDLEWARE):
+                resp = await AsyncClient().get(self.PATH)
+                body = b"".join([c async for c in resp.streaming_content]) if resp.is_async else b"".join(resp.streaming_content)
+                return resp, body
+
+        resp, body = async_to_sync(run)()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], sync["Content-Type"])
+        self.assertEqual(body, expected)
+
+    def test_asgi_api_passes_through(self):
+        async def run():
+            with override_settings(MIDDLEWARE=ASYNC_MIDDLEWARE):
+                return await AsyncClient().get("/api/pareto")
+
+        resp = async_to_sync(run)()
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()["success"])
@@ -0,0 +1,115 @@
+# pardonai/dashboard/tests/test_bench.py
+"""Ölçüm aracı: sentetik veri, runner raporu ve iki raporun karşılaştırması."""
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from ..bench import runner, synthetic
+from ..models import ProductMetric
+
+
+def result(p50=10.0, queries=3, peak=100.0):
+    return {"p50_ms": p50, "p95_ms": p50 * 2, "max_ms": p50 * 3, "queries": queries, "peak_kb": peak, "bytes": 1}
+
+
+def report(**scenarios):
+    return {"results": {"1000": {"_load_s": 1.0, **scenarios}}}
+
+
+class PercentileTests(SimpleTestCase):
+
+    def test_nearest_rank(self):
+        samples = [5.0, 1.0, 4.0, 2.0, 3.0]
+        self.assertEqual(runner.percentile(samples, 50), 3.0)
+        self.assertEqual(runner.percentile(samples, 95), 5.0)
+        self.assertEqual(runner.percentile(samples, 0), 1.0)
+        self.assertEqual(runner.percentile([], 50), 0.0)
+
+
+class SyntheticTests(SimpleTestCase):
+
+    def test_deterministic_and_consistent(self):
+        rows = list(synthetic.generate_rows(200, products=30, days=10, seed=7))
+        again = list(synthetic.generate_rows(200, products=30, days=10, seed=7))
+        self.assertEqual([(r.product_id, r.total_profit, r.ts) for r in rows],
+                         [(r.product_id, r.total_profit, r.ts) for r in again])
+        for r in rows:
+            self.assertAlmostEqual(r.total_profit, r.unit_profit * r.sales)
+            self.assertLessEqual(r.sales, r.click)
+            self.assertTrue(1 <= r.product_id <= 30)
+
+
+class CompareTests(SimpleTestCase):
+
+    def test_ratios_and_regressions(self):
+        old = report(pareto=result(), abc=result(), hist=result(), lorenz=result(p50=0.0, peak=0.0))
+        new = report(pareto=result(p50=11.0), abc=result(p50=30.0), hist=result(queries=4),
+                     lorenz=result(p50=5.0, peak=5.0), scatter=result())
+        rows = {r["scenario"]: r for r in runner.compare(old, new, threshold=1.2)}
+        self.assertEqual(set(rows), {"pareto", "abc", "hist", "lorenz"})  # _load_s ve yeni senaryo yok
+        self.assertEqual(rows["pareto"]["p50_ratio"], 1.1)
+        self.assertFalse(rows["pareto"]["regression"])
+        self.assertEqual(rows["abc"]["p50_ratio"], 3.0)
+        self.assertTrue(rows["abc"]["regression"])
+        self.assertEqual(rows["hist"]["queries"], (3, 4))
+        self.assertTrue(rows["hist"]["regression"])
+        self.assertEqual((rows["lorenz"]["p50_ratio"], rows["lorenz"]["peak_ratio"]), (1.0, 1.0))
+        self.assertEqual(rows["pareto"]["size"], 1000)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for name, data in (("old", report(pareto=result())), ("new", report(pareto=result(p50=20.0))),
+                               ("other", {"results": {"5": {"abc": result()}}})):
+                paths[name] = os.path.join(tmp, f"{name}.json")
+                runner.save_report(data, paths[name])
+            self.assertEqual(runner.load_report(paths["new"])["results"]["1000"]["pareto"]["p50_ms"], 20.0)
+
+            out = io.StringIO()
+            call_command("bench_pareto", "--compare", paths["old"], paths["new"], stdout=out)
+            self.assertIn("REGRESSION", out.getvalue())
+            with self.assertRaisesMessage(CommandError, "1 regresyon"):
+                call_command("bench_pareto", "--compare", paths["old"], paths["new"],
+                             "--fail-on-regression", stdout=io.StringIO())
+            call_command("bench_pareto", "--compare", paths["old"], paths["new"], "--threshold", "3",
+                         "--fail-on-regression", stdout=io.StringIO())
+            with self.assertRaises(CommandError):
+                call_command("bench_pareto", "--compare", paths["old"], paths["other"], stdout=io.StringIO())
+
+
+class RunnerTests(TestCase):
+
+    def test_small_run_is_rolled_back(self):
+        before = ProductMetric.objects.count()
+        rep = runner.run([150], ["pareto", "abc", "export_csv"], products=20, days=20, runs=2, warmup=0)
+        self.assertEqual(ProductMetric.objects.count(), before)
+        self.assertEqual(rep["baseline_rows"], before)
+        self.assertEqual(rep["params"]["runs"], 2)
+        self.assertIn("json_backend", rep["env"])
+        res = rep["results"]["150"]
+        self.assertEqual(set(res), {"_load_s", "pareto", "abc", "export_csv"})
+        for name in ("pareto", "abc", "export_csv"):
+            with self.subTest(scenario=name):
+                r = res[name]
+                self.assertLessEqual(r["p50_ms"], r["p95_ms"])
+                self.assertLessEqual(r["p95_ms"], r["max_ms"])
+                self.assertGreater(r["queries"], 0)
+                self.assertGreater(r["bytes"], 0)
+        # rapor JSON'a yazılabilir
+        json.dumps(rep)
+
+    def test_export_scenarios_without_pyarrow_are_skipped(self):
+        names = ["table", "export_raw_csv", "export_parquet", "export_raw_parquet"]
+        with mock.patch.object(runner.arrow_export, "available", return_value=False):
+            rep = runner.run([100], names, products=10, days=10, runs=1, warmup=0)
+        self.assertEqual(rep["skipped"], ["export_parquet", "export_raw_parquet"])
+        self.assertEqual(set(rep["results"]["100"]), {"_load_s", "table", "export_raw_csv"})
+
+    def test_unknown_scenario(self):
+        with self.assertRaisesMessage(ValueError, "nope"):
+            runner.run([10], ["pareto", "nope"])
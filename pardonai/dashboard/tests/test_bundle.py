@@ -0,0 +1,75 @@
+# pardonai/dashboard/tests/test_bundle.py
+"""Bundle endpoint'i: tek agregasyon, parçalar tekil endpoint'lerle aynı."""
+from datetime import date
+
+from django.test import TestCase, override_settings
+
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..views_pareto import PAYLOAD_BUILDERS
+from .factories import metric
+
+# ayrı endpoint'i olan parçalar ve yolları
+ENDPOINTS = {
+    "abc": "/api/pareto/abc",
+    "lorenz": "/api/pareto/lorenz",
+    "scatter": "/api/pareto/scatter",
+    "hist": "/api/pareto/hist",
+    "treemap": "/api/pareto/treemap",
+}
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ParetoBundleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 6, 1), sales=4),
+            metric(2, "Çay", 40.0, date(2025, 6, 1)),
+            metric(1, "Kahve", 20.0, date(2025, 6, 2)),
+            metric(3, "Su", 10.0, date(2025, 6, 2)),
+            metric(4, "Tost", 5.0, None),
+        ])
+
+    def setUp(self):
+        aggregate_cache.clear()
+
+    def _bundle(self, **params):
+        resp = self.client.get("/api/pareto/bundle", params)
+        body = resp.json()
+        self.assertEqual(resp.status_code, 200, body)
+        return body["parts"]
+
+    def test_one_aggregation_for_all_charts(self):
+        parts = ",".join(p for p in PAYLOAD_BUILDERS if p != "hist")  # hist kendi SQL kovalamasını yapar
+        with self.assertNumQueries(2):  # veri sürümü + tek GROUP BY
+            body = self._bundle(parts=parts)
+        self.assertEqual(set(body), set(parts.split(",")))
+
+    def test_parts_match_single_endpoints(self):
+        params = {"threshold": "70", "date_from": "2025-06-01"}
+        bundle = self._bundle(**params)
+        self.assertEqual(set(bundle), set(PAYLOAD_BUILDERS))
+        for name, url in ENDPOINTS.items():
+            with self.subTest(part=name):
+                single = self.client.get(url, params).json()
+                self.assertTrue(single.pop("success"))
+                self.assertEqual(bundle[name], single)
+
+        pareto = self.client.get("/api/pareto", params).json()
+        for key in ("labels", "cum_pct", "sum_profit", "idx_threshold"):
+            self.assertEqual(bundle["pareto"][key], pareto[key])
+        topn = self.client.get("/api/pareto/topn", params).json()
+        self.assertEqual(bundle["topn"]["labels"], topn["labels"])
+        self.assertEqual(bundle["pareto"]["labels"], ["Kahve", "Çay", "Su"])
+
+    def test_columnar_applies_to_every_part(self):
+        parts = self._bundle(parts="abc,treemap", format="columnar")
+        self.assertEqual(parts["abc"]["items"]["label"], ["Kahve", "Çay", "Su", "Tost"])
+        self.assertEqual(parts["treemap"]["name"], ["Kahve", "Çay", "Su", "Tost"])
+
+    def test_unknown_part_is_rejected(self):
+        resp = self.client.get("/api/pareto/bundle", {"parts": "pareto,pie"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("pie", resp.json()["error"])
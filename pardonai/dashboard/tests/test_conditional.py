@@ -0,0 +1,86 @@
+# pardonai/dashboard/tests/test_conditional.py
+"""Analitik API'lerde koşullu GET: ETag, 304 ve veri sürümüyle geçersizleşme."""
+from datetime import date
+
+from django.test import TestCase, override_settings
+
+from .. import conditional
+from ..models import ProductMetric
+from ..pareto_cache import invalidate_all
+from .factories import metric
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 8, 1)),
+            metric(2, "Çay", 40.0, date(2025, 8, 2)),
+        ])
+        invalidate_all()
+
+    def _etag(self, url="/api/pareto", **params):
+        resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        return resp["ETag"]
+
+    def test_match_returns_304_without_running_view(self):
+        resp = self.client.get("/api/pareto", {"threshold": "80"})
+        self.assertIn("no-cache", resp["Cache-Control"])
+        self.assertIn("private", resp["Cache-Control"])
+        with self.assertNumQueries(1):  # yalnızca veri sürümü
+            again = self.client.get("/api/pareto", {"threshold": "80"}, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+
+    def test_etag_follows_normalized_params(self):
+        base = self._etag(search="kah", threshold="80")
+        self.assertEqual(self._etag(threshold="80", search="kah"), base)         # sıra
+        self.assertEqual(self._etag(search="kah", threshold="80", _="123"), base)  # cache-buster
+        self.assertEqual(self._etag(search="kah", threshold="80", groupby=""), base)  # boş değer
+        self.assertNotEqual(self._etag(search="kah", threshold="70"), base)
+        self.assertNotEqual(self._etag("/api/pareto/topn", search="kah", threshold="80"), base)
+
+    def test_writes_change_etag(self):
+        first = self._etag()
+        row = ProductMetric.objects.get(product_id=2)
+        row.total_profit = 400.0
+        with self.captureOnCommitCallbacks(execute=True):
+            row.save()  # sinyal: veri sürümü commit'te artar
+        second = self._etag()
+        self.assertNotEqual(second, first)
+        resp = self.client.get("/api/pareto", HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["labels"], ["Çay", "Kahve"])
+
+        # sinyalsiz toplu yazım: invalidate_all sürümü artırır
+        ProductMetric.objects.update(total_profit=1.0)
+        invalidate_all()
+        self.assertNotEqual(self._etag(), second)
+
+    def test_one_bump_per_transaction(self):
+        before, _ = conditional.data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            for pid in (1, 2):
+                row = ProductMetric.objects.get(product_id=pid)
+                row.total_profit += 1
+                row.save()
+            metric(3, "Su", 5.0, date(2025, 8, 3)).save()
+            self.assertEqual(conditional.data_version()[0], before)  # commit'ten önce değişmez
+        self.assertEqual(conditional.data_version()[0], before + 1)
+
+    def test_build_version_changes_etag(self):
+        base = self._etag()
+        with self.settings(PARETO_ETAG_VERSION="abc123"):
+            other = self._etag()
+            self.assertNotEqual(other, base)
+            resp = self.client.get("/api/pareto", HTTP_IF_NONE_MATCH=base)
+            self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self._etag(), base)
+
+    def test_errors_carry_no_validators(self):
+        resp = self.client.get("/api/pareto/cube", {"dims": "shop"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.has_header("ETag"))
+        self.assertIn("no-store", resp["Cache-Control"])
@@ -0,0 +1,118 @@
+# pardonai/dashboard/tests/test_counters.py
+"""Durum sayaçları (status_counter): sinyaller, eksik satırlar ve uzlaştırma."""
+from datetime import date
+
+from django.test import TestCase
+
+from pardonai.menu.models import Category, Menu, Product
+from pardonai.orders.models import Order, OrderStatus
+from pardonai.performance.models import Goal
+from .. import counters
+from ..models import StatusCounter
+from .factories import business
+
+GLOBAL = counters.GLOBAL
+
+
+class StatusCounterTests(TestCase):
+
+    def setUp(self):
+        self.b1, self.b2 = business(1), business(2)
+        self._n = 0
+
+    def order(self, biz, status=OrderStatus.PENDING):
+        self._n += 1
+        return Order.objects.create(
+            business=biz, order_number=f"O{self._n}", customer_name="-", customer_phone="0",
+            total_amount=10, final_amount=10, order_status=status,
+        )
+
+    def stored(self, name, biz=GLOBAL):
+        if biz == GLOBAL:
+            return counters.get([name])[name]  # işletme satırlarının toplamı
+        return StatusCounter.objects.get(business_id=biz.pk, name=name).value
+
+    def assertLive(self):
+        """Tablodaki her sayaç gerçek sayımla aynı."""
+        for row in StatusCounter.objects.all():
+            with self.subTest(business=row.business_id, name=row.name):
+                self.assertEqual(row.value, counters.live_count(row.name, row.business_id))
+
+    def test_signals_follow_status_changes(self):
+        o1, o2 = self.order(self.b1), self.order(self.b2)
+        self.assertEqual(self.stored("pending_orders"), 2)
+        self.assertEqual(self.stored("pending_orders", self.b1), 1)
+
+        o1.order_status = OrderStatus.DELIVERED
+        o1.save()
+        self.assertEqual(self.stored("pending_orders"), 1)
+        self.assertEqual(self.stored("delivered_orders", self.b1), 1)
+
+        o2.business = self.b1  # işletme değişimi: bir yandan düşer, diğerine eklenir
+        o2.save()
+        self.assertEqual(self.stored("total_orders", self.b2), 0)
+        self.assertEqual(self.stored("total_orders", self.b1), 2)
+
+        o2.delete()
+        self.assertEqual(self.stored("total_orders"), 1)
+        self.assertFalse(StatusCounter.objects.filter(business_id=GLOBAL).exists())  # sıcak global satır yok
+        self.assertLive()
+
+    def test_global_is_sum_of_business_rows(self):
+        self.order(self.b1)
+        self.order(self.b2)
+        self.order(self.b2, OrderStatus.DELIVERED)
+        with self.assertNumQueries(1):
+            self.assertEqual(counters.get(["total_orders", "pending_orders"]), {"total_orders": 3, "pending_orders": 2})
+        self.assertEqual(counters.get(["delivered_orders"], self.b1.pk), {"delivered_orders": 0})
+
+    def test_get_creates_missing_rows_from_live_count(self):
+        Menu.objects.bulk_create([Menu(business=self.b1, name="A"), Menu(business=self.b1, name="B", is_active=False)])
+        self.assertEqual(counters.get(["total_menus", "active_menus"]), {"total_menus": 2, "active_menus": 1})
+        self.assertEqual(counters.get(["active_menus"], self.b1.pk), {"active_menus": 1})
+
+    def test_reconcile_repairs_drift(self):
+        self.order(self.b1)
+        self.order(self.b2)
+        Goal.objects.create(business=self.b1, title="-", metric_type="sales", target_value=1, deadline=date(2026, 1, 1))
+        Order.objects.filter(business=self.b1).update(order_status=OrderStatus.DELIVERED)  # sinyal yok
+
+        drift = counters.reconcile(dry_run=True)
+        self.assertIn((self.b1.pk, "pending_orders", 1, 0), drift)
+        self.assertFalse([d for d in drift if d[0] == GLOBAL])
+        self.assertEqual(self.stored("pending_orders"), 2)  # dry_run yazmaz
+
+        counters.reconcile(business=self.b1.pk)
+        self.assertEqual(self.stored("pending_orders", self.b1), 0)
+        self.assertEqual(self.stored("pending_orders"), 1)  # global toplam da düzelir
+        self.assertEqual(counters.reconcile(), [])
+        self.assertLive()
+
+    def test_reconcile_drops_legacy_global_rows(self):
+        self.order(self.b1)
+        StatusCounter.objects.create(business_id=GLOBAL, name="total_orders", value=99)
+        self.assertEqual(self.stored("total_orders"), 1)  # okumada yok sayılır
+        self.assertEqual(counters.reconcile(), [])
+        self.assertFalse(StatusCounter.objects.filter(business_id=GLOBAL).exists())
+
+    def test_business_delete_forgets_its_rows(self):
+        self.order(self.b2)
+        self.b2.delete()
+        self.assertFalse(StatusCounter.objects.filter(business_id=self.b2.pk).exists())
+        self.assertEqual(self.stored("total_orders"), 0)
+
+    def test_menu_move_carries_its_product_counters(self):
+        menu = Menu.objects.create(business=self.b1, name="A")
+        category = Category.objects.create(name="C")
+        for i, available in enumerate((True, True, False)):
+            Product.objects.create(menu=menu, category=category, name=f"P{i}", price=1, is_available=available)
+        self.assertEqual(self.stored("available_products", self.b1), 2)
+
+        menu.business = self.b2  # ürünler işletmelerini menüden alır: sayaçları da taşınmalı
+        menu.save()
+        self.assertEqual(self.stored("total_products", self.b1), 0)
+        self.assertEqual(self.stored("total_products", self.b2), 3)
+        self.assertEqual(self.stored("available_products", self.b2), 2)
+        self.assertEqual(self.stored("total_menus", self.b2), 1)
+        self.assertEqual(counters.reconcile(), [])
+        self.assertLive()
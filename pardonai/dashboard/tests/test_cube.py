@@ -0,0 +1,115 @@
+# pardonai/dashboard/tests/test_cube.py
+"""
+/api/pareto/cube: kümeler (PostgreSQL'de GROUPING SETS, SQLite'ta en ince
+kümeden bellekte toplama) doğrudan hesaplanan toplamlarla ve /api/pareto,
+/api/pareto/topn yanıtlarıyla aynı olmalı.
+"""
+from collections import defaultdict
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from .. import cube
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..rollup import rebuild_all
+from .factories import metric
+
+DAYS = [date(2025, 6, 2), date(2025, 6, 3), date(2025, 6, 10)]  # ilk ikisi aynı hafta (Pzt/Salı)
+ROWS = [
+    (1, "Kahve", 100.0, DAYS[0]),
+    (2, "Çay", 40.0, DAYS[0]),
+    (1, "Kahve", 25.0, DAYS[1]),
+    (3, "Su", 60.0, DAYS[1]),
+    (2, "Çay", -15.0, DAYS[2]),
+    (3, "Su", 5.0, DAYS[2]),
+    (4, "Tost", 30.0, None),  # tarihsiz: bucket içeren kümelere girmez
+]
+
+
+class CubeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([metric(*row) for row in ROWS])
+        rebuild_all()
+
+    def setUp(self):
+        aggregate_cache.clear()  # ham ve rollup yolu aynı önbellek anahtarını paylaşır
+
+    def _get(self, url, **params):
+        body = self.client.get(url, params).json()
+        self.assertTrue(body["success"], body)
+        return body
+
+    def _cells(self, body, dims):
+        """Bir kümenin hücreleri: {(boyut değerleri): sum_profit}."""
+        part = next(p for p in body["sets"] if p["dims"] == dims)
+        keys = zip(*(
+            [body["levels"][d][c] for c in part["codes"][d]] for d in dims
+        )) if dims else [()]
+        return {k: round(v, 2) for k, v in zip(keys, part["sum_profit"])}
+
+    def _expected(self, dims, bucket=lambda d: d):
+        out = defaultdict(float)
+        for _, name, profit, ts in ROWS:
+            if "bucket" in dims and ts is None:
+                continue
+            key = tuple(name if d == "product" else bucket(ts).isoformat() for d in dims)
+            out[key] += profit
+        return {k: round(v, 2) for k, v in out.items()}
+
+    def _assert_sets(self):
+        body = self._get("/api/pareto/cube", dims="product,bucket", bucket="day",
+                         sets="product:bucket,product,bucket,total")
+        self.assertEqual(body["engine"], "grouping_sets" if connection.vendor == "postgresql" else "emulated")
+        for dims in (["product", "bucket"], ["product"], ["bucket"], []):
+            with self.subTest(dims=dims):
+                self.assertEqual(self._cells(body, dims), self._expected(dims))
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_sets_match_direct_sums(self):
+        self._assert_sets()
+
+    @override_settings(PARETO_USE_ROLLUP=True)
+    def test_rollup_sets_match_direct_sums(self):
+        self._assert_sets()
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_week_bucket(self):
+        body = self._get("/api/pareto/cube", dims="bucket", bucket="week", sets="bucket")
+        monday = lambda d: date.fromordinal(d.toordinal() - d.weekday())
+        self.assertEqual(self._cells(body, ["bucket"]), self._expected(["bucket"], bucket=monday))
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_without_numpy(self):
+        with mock.patch.object(cube, "np", None):
+            self._assert_sets()
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_pareto_and_topn_slices_match_endpoints(self):
+        pareto = self._get("/api/pareto")
+        sliced = self._get("/api/pareto/cube", view="pareto")
+        for field in ("labels", "profit", "cum_pct", "sum_profit", "idx_threshold"):
+            self.assertEqual(sliced[field], pareto[field], field)
+
+        topn = self._get("/api/pareto/topn", n=2)
+        sliced = self._get("/api/pareto/cube", view="topn", n=2)
+        self.assertEqual((sliced["labels"], sliced["profit"]), (topn["labels"], topn["profit"]))
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_bucket_slice_matches_date_range(self):
+        day = DAYS[1].isoformat()
+        pareto = self._get("/api/pareto", date_from=day, date_to=day)
+        sliced = self._get("/api/pareto/cube", view="pareto", bucket="day", at=day)
+        self.assertEqual((sliced["labels"], sliced["profit"]), (pareto["labels"], pareto["profit"]))
+        empty = self._get("/api/pareto/cube", view="pareto", bucket="day", at="2024-01-01")
+        self.assertEqual(empty["labels"], [])
+
+    def test_bad_parameters(self):
+        for params in ({"dims": "product,shop"}, {"dims": "product", "at": "2025-06-02"},
+                       {"bucket": "year"}, {"view": "lorenz"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/pareto/cube", params).status_code, 400)
@@ -0,0 +1,148 @@
+# pardonai/dashboard/tests/test_drift.py
+"""Zaman kovalı drift: kova toplamları, sıralar ve geçişler ham satırlarla aynı."""
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from .. import pareto_engine
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..rollup import rebuild_all
+from .factories import metric
+
+START = date(2025, 1, 27)  # pazartesi
+NAMES = ["Kahve", "Çay", "Su", "Tost", "Ayran", "Simit"]
+
+
+def bucket_of(day, bucket):
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def raw_sums(bucket, date_from=None, date_to=None):
+    """{kova: {etiket: kâr}} doğrudan ham satırlardan."""
+    out = defaultdict(lambda: defaultdict(float))
+    for name, ts, profit in ProductMetric.objects.values_list("product_name", "ts", "total_profit"):
+        if ts is None or (date_from and ts < date_from) or (date_to and ts > date_to):
+            continue
+        out[bucket_of(ts, bucket)][name] += profit
+    return out
+
+
+class ParetoDriftTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(5)
+        rows = [
+            metric(i + 1, name, round(rng.uniform(-5, 120), 2), START + timedelta(days=rng.randrange(40)))
+            for i, name in enumerate(NAMES * 12)
+        ]
+        rows.append(metric(99, "Tarihsiz", 500.0, None))  # kovalara girmez
+        ProductMetric.objects.bulk_create(rows)
+        rebuild_all()
+
+    def setUp(self):
+        aggregate_cache.clear()
+
+    def _drift(self, **params):
+        body = self.client.get("/api/pareto/drift", {"max_labels": "500", **params}).json()
+        self.assertTrue(body["success"], body)
+        return body
+
+    def assertMatchesRaw(self, body, bucket, **dates):
+        sums = raw_sums(bucket, **dates)
+        self.assertEqual(body["buckets"], [b.isoformat() for b in sorted(sums)])
+        self.assertEqual(sorted(body["labels"]), sorted({n for row in sums.values() for n in row}))
+        for i, b in enumerate(sorted(sums)):
+            row = sums[b]
+            ranked = sorted(row, key=lambda n: -row[n])
+            total = sum(row.values())
+            run = 0.0
+            cum = {}
+            for n in ranked:
+                run += row[n]
+                cum[n] = run / total * 100.0
+            for j, label in enumerate(body["labels"]):
+                with self.subTest(bucket=b, label=label):
+                    if label not in row:
+                        self.assertEqual((body["rank"][j][i], body["class"][j][i], body["profit"][j][i]), (None, "-", 0.0))
+                        continue
+                    self.assertAlmostEqual(body["profit"][j][i], round(row[label], 2), places=2)
+                    self.assertEqual(body["rank"][j][i], ranked.index(label) + 1)
+                    self.assertAlmostEqual(body["cum_pct"][j][i], round(cum[label], 2), places=2)
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_path_matches_raw(self):
+        for bucket in ("week", "month"):
+            with self.subTest(bucket=bucket):
+                aggregate_cache.clear()
+                self.assertMatchesRaw(self._drift(bucket=bucket), bucket)
+
+    @override_settings(PARETO_USE_ROLLUP=True)
+    def test_rollup_path_matches_raw(self):
+        for bucket in ("day", "week", "month"):
+            with self.subTest(bucket=bucket):
+                aggregate_cache.clear()
+                self.assertMatchesRaw(self._drift(bucket=bucket), bucket)
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_date_range(self):
+        date_from, date_to = START + timedelta(days=7), START + timedelta(days=20)
+        body = self._drift(bucket="week", date_from=date_from.isoformat(), date_to=date_to.isoformat())
+        self.assertMatchesRaw(body, "week", date_from=date_from, date_to=date_to)
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_transitions_and_movers(self):
+        body = self._drift(bucket="week")
+        n = body["n_labels"]
+        self.assertEqual(len(body["transitions"]), len(body["buckets"]) - 1)
+        for t in body["transitions"]:
+            self.assertEqual(sum(sum(row.values()) for row in t["counts"].values()), n)
+        first = {l: body["rank"][j][0] for j, l in enumerate(body["labels"])}
+        last = {l: body["rank"][j][-1] for j, l in enumerate(body["labels"])}
+        for m in body["movers"]["up"] + body["movers"]["down"]:
+            self.assertEqual((m["from_rank"], m["to_rank"]), (first[m["label"]], last[m["label"]]))
+            self.assertEqual(m["delta"], m["from_rank"] - m["to_rank"])
+
+    def test_invalid_bucket(self):
+        resp = self.client.get("/api/pareto/drift", {"bucket": "year"})
+        self.assertEqual(resp.status_code, 400)
+
+
+class BucketDriftFallbackTests(TestCase):
+
+    def test_numpy_and_fallback_agree(self):
+        if pareto_engine.np is None:
+            self.skipTest("numpy yok")
+        rng = random.Random(11)
+        cells = [(b, l, round(rng.uniform(-10, 100), 1))
+                 for b in range(5) for l in range(9) if rng.random() < 0.7]
+        cells.append((2, 0, 50.0))  # eşitlik: etiket indeksine göre
+        cells.append((2, 1, 50.0))
+        cells = list({(b, l): (b, l, v) for b, l, v in cells}.values())
+        for max_labels in (3, 50):
+            with self.subTest(max_labels=max_labels):
+                fast = pareto_engine.bucket_drift(5, 9, cells, max_labels=max_labels, movers=3)
+                with mock.patch.object(pareto_engine, "np", None):
+                    slow = pareto_engine.bucket_drift(5, 9, cells, max_labels=max_labels, movers=3)
+                self.assertEqual(_plain(fast), _plain(slow))
+
+
+def _plain(value):
+    """numpy dizilerini / skalerlerini karşılaştırılabilir listelere çevirir."""
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
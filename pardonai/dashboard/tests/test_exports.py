@@ -0,0 +1,98 @@
+# pardonai/dashboard/tests/test_exports.py
+"""Dışa aktarım: Arrow / Parquet akışı CSV ve veritabanıyla aynı satırları taşır."""
+import csv
+import io
+from datetime import date
+from unittest import mock, skipUnless
+
+from django.test import TestCase, override_settings
+
+from .. import arrow_export, views_pareto
+from ..models import ProductMetric
+from ..pareto_cache import invalidate_all
+from .factories import metric
+
+if arrow_export.available():
+    import pyarrow.ipc as pa_ipc  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 10, 1), sales=4),
+            metric(2, "Çay", 40.0, date(2025, 10, 1)),
+            metric(1, "Kahve", 20.0, date(2025, 10, 2)),
+            metric(3, "Su", 10.0, None),
+        ])
+
+    def _body(self, url, **params):
+        resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        return resp, b"".join(resp.streaming_content)
+
+    def _csv(self, **params):
+        _, body = self._body("/api/pareto/export", **params)
+        return list(csv.reader(io.StringIO(body.decode("utf-8"))))[1:]
+
+    @staticmethod
+    def _read(fmt, body):
+        if fmt == "parquet":
+            return pq.read_table(io.BytesIO(body))
+        return pa_ipc.open_stream(body).read_all()
+
+    @skipUnless(arrow_export.available(), "pyarrow yok")
+    def test_aggregate_matches_csv(self):
+        expected = self._csv(groupby="name")
+        totals = {r["label"]: r for r in self.client.get("/api/pareto/table").json()["rows"]}
+        for fmt in arrow_export.FORMATS:
+            with self.subTest(fmt=fmt):
+                resp, body = self._body("/api/pareto/export", format=fmt, groupby="name")
+                self.assertEqual(resp["Content-Type"], arrow_export.FORMATS[fmt][0])
+                table = self._read(fmt, body)
+                self.assertEqual(table.column_names, ["label"] + [c for c, _ in arrow_export.AGGREGATE_COLUMNS])
+                rows = table.to_pylist()
+                self.assertEqual([r["label"] for r in rows], [r[0] for r in expected])
+                for row, line in zip(rows, expected):
+                    self.assertAlmostEqual(row["sum_profit"], float(line[1]), places=2)
+                    self.assertAlmostEqual(row["cum_pct"], float(line[2]), places=2)
+                    other = totals[row["label"]]
+                    self.assertEqual((row["sum_click"], row["sum_sales"]), (other["sum_click"], other["sum_sales"]))
+
+    @skipUnless(arrow_export.available(), "pyarrow yok")
+    def test_raw_rows_and_types(self):
+        names = [name for name, _ in arrow_export.RAW_COLUMNS]
+        expected = [dict(zip(names, r)) for r in ProductMetric.objects.order_by("id").values_list(*names)]
+        # 4 satır, 2'lik parçalar: iki record batch / row group
+        with mock.patch.object(views_pareto, "RAW_EXPORT_CHUNK_SIZE", 2):
+            for fmt in arrow_export.FORMATS:
+                with self.subTest(fmt=fmt):
+                    _, body = self._body("/api/pareto/export/raw", format=fmt)
+                    table = self._read(fmt, body)
+                    self.assertEqual(str(table.schema.field("ts").type), "date32[day]")
+                    self.assertEqual(str(table.schema.field("product_id").type), "int64")
+                    self.assertEqual(table.to_pylist(), expected)
+                    if fmt == "parquet":
+                        self.assertEqual(pq.ParquetFile(io.BytesIO(body)).num_row_groups, 2)
+
+    def test_raw_csv(self):
+        _, body = self._body("/api/pareto/export/raw", search="kah")
+        rows = list(csv.reader(io.StringIO(body.decode("utf-8"))))
+        self.assertEqual(rows[0], [name for name, _ in arrow_export.RAW_COLUMNS])
+        self.assertEqual([r[2] for r in rows[1:]], ["Kahve", "Kahve"])
+
+    def test_ties_follow_pareto_order(self):
+        ProductMetric.objects.bulk_create([metric(5, "Tost", 40.0, date(2025, 10, 3)),
+                                           metric(6, "Ayran", 40.0, date(2025, 10, 3))])
+        invalidate_all()
+        labels = [r[0] for r in self._csv()]
+        self.assertEqual(labels, ["Kahve", "Ayran", "Tost", "Çay", "Su"])
+        self.assertEqual(labels, self.client.get("/api/pareto").json()["labels"])
+
+    def test_unknown_format(self):
+        resp = self.client.get("/api/pareto/export", {"format": "xlsx"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.json()["success"])
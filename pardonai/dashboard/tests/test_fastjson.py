@@ -0,0 +1,121 @@
+# pardonai/dashboard/tests/test_fastjson.py
+"""Hızlı JSON: orjson ve stdlib aynı veriyi üretir; columnar biçim satır biçiminin devriği."""
+import json
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import fastjson
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from .factories import metric
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+SAMPLE = {
+    "label": "Çay ☕", "price": Decimal("1.50"), "day": date(2025, 1, 2),
+    "values": [0.1, 1e-05, 3.0, 1e20, -0.0], "none": None, "ok": True, "nested": {"n": [1, 2]},
+}
+
+
+class DumpsTests(SimpleTestCase):
+
+    def test_backends_agree(self):
+        expected = {**SAMPLE, "price": "1.50", "day": "2025-01-02"}
+        self.assertEqual(json.loads(fastjson.dumps_stdlib(SAMPLE)), expected)
+        self.assertEqual(json.loads(fastjson.dumps(SAMPLE)), expected)
+        with mock.patch.object(fastjson, "orjson", None):
+            self.assertEqual(fastjson.backend(), "json")
+            self.assertEqual(fastjson.dumps(SAMPLE), fastjson.dumps_stdlib(SAMPLE))
+
+    def test_compact_utf8(self):
+        body = fastjson.dumps({"a": "Çay", "b": [1, 2]})
+        self.assertEqual(body, '{"a":"Çay","b":[1,2]}'.encode("utf-8"))
+
+    @skipIf(np is None or fastjson.orjson is None, "numpy / orjson yok")
+    def test_numpy_arrays(self):
+        data = {"x": np.array([1.5, 2.0]), "i": np.arange(3, dtype=np.int64)}
+        self.assertEqual(json.loads(fastjson.dumps(data)), {"x": [1.5, 2.0], "i": [0, 1, 2]})
+
+    def test_columns(self):
+        records = [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+        self.assertEqual(fastjson.columns(records), {"a": [1, 2], "b": ["x", "y"]})
+        self.assertEqual(fastjson.columns(records, ["b"]), {"b": ["x", "y"]})
+        self.assertEqual(fastjson.columns([]), {})
+        self.assertEqual(fastjson.columns([], ["a"]), {"a": []})
+
+    def test_response(self):
+        resp = fastjson.FastJsonResponse(SAMPLE, status=201)
+        self.assertEqual((resp.status_code, resp["Content-Type"]), (201, "application/json"))
+        self.assertEqual(json.loads(resp.content), json.loads(fastjson.dumps_stdlib(SAMPLE)))
+
+
+def transpose(cols):
+    """{"a": [...], "b": [...]} -> [{"a": .., "b": ..}, ...]"""
+    names = list(cols)
+    return [dict(zip(names, vals)) for vals in zip(*(cols[n] for n in names))]
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ColumnarApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 9, 1), sales=4, click=9),
+            metric(2, "Çay", 40.0, date(2025, 9, 1)),
+            metric(3, "Su", 10.5, date(2025, 9, 2), sales=3),
+            metric(4, "Tost", -5.0, date(2025, 9, 2)),
+        ])
+
+    def setUp(self):
+        aggregate_cache.clear()
+
+    def _pair(self, url, **params):
+        rows = self.client.get(url, params).json()
+        cols = self.client.get(url, {**params, "format": "columnar"}).json()
+        self.assertTrue(rows["success"] and cols["success"], (rows, cols))
+        return rows, cols
+
+    def test_bundle_pareto_table(self):
+        rows, cols = self._pair("/api/pareto/bundle", parts="pareto")
+        rows, cols = rows["parts"]["pareto"], cols["parts"]["pareto"]
+        self.assertEqual(list(cols["table"]["rows"]), cols["table"]["columns"])
+        self.assertEqual(transpose(cols["table"]["rows"]), rows["table"]["rows"])
+        self.assertEqual(len(rows["table"]["rows"]), 4)
+        for key in ("labels", "profit", "cum_pct"):
+            self.assertEqual(cols[key], rows[key])
+
+    def test_abc(self):
+        rows, cols = self._pair("/api/pareto/abc")
+        self.assertEqual(transpose(cols["items"]), rows["items"])
+        self.assertEqual(cols["summary"], rows["summary"])
+
+    def test_scatter(self):
+        rows, cols = self._pair("/api/pareto/scatter")
+        self.assertEqual(set(cols["sets"]), set(rows["sets"]))
+        for name, points in rows["sets"].items():
+            with self.subTest(set=name):
+                got = cols["sets"][name]
+                self.assertEqual([{"x": x, "y": y, "label": lab}
+                                  for x, y, lab in zip(got["x"], got["y"], cols["labels"])], points)
+
+    def test_treemap(self):
+        rows, cols = self._pair("/api/pareto/treemap")
+        del cols["success"]
+        nested = [{**child, "class": group["name"]}
+                  for group in rows["root"]["children"] for child in group["children"]]
+        self.assertCountEqual(transpose(cols), nested)
+
+    def test_stdlib_fallback_same_body(self):
+        for url in ("/api/pareto/bundle", "/api/pareto/abc", "/api/pareto/scatter"):
+            with self.subTest(url=url):
+                fast = json.loads(self.client.get(url, {"format": "columnar"}).content)
+                with mock.patch.object(fastjson, "orjson", None):
+                    slow = json.loads(self.client.get(url, {"format": "columnar"}).content)
+                self.assertEqual(fast, slow)
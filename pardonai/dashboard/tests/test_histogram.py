@@ -0,0 +1,87 @@
+# pardonai/dashboard/tests/test_histogram.py
+"""SQL histogramı: kova kenarları ve sayılar numpy.histogram ile aynı."""
+from datetime import date
+from unittest import skipIf
+
+from django.db.models import Avg
+from django.test import TestCase, override_settings
+
+from ..histogram import sql_histogram
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from .factories import metric
+
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None  # type: ignore
+
+# ürün başına tek satır, sales=1: ortalama birim kâr = kâr
+VALUES = [0.0, 1.0, 2.5, 5.0, 7.5, 10.0, -2.0]
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class SqlHistogramTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([
+            metric(i + 1, f"P{i}", v, date(2025, 9, 1)) for i, v in enumerate(VALUES)
+        ])
+
+    def _hist(self, values=None, **opts):
+        qs = ProductMetric.objects.all()
+        if values is not None:
+            qs = qs.filter(total_profit__in=values)
+        grouped = qs.values("product_name").annotate(v=Avg("unit_profit")).order_by()
+        return sql_histogram(grouped, "v", **opts)
+
+    @skipIf(np is None, "numpy yok")
+    def test_linear_matches_numpy(self):
+        for bins in (1, 4, 5, 12):
+            with self.subTest(bins=bins):
+                res = self._hist(bins=bins)
+                counts, edges = np.histogram(VALUES, bins=bins)
+                self.assertEqual(res["hist"], counts.tolist())
+                self.assertEqual(len(res["edges"]), bins + 1)
+                for got, want in zip(res["edges"], edges.tolist()):
+                    self.assertAlmostEqual(got, want)
+                self.assertEqual(res["excluded"], 0)
+
+    def test_values_on_edges(self):
+        # kenarlar -2, 1, 4, 7, 10: iç kenar sağdaki kovaya, hi son kovaya
+        res = self._hist(bins=4)
+        self.assertEqual(res["edges"], [-2.0, 1.0, 4.0, 7.0, 10.0])
+        self.assertEqual(res["hist"], [2, 2, 1, 2])
+
+    def test_single_value_widens_range(self):
+        res = self._hist(values=[5.0], bins=2)
+        self.assertEqual(res["edges"], [4.5, 5.0, 5.5])
+        self.assertEqual(res["hist"], [0, 1])
+
+    def test_empty(self):
+        self.assertEqual(self._hist(values=[123.0], bins=3), {"hist": [], "edges": [], "excluded": 0})
+
+    def test_log_excludes_non_positive(self):
+        res = self._hist(bins=2, scale="log")
+        self.assertEqual(res["excluded"], 2)  # 0 ve -2
+        self.assertEqual(sum(res["hist"]), 5)
+        self.assertAlmostEqual(res["edges"][0], 1.0)
+        self.assertAlmostEqual(res["edges"][-1], 10.0)
+        self.assertAlmostEqual(res["edges"][1], 10 ** 0.5)  # LN ölçeğinde orta nokta
+        self.assertEqual(res["hist"], [2, 3])  # 1, 2.5 < sqrt(10) <= 5, 7.5, 10
+
+    def test_quantile_bins_have_equal_counts(self):
+        res = self._hist(values=VALUES[:6], bins=3, quantile=True)
+        self.assertEqual(res["hist"], [2, 2, 2])
+        self.assertEqual(res["edges"], [0.0, 2.5, 7.5, 10.0])
+
+    def test_api_clamps_bins(self):
+        for bins, expected in (("0", 1), ("4", 4), ("1000", 200)):
+            with self.subTest(bins=bins):
+                aggregate_cache.clear()
+                body = self.client.get("/api/pareto/hist", {"bins": bins}).json()
+                self.assertTrue(body["success"], body)
+                self.assertEqual(len(body["unit"]["hist"]), expected)
+                self.assertEqual(sum(body["unit"]["hist"]), len(VALUES))
+
@@ -0,0 +1,58 @@
+# pardonai/dashboard/tests/test_ingest.py
+"""CSV yükleme: tarih ayrıştırma ve (product_id, ts) upsert'i."""
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest import skipIf
+
+from django.test import TestCase
+
+from .. import ingest
+from ..models import ProductMetric, ProductMetricDirtyDay
+from .factories import metric
+
+HEADER = "Product ID,Product Name,Click,Sales,Cost (₺),Sales Price (₺),Tarih\n"
+
+
+@skipIf(ingest.pd is None, "pandas yok")
+class IngestDateTests(TestCase):
+
+    def _frame(self, days):
+        rows = [[str(i + 1), f"Ürün {i + 1}", "10", "2", "5", "8", d] for i, d in enumerate(days)]
+        return ingest.pd.DataFrame(rows, columns=HEADER.strip().split(","))
+
+    def test_iso_and_day_first_in_same_chunk(self):
+        df, skipped = ingest.normalize_chunk(self._frame(["2025-03-04", "04.03.2025", "2025-12-01", "13/01/2025"]))
+        self.assertEqual(skipped, 0)
+        self.assertEqual(
+            list(df["ts"]), [date(2025, 3, 4), date(2025, 3, 4), date(2025, 12, 1), date(2025, 1, 13)],
+        )
+
+    def test_month_first_applies_only_to_non_iso(self):
+        df, _ = ingest.normalize_chunk(self._frame(["2025-03-04", "03/04/2025"]), dayfirst=False)
+        self.assertEqual(list(df["ts"]), [date(2025, 3, 4), date(2025, 3, 4)])
+
+    def test_invalid_and_empty_dates_use_default(self):
+        df, _ = ingest.normalize_chunk(self._frame(["yarın", None]), ts=date(2025, 5, 1))
+        self.assertEqual(list(df["ts"]), [date(2025, 5, 1), date(2025, 5, 1)])
+
+    def test_upsert_replaces_same_day_only(self):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Ürün 1", 99.0, date(2025, 3, 4)),
+            metric(1, "Ürün 1", 42.0, date(2025, 4, 3)),
+        ])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "products.csv"
+            path.write_text(
+                HEADER + "1,Ürün 1,10,2,5,8,2025-03-04\n2,Ürün 2,10,2,5,8,04.03.2025\n", encoding="utf-8",
+            )
+            res = ingest.load_file(path, method="bulk")
+        self.assertEqual(res["rows"], 2)
+        rows = sorted(ProductMetric.objects.values_list("product_id", "ts", "total_profit"))
+        self.assertEqual(rows, [
+            (1, date(2025, 3, 4), 6.0),   # aynı gün: yenisiyle değişti
+            (1, date(2025, 4, 3), 42.0),  # gün/ay takası olsaydı silinirdi
+            (2, date(2025, 3, 4), 6.0),
+        ])
+        # parçanın günleri yazımla aynı transaction'da rollup'ta kirli
+        self.assertEqual(list(ProductMetricDirtyDay.objects.values_list("day", flat=True)), [date(2025, 3, 4)])
@@ -0,0 +1,102 @@
+# pardonai/dashboard/tests/test_lorenz.py
+"""Lorenz eğrisi seyreltme (LTTB / quantile): uçlar korunur, Gini tam vektörden."""
+import random
+from datetime import date
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .. import pareto_engine
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..pareto_engine import ParetoEngine, lttb_indices, quantile_indices
+from .factories import metric
+
+
+def _curve(n, seed=3):
+    rng = random.Random(seed)
+    return ParetoEngine(sorted((rng.paretovariate(1.1) for _ in range(n)), reverse=True))
+
+
+class DownsampleIndexTests(SimpleTestCase):
+
+    def assertValidIndices(self, idx, n, points):
+        self.assertEqual((idx[0], idx[-1]), (0, n - 1))
+        self.assertLessEqual(len(idx), points)
+        self.assertEqual(idx, sorted(set(idx)))
+
+    def test_quantile_keeps_endpoints(self):
+        for n, points in ((10, 3), (1001, 500), (7, 7), (5000, 2)):
+            with self.subTest(n=n, points=points):
+                self.assertValidIndices(quantile_indices(n, points), n, points)
+        self.assertEqual(quantile_indices(5, 10), [0, 1, 2, 3, 4])
+
+    def test_lttb_keeps_endpoints_and_point_budget(self):
+        engine = _curve(3000)
+        x, y, _ = engine.lorenz()
+        for method in ("lttb", "quantile"):
+            for points in (3, 50, 500):
+                with self.subTest(method=method, points=points):
+                    sx, sy, _ = engine.lorenz(points, method)
+                    self.assertEqual(len(sx), points)
+                    self.assertEqual((sx[0], sy[0]), (x[0], y[0]))
+                    self.assertEqual((sx[-1], sy[-1]), (x[-1], y[-1]))
+                    self.assertTrue(all(a < b for a, b in zip(sx, sx[1:])))
+
+    def test_lttb_follows_the_curve_better_than_quantile(self):
+        # uzun kuyruk: eğrinin kıvrımı son noktalarda; LTTB orada daha sık örnekler
+        engine = _curve(5000)
+        x, y, _ = engine.lorenz()
+        full = dict(zip(x, y))
+
+        def worst_gap(sx, sy):
+            # seyreltilmiş eğrinin doğrusal aradeğerlemesi ile tam eğri arasındaki en büyük fark
+            worst, j = 0.0, 0
+            for xi, yi in full.items():
+                while sx[j + 1] < xi:
+                    j += 1
+                t = (xi - sx[j]) / (sx[j + 1] - sx[j])
+                worst = max(worst, abs(sy[j] + t * (sy[j + 1] - sy[j]) - yi))
+            return worst
+
+        lttb = worst_gap(*engine.lorenz(50, "lttb")[:2])
+        quantile = worst_gap(*engine.lorenz(50, "quantile")[:2])
+        self.assertLess(lttb, quantile)
+
+    def test_python_fallback_picks_same_points(self):
+        engine = _curve(2000)
+        x, y, _ = engine.lorenz()
+        with_np = lttb_indices(*engine._lorenz_arrays()[:2], 200)
+        with mock.patch.object(pareto_engine, "np", None):
+            self.assertEqual(lttb_indices(x, y, 200), with_np)
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class LorenzEndpointTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(11)
+        ProductMetric.objects.bulk_create([
+            metric(i, f"P{i:04d}", round(rng.paretovariate(1.2) * 10, 2), date(2025, 5, 1)) for i in range(1, 1201)
+        ])
+
+    def setUp(self):
+        aggregate_cache.clear()
+
+    def test_points_bound_and_exact_gini(self):
+        profit = list(ProductMetric.objects.order_by("-total_profit").values_list("total_profit", flat=True))
+        gini = ParetoEngine(profit).gini()
+        for sample in ("lttb", "quantile"):
+            with self.subTest(sample=sample):
+                body = self.client.get("/api/pareto/lorenz", {"points": "100", "sample": sample}).json()
+                self.assertEqual((len(body["x"]), body["n"], body["sample"]), (100, 1200, sample))
+                self.assertEqual((body["x"][0], body["y"][0]), (0.0, 0.0))
+                self.assertAlmostEqual(body["x"][-1], 1.0)
+                self.assertAlmostEqual(body["y"][-1], 1.0)
+                self.assertEqual(body["gini"], round(gini, 4))
+
+    def test_points_are_clamped(self):
+        self.assertEqual(len(self.client.get("/api/pareto/lorenz", {"points": "1"}).json()["x"]), 3)
+        full = self.client.get("/api/pareto/lorenz", {"points": "99999"}).json()
+        self.assertEqual(len(full["x"]), 1201)  # n + 1 < üst sınır: seyreltme yok
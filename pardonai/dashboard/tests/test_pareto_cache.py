@@ -0,0 +1,92 @@
+# pardonai/dashboard/tests/test_pareto_cache.py
+"""Agregasyon önbelleği: girdi sayısı ve yaklaşık bellek sınırı, commit'te geçersizleşme."""
+from datetime import date
+
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..conditional import bump_data_version
+from ..models import ProductMetric
+from ..pareto_cache import AggregateCache, aggregate_cache, approx_size, invalidate_all, make_key
+from .factories import metric
+
+
+def _result(n):
+    """filtered_qs sonucu gibi: (labels, profit, click, sales, rows)."""
+    return ([f"P{i}" for i in range(n)], [float(i) for i in range(n)], list(range(n)), list(range(n)), n)
+
+
+class AggregateCacheSizeTests(SimpleTestCase):
+
+    def test_approx_size_grows_with_payload(self):
+        small, large = approx_size(_result(10)), approx_size(_result(1000))
+        self.assertGreater(large, 50 * small)
+        shared = [1.5] * 100
+        self.assertLess(approx_size((shared, shared)), 2 * approx_size(shared))  # paylaşılan liste bir kez
+
+    def test_evicts_oldest_by_bytes(self):
+        one = approx_size(_result(100))
+        cache = AggregateCache(max_entries=100, ttl=60, max_bytes=int(one * 2.5))
+        for key in ("a", "b", "c"):
+            cache.put(key, _result(100))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+
+    def test_oversized_result_is_not_stored(self):
+        cache = AggregateCache(max_entries=10, ttl=60, max_bytes=approx_size(_result(10)) * 2)
+        cache.put("small", _result(10))
+        cache.put("big", _result(1000))
+        self.assertIsNone(cache.get("big"))
+        self.assertIsNotNone(cache.get("small"))
+        calls = []
+        self.assertEqual(cache.get_or_compute("big", lambda: calls.append(1) or _result(1000))[4], 1000)
+        self.assertEqual(len(calls), 1)
+
+    def test_accounting_follows_replace_invalidate_clear(self):
+        cache = AggregateCache(max_entries=10, ttl=60, max_bytes=10 ** 9)
+        cache.put("a", _result(10))
+        cache.put("a", _result(20))
+        self.assertEqual(cache.size_bytes, approx_size(_result(20)))
+        cache.put("b", _result(10))
+        cache.invalidate(lambda k: k == "a")
+        self.assertEqual(cache.size_bytes, approx_size(_result(10)))
+        cache.clear()
+        self.assertEqual((len(cache), cache.size_bytes), (0, 0))
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class AggregateCacheCommitTests(TestCase):
+
+    def setUp(self):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 8, 1)),
+            metric(2, "Çay", 40.0, date(2025, 8, 2)),
+        ])
+        invalidate_all()
+        self.addCleanup(aggregate_cache.clear)
+
+    def _labels(self):
+        return self.client.get("/api/pareto").json()["labels"]
+
+    def test_read_before_commit_cannot_refill_stale_entry(self):
+        self.assertEqual(self._labels(), ["Kahve", "Çay"])
+        stale = aggregate_cache.get(make_key(None, None, "", "name"))
+        self.assertIsNotNone(stale)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                row = ProductMetric.objects.get(product_id=2)
+                row.total_profit = 400.0
+                row.save()
+                # commit'ten önce eski satırları gören eşzamanlı bir okuyucu
+                key = make_key(None, None, "", "name")
+                self.assertIs(aggregate_cache.get_or_compute(key, lambda: stale), stale)
+        self.assertEqual(self._labels(), ["Çay", "Kahve"])
+
+    def test_version_bump_retires_entries(self):
+        self._labels()
+        before = make_key(None, None, "", "name")
+        bump_data_version()  # başka bir worker'ın commit'i: bu süreçte invalidasyon yok
+        after = make_key(None, None, "", "name")
+        self.assertNotEqual(before, after)
+        self.assertIsNone(aggregate_cache.get(after))
@@ -0,0 +1,99 @@
+# pardonai/dashboard/tests/test_pareto_engine.py
+"""ParetoEngine: vektörel sonuçlar eleman eleman Python hesabıyla aynı (numpy ve sade Python)."""
+import random
+from math import fsum
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .. import pareto_engine
+from ..pareto_engine import ParetoEngine
+
+
+def reference(values, thr=80.0, thr_b=95.0):
+    """Motordan önceki döngüler: kümülatif yüzde, eşik indeksi, ABC, Lorenz/Gini."""
+    total = float(sum(values))
+    cum, run = [], 0.0
+    for v in values:
+        run += v
+        cum.append((run / total * 100.0) if total else 0.0)
+    idx = next((i for i, cp in enumerate(cum) if cp >= thr), -1)
+    classes = ["A" if c <= thr else ("B" if c <= thr_b else "C") for c in cum]
+
+    asc = sorted(values)
+    lorenz_total = fsum(asc) or 1.0
+    y, run = [0.0], 0.0
+    for p in asc:
+        run += p
+        y.append(run / lorenz_total)
+    n = len(values)
+    x = [i / n for i in range(n + 1)]
+    area = 0.0
+    for i in range(n):
+        area += (y[i] + y[i + 1]) / 2 * (x[i + 1] - x[i])
+    return cum, idx, classes, x, y, 1 - 2 * area
+
+
+def vectors():
+    rng = random.Random(7)
+    yield [100.0]
+    yield [50.0, 30.0, 10.0, 5.0, 5.0]
+    yield [40.0, 40.0, 20.0, -10.0, -30.0]  # negatif kuyruk: eğri monoton değil
+    yield sorted((rng.paretovariate(1.2) * 10 for _ in range(2000)), reverse=True)
+    yield sorted((rng.uniform(-20, 100) for _ in range(500)), reverse=True)
+
+
+class ParetoEngineReferenceTests(SimpleTestCase):
+
+    def assertClose(self, got, want, places=9):
+        self.assertEqual(len(got), len(want))
+        for g, w in zip(got, want):
+            self.assertAlmostEqual(g, w, places=places)
+
+    def check(self, values):
+        cum, _, classes, x, y, gini = reference(values)
+        engine = ParetoEngine(values)
+        self.assertAlmostEqual(engine.total, sum(values), places=6)
+        self.assertClose(engine.cum_pct(), cum)
+        self.assertEqual(engine.cum_pct(2), [round(c, 2) for c in cum])
+        for thr in (10, 50, 80, 95, 99.9, 100, 150):
+            with self.subTest(thr=thr):
+                self.assertEqual(engine.threshold_index(thr), reference(values, thr)[1])
+        self.assertEqual(engine.abc_labels(80, 95), classes)
+
+        summary = engine.abc_summary(80, 95)
+        for cls in pareto_engine.ABC_CLASSES:
+            members = [v for v, c in zip(values, classes) if c == cls]
+            self.assertEqual(summary[cls]["count"], len(members))
+            self.assertAlmostEqual(summary[cls]["sum"], round(fsum(members), 2), places=6)
+
+        lx, ly, lgini = engine.lorenz()
+        self.assertClose(lx, x)
+        self.assertClose(ly, y)
+        self.assertAlmostEqual(lgini, gini, places=9)
+
+    def test_matches_reference(self):
+        for values in vectors():
+            with self.subTest(n=len(values)):
+                self.check(values)
+
+    def test_python_fallback_matches_reference(self):
+        with mock.patch.object(pareto_engine, "np", None):
+            for values in vectors():
+                with self.subTest(n=len(values)):
+                    self.check(values)
+
+    def test_page_slice_matches_full_vector(self):
+        values = list(next(v for v in vectors() if len(v) == 2000))
+        full = ParetoEngine(values)
+        start, stop = 300, 420
+        page = ParetoEngine(values[start:stop], offset=fsum(values[:start]), total=full.total)
+        self.assertClose(page.cum_pct(), full.cum_pct(start=start, stop=stop), places=6)
+        self.assertEqual(page.abc_labels(), full.abc_labels(start=start, stop=stop))
+
+    def test_empty_and_zero_total(self):
+        empty = ParetoEngine([])
+        self.assertEqual((empty.cum_pct(), empty.threshold_index(80), empty.lorenz()), ([], -1, ([], [], 0.0)))
+        zero = ParetoEngine([5.0, -5.0])
+        self.assertEqual(zero.cum_pct(), [0.0, 0.0])
+        self.assertEqual(zero.threshold_index(80), -1)
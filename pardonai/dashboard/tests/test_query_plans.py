@@ -0,0 +1,110 @@
+# pardonai/dashboard/tests/test_query_plans.py
+"""
+Pareto sorgu planı regresyon testleri.
+
+Her pareto sorgu şekli (gruplama anahtarı x filtre) büyük bir sentetik tablo
+üzerinde EXPLAIN edilir; plan ham tabloda tam tarama (seq scan) içeriyorsa
+test planın kendisiyle birlikte başarısız olur. PostgreSQL'de enable_seqscan
+kapatılır: planlayıcı yine seq scan seçiyorsa kullanılabilir bir indeks yoktur.
+"""
+import re
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from ..bench.synthetic import load_rows
+from ..models import ProductMetric
+from ..rollup import rebuild_all
+from ..pareto_query import grouped_source, revenue_cogs
+
+SEED_ROWS = 20000
+SEED_PRODUCTS = 500
+DATE_FROM = date(2025, 3, 1)
+DATE_TO = date(2025, 3, 31)
+
+
+def _explain(qs) -> str:
+    return qs.explain()
+
+
+def _full_scan(plan: str, table: str) -> bool:
+    if connection.vendor == "postgresql":
+        return re.search(rf"Seq Scan on {table}\b", plan) is not None
+    # SQLite: "SCAN product_metric" (eski sürümlerde "SCAN TABLE ...");
+    # "SCAN ... USING [COVERING] INDEX" indeks taramasıdır
+    return re.search(rf"\bSCAN (TABLE )?{table}\b(?! USING)", plan) is not None
+
+
+class ParetoQueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        load_rows(SEED_ROWS, products=SEED_PRODUCTS, days=180)
+        rebuild_all()
+        with connection.cursor() as cur:
+            cur.execute("ANALYZE")
+
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cur:
+                cur.execute("SET enable_seqscan = off")
+
+    def tearDown(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cur:
+                cur.execute("RESET enable_seqscan")
+
+    def assertNoFullScan(self, qs, table: str):
+        plan = _explain(qs)
+        self.assertFalse(_full_scan(plan, table), f"{table} tam taranıyor:\n{plan}")
+
+    def _grouped(self, groupby, date_from=None, date_to=None, search="", product_ids=None):
+        base, key, annotations, _ = grouped_source(date_from, date_to, search, groupby, product_ids or [])
+        return base, base.values(key).annotate(**annotations).order_by("-sum_profit")
+
+    # ---------------- ham tablo ----------------
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_grouped_shapes(self):
+        shapes = {
+            "name+tarih": dict(groupby="name", date_from=DATE_FROM, date_to=DATE_TO),
+            "id+tarih": dict(groupby="id", date_from=DATE_FROM, date_to=DATE_TO),
+            "name+filtresiz": dict(groupby="name"),
+            "id+filtresiz": dict(groupby="id"),
+            "name+arama": dict(groupby="name", search="kahve"),
+            "id+tarih+ürün": dict(groupby="id", date_from=DATE_FROM, date_to=DATE_TO, product_ids=[1, 2, 3]),
+        }
+        for label, params in shapes.items():
+            with self.subTest(shape=label):
+                base, qs = self._grouped(**params)
+                self.assertIs(base.model, ProductMetric)
+                self.assertNoFullScan(qs, "product_metric")
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_whatif_shape(self):
+        for groupby in ("name", "id"):
+            with self.subTest(groupby=groupby):
+                base, key, _, _ = grouped_source(DATE_FROM, DATE_TO, "", groupby, [])
+                revenue, cogs = revenue_cogs(base)
+                qs = base.values(key).annotate(revenue=revenue, cogs=cogs).order_by("-revenue")
+                self.assertNoFullScan(qs, "product_metric")
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_export_total_shape(self):
+        base, _, _, profit_field = grouped_source(DATE_FROM, DATE_TO, "", "name", [])
+        # aggregate() EXPLAIN edilemez; aynı erişim yolunu kullanan sütun taraması
+        self.assertNoFullScan(base.values_list(profit_field).order_by(), "product_metric")
+
+    # ---------------- rollup ----------------
+    @override_settings(PARETO_USE_ROLLUP=True)
+    def test_rollup_grouped_shapes(self):
+        shapes = {
+            "name+tarih": dict(groupby="name", date_from=DATE_FROM, date_to=DATE_TO),
+            "id+tarih": dict(groupby="id", date_from=DATE_FROM, date_to=DATE_TO),
+            "name+arama": dict(groupby="name", search="kahve"),
+        }
+        for label, params in shapes.items():
+            with self.subTest(shape=label):
+                base, qs = self._grouped(**params)
+                self.assertEqual(base.model._meta.db_table, "product_metric_daily")
+                self.assertNoFullScan(qs, "product_metric_daily")
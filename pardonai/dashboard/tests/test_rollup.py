@@ -0,0 +1,115 @@
+# pardonai/dashboard/tests/test_rollup.py
+"""Günlük rollup: su seviyesi, kirli günler ve ham tabloyla birebir toplamlar."""
+from datetime import date
+
+from django.db.models import Count, F, Sum
+from django.test import TestCase, override_settings
+
+from .. import rollup
+from ..models import ProductMetric, ProductMetricDaily, ProductMetricDirtyDay, ProductMetricRollupState
+from ..pareto_cache import aggregate_cache
+from .factories import metric
+
+DAYS = [date(2025, 7, 1), date(2025, 7, 2)]
+
+
+@override_settings(PARETO_USE_ROLLUP=True)
+class RollupRefreshTests(TestCase):
+
+    def setUp(self):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, DAYS[0]),
+            metric(1, "Kahve", 20.0, DAYS[0], sales=2),
+            metric(2, "Çay", 40.0, DAYS[1]),
+            metric(3, "Su", 5.0, None),
+        ])
+        rollup.rebuild_all()
+        aggregate_cache.clear()
+
+    def assertMatchesRaw(self):
+        raw = {
+            (r["product_id"], r["product_name"], r["ts"]): (r["n"], r["p"], r["s"])
+            for r in ProductMetric.objects.values("product_id", "product_name", "ts")
+            .annotate(n=Count("id"), p=Sum("total_profit"), s=Sum("sales")).order_by()
+        }
+        daily = {
+            (r.product_id, r.product_name, r.day): (r.row_count, r.sum_profit, r.sum_sales)
+            for r in ProductMetricDaily.objects.all()
+        }
+        self.assertEqual(daily, raw)
+
+    def _labels(self):
+        aggregate_cache.clear()
+        body = self.client.get("/api/pareto").json()
+        return dict(zip(body["labels"], body["profit"]))
+
+    def test_rebuild_all_matches_raw(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(rollup.rollup_is_current())
+        self.assertMatchesRaw()
+
+    def test_new_rows_move_past_watermark(self):
+        ProductMetric.objects.bulk_create([metric(4, "Tost", 30.0, DAYS[1])])
+        self.assertFalse(rollup.rollup_is_current())
+        # rollup eskiyken sonuç ham tablodan: yeni satır görünür
+        self.assertEqual(self._labels()["Tost"], 30.0)
+
+        res = rollup.refresh_incremental()
+        self.assertEqual(res["days"], 1)
+        self.assertEqual(res["last_metric_id"], ProductMetric.objects.latest("id").id)
+        self.assertTrue(rollup.rollup_is_current())
+        self.assertMatchesRaw()
+
+    def test_update_marks_old_and_new_day_dirty(self):
+        row = ProductMetric.objects.get(product_id=2)
+        row.ts, row.total_profit = DAYS[0], 70.0
+        row.save()
+        self.assertEqual(set(ProductMetricDirtyDay.objects.values_list("day", flat=True)), set(DAYS))
+        self.assertFalse(rollup.rollup_is_current())
+        self.assertEqual(self._labels()["Çay"], 70.0)
+
+        rollup.refresh_incremental()
+        self.assertFalse(ProductMetricDirtyDay.objects.exists())
+        self.assertFalse(ProductMetricDaily.objects.filter(day=DAYS[1]).exists())
+        self.assertMatchesRaw()
+
+    def test_delete_and_undated_rows(self):
+        ProductMetric.objects.get(product_id=3).delete()
+        self.assertEqual(list(ProductMetricDirtyDay.objects.values_list("day", flat=True)), [None])
+        rollup.refresh_incremental()
+        self.assertFalse(ProductMetricDaily.objects.filter(day__isnull=True).exists())
+        self.assertMatchesRaw()
+        self.assertEqual(self._labels(), {"Kahve": 120.0, "Çay": 40.0})
+
+    def test_undated_day_is_marked_once(self):
+        rollup.mark_dirty([None])
+        rollup.mark_dirty([None, DAYS[0]])
+        self.assertEqual(ProductMetricDirtyDay.objects.filter(day__isnull=True).count(), 1)
+        self.assertEqual(ProductMetricDirtyDay.objects.count(), 2)
+
+    def test_created_row_below_watermark_is_caught(self):
+        # daha büyük id'li bir satır önce commit olmuş ve yenilenmiş gibi
+        ProductMetricRollupState.objects.filter(pk=1).update(last_metric_id=F("last_metric_id") + 100)
+        metric(4, "Tost", 30.0, DAYS[1]).save()
+        self.assertEqual(list(ProductMetricDirtyDay.objects.values_list("day", flat=True)), [DAYS[1]])
+        self.assertFalse(rollup.rollup_is_current())
+        rollup.refresh_incremental()
+        self.assertTrue(rollup.rollup_is_current())
+        self.assertMatchesRaw()
+
+    @override_settings(PARETO_ROLLUP_REFRESH_ON_COMMIT=True)
+    def test_orm_writes_refresh_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            metric(4, "Tost", 30.0, DAYS[1]).save()
+            row = ProductMetric.objects.get(product_id=2)
+            row.total_profit = 70.0
+            row.save()
+        self.assertTrue(rollup.rollup_is_current())
+        self.assertMatchesRaw()
+        self.assertEqual(self._labels()["Çay"], 70.0)
+
+    def test_request_path_writes_only_mark_days(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductMetric.objects.get(product_id=2).delete()
+        self.assertFalse(rollup.rollup_is_current())
+        self.assertEqual(list(ProductMetricDirtyDay.objects.values_list("day", flat=True)), [DAYS[1]])
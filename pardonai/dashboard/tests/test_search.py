@@ -0,0 +1,82 @@
+# pardonai/dashboard/tests/test_search.py
+"""Ürün adı araması: her motorda ve her kaynakta (ham / rollup) alt dize."""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..rollup import rebuild_all
+from .factories import metric
+
+
+class NameSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Türk Kahvesi", 50.0, date(2025, 3, 1)),
+            metric(2, "Filtre Kahve", 30.0, date(2025, 3, 1)),
+            metric(3, "Çay", 20.0, date(2025, 3, 2)),
+            metric(4, "Su", 10.0, date(2025, 3, 2)),
+        ])
+        rebuild_all()
+
+    def setUp(self):
+        aggregate_cache.clear()  # ham ve rollup yolu aynı önbellek anahtarını paylaşır
+
+    def _labels(self, search):
+        body = self.client.get("/api/pareto", {"search": search}).json()
+        self.assertTrue(body["success"], body)
+        return body["labels"]
+
+    def _assert_matches(self):
+        cases = {
+            "ahve": ["Türk Kahvesi", "Filtre Kahve"],   # ortada geçen
+            "KAHVE": ["Türk Kahvesi", "Filtre Kahve"],
+            "turk": ["Türk Kahvesi"],                   # ü -> u
+            "cay": ["Çay"],
+            "esi": ["Türk Kahvesi"],                    # sonda geçen
+            "yok": [],
+        }
+        for search, expected in cases.items():
+            with self.subTest(search=search):
+                self.assertEqual(self._labels(search), expected)
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_substring(self):
+        self._assert_matches()
+
+    @override_settings(PARETO_USE_ROLLUP=True)
+    def test_rollup_substring(self):
+        self._assert_matches()
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class SearchColumnReconcileTests(TestCase):
+
+    def setUp(self):
+        cay = metric(2, "Çay", 20.0, date(2025, 3, 2))
+        cay.product_name_search = ""  # kolonu doldurmayan bir bulk_create
+        ProductMetric.objects.bulk_create([metric(1, "Türk Kahvesi", 50.0, date(2025, 3, 1)), cay])
+        ProductMetric.objects.filter(product_id=1).update(product_name="Filtre Kahve")  # save() yok
+        aggregate_cache.clear()
+
+    def _labels(self, search):
+        return self.client.get("/api/pareto", {"search": search}).json()["labels"]
+
+    def test_command_repairs_rows_written_without_save(self):
+        self.assertEqual((self._labels("filtre"), self._labels("cay")), ([], []))
+        out = StringIO()
+        call_command("reconcile_product_name_search", "--dry-run", stdout=out)
+        self.assertIn("2 arama kolonu sapması bulundu", out.getvalue())
+        self.assertEqual(self._labels("cay"), [])
+
+        call_command("reconcile_product_name_search", stdout=StringIO())
+        self.assertEqual((self._labels("filtre"), self._labels("cay")), (["Filtre Kahve"], ["Çay"]))
+        self.assertEqual(self._labels("turk"), [])
+        out = StringIO()
+        call_command("reconcile_product_name_search", "--dry-run", stdout=out)
+        self.assertIn("0 arama kolonu sapması", out.getvalue())
@@ -0,0 +1,172 @@
+# pardonai/dashboard/tests/test_sketch.py
+"""approx=1 pareto: günlük özet kapsamı ve özetsiz günlerin kesin hesabı."""
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from .. import sketch
+from ..models import ProductMetric, ProductMetricSketch
+from .factories import metric
+
+DAYS = [date(2025, 3, d) for d in (1, 2, 3)]
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ApproxCoverageTests(TestCase):
+
+    def setUp(self):
+        # toplu yükleme gibi: sinyal yok, özet yok
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, DAYS[0]),
+            metric(2, "Çay", 30.0, DAYS[0]),
+            metric(1, "Kahve", 20.0, DAYS[1]),
+            metric(3, "Su", 60.0, DAYS[2]),
+            metric(4, "Buz", -5.0, DAYS[2]),  # negatif: sayaçlara girmez, toplama girer
+        ])
+
+    def assertExact(self, res):
+        self.assertEqual(res["labels"], ["Kahve", "Su", "Çay"])
+        self.assertEqual(res["profit"], [120.0, 60.0, 30.0])
+        self.assertEqual(res["sum_profit"], 205.0)
+        self.assertEqual(res["days"], 3)
+
+    def test_without_sketches_falls_back_to_exact_sums(self):
+        self.assertFalse(ProductMetricSketch.objects.exists())
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertExact(res)
+        self.assertEqual(res["exact_days"], 3)
+
+    def test_partial_coverage_merges_missing_days(self):
+        sketch.rebuild_days([DAYS[0]])
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertExact(res)
+        self.assertEqual(res["exact_days"], 2)
+
+    def test_rebuild_missing_backfills(self):
+        sketch.rebuild_days([DAYS[0]])
+        self.assertEqual(sketch.rebuild_missing(), 2)
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertExact(res)
+        self.assertEqual(res["exact_days"], 0)
+
+    def test_empty_range_is_empty(self):
+        res = sketch.approx_pareto(date(2024, 1, 1), date(2024, 1, 31))
+        self.assertEqual((res["labels"], res["sum_profit"], res["days"]), ([], 0.0, 0))
+
+    def test_api_approx_is_not_empty_on_bulk_loaded_data(self):
+        body = self.client.get("/api/pareto", {"approx": "1", "date_from": "2025-03-01", "date_to": "2025-03-03"}).json()
+        self.assertTrue(body["approx"])
+        self.assertEqual(body["labels"], ["Kahve", "Su", "Çay"])
+        self.assertEqual(body["sum_profit"], 205.0)
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ApproxStaleDayTests(TestCase):
+
+    def setUp(self):
+        ProductMetric.objects.bulk_create([metric(1, "Kahve", 100.0, DAYS[0]), metric(2, "Çay", 30.0, DAYS[1])])
+        sketch.rebuild_all()
+
+    def test_read_path_does_not_write(self):
+        ProductMetricSketch.objects.filter(day=DAYS[0]).update(stale=True)
+        with self.assertNumQueries(3):  # özetler, veri günleri, kesin günler
+            res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual(res["exact_days"], 1)
+        self.assertEqual(ProductMetricSketch.objects.filter(stale=True).count(), 2)
+
+    def test_stale_day_is_computed_exactly(self):
+        # özet eski kalmış, gün stale: okuma bayat özeti kullanmaz
+        ProductMetric.objects.filter(product_id=2).update(total_profit=300.0)
+        ProductMetricSketch.objects.filter(day=DAYS[1]).update(stale=True)
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual(res["labels"], ["Çay", "Kahve"])
+        self.assertEqual(res["sum_profit"], 400.0)
+
+    def test_orm_write_marks_day_stale(self):
+        row = ProductMetric.objects.get(product_id=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            row.total_profit = 300.0
+            row.save()
+        # commit'te yeniden üretim yok: okuma günü kesin hesaplar, düzenli iş üretir
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual((res["labels"], res["exact_days"]), (["Çay", "Kahve"], 1))
+        self.assertEqual(sketch.rebuild_stale(), 1)
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual((res["labels"], res["exact_days"]), (["Çay", "Kahve"], 0))
+
+    @override_settings(PARETO_SKETCH_REBUILD_ON_COMMIT=True)
+    def test_orm_write_rebuilds_on_commit(self):
+        row = ProductMetric.objects.get(product_id=2)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            row.total_profit = 300.0
+            row.save()
+        self.assertTrue(ProductMetricSketch.objects.filter(day=DAYS[1], stale=True).exists())
+        for callback in callbacks:
+            callback()
+        self.assertFalse(ProductMetricSketch.objects.filter(stale=True).exists())
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual((res["labels"], res["exact_days"]), (["Çay", "Kahve"], 0))
+
+    @override_settings(PARETO_SKETCH_REBUILD_ON_COMMIT=True)
+    def test_writes_in_one_transaction_rebuild_once(self):
+        cay, kahve = ProductMetric.objects.get(product_id=2), ProductMetric.objects.get(product_id=1)
+        with mock.patch.object(sketch, "mark_stale", wraps=sketch.mark_stale) as mark, \
+                mock.patch.object(sketch, "rebuild_days", wraps=sketch.rebuild_days) as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                for profit in (300.0, 310.0, 320.0):
+                    cay.total_profit = profit
+                    cay.save()
+                kahve.save()
+        # gün başına tek işaretleme, commit'te tek yeniden üretim
+        self.assertEqual([c.args[0] for c in mark.call_args_list], [{DAYS[1]}, {DAYS[0]}])
+        rebuild.assert_called_once_with({DAYS[0], DAYS[1]})
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual((res["labels"], res["profit"], res["exact_days"]), (["Çay", "Kahve"], [320.0, 100.0], 0))
+
+    def test_undated_sketch_is_unique_per_groupby(self):
+        # iki eşzamanlı mark_stale'in ikisi de satır bulamayıp eklemeye gider
+        for _ in range(2):
+            ProductMetricSketch.objects.bulk_create(
+                [ProductMetricSketch(day=None, groupby=g, stale=True) for g in sketch.GROUPBY_FIELDS],
+                ignore_conflicts=True,
+            )
+        self.assertEqual(ProductMetricSketch.objects.filter(day__isnull=True).count(), len(sketch.GROUPBY_FIELDS))
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class ApproxBoundsTests(TestCase):
+
+    def setUp(self):
+        # Kahve'nin günlük kârı işaret değiştirir: gerçek toplam 20
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, DAYS[0]),
+            metric(1, "Kahve", -80.0, DAYS[1]),
+            metric(2, "Çay", 30.0, DAYS[1]),
+            metric(3, "Su", 10.0, DAYS[2]),
+        ])
+        self.exact = {"Kahve": 20.0, "Çay": 30.0, "Su": 10.0}
+
+    def assertBounds(self, res):
+        for label, profit, error in zip(res["labels"], res["profit"], res["error"]):
+            with self.subTest(label=label):
+                self.assertLessEqual(profit - error, self.exact[label])
+                self.assertGreaterEqual(profit, self.exact[label])
+
+    def test_sign_changing_label_keeps_lower_bound(self):
+        sketch.rebuild_all()
+        res = sketch.approx_pareto(DAYS[0], DAYS[-1])
+        self.assertEqual(res["exact_days"], 0)
+        self.assertEqual(res["profit"][0], 100.0)  # sayaç yalnızca pozitif günü görür
+        self.assertGreaterEqual(res["error"][0], 80.0)
+        self.assertBounds(res)
+        self.assertEqual(res["sum_profit"], 60.0)
+
+    def test_bulk_merged_chunks_keep_lower_bound(self):
+        # toplu yükleme yolu: aynı günün parçaları ayrı ayrı birleştirilir
+        sketch.merge_day_sums({DAYS[0]: {"Kahve": 100.0}}, "name")
+        sketch.merge_day_sums({DAYS[0]: {"Kahve": -80.0, "Çay": 30.0}}, "name")
+        merged = sketch._load(DAYS[0], "name", sketch.sketch_capacity())
+        (label, count, error), *_ = merged.top()
+        self.assertEqual(label, "Kahve")
+        self.assertLessEqual(count - error - merged.loss, 20.0)
@@ -0,0 +1,49 @@
+# pardonai/dashboard/tests/test_stats.py
+"""Dashboard sayaç anlık görüntüsü: tek sorgu, önbellek ve yazımla düşme."""
+from django.db import connection, transaction
+from django.test import TestCase
+
+from pardonai.menu.models import Menu
+from pardonai.orders.models import Order
+from .. import counters, stats
+from .factories import business
+
+
+class DashboardStatsTests(TestCase):
+
+    def setUp(self):
+        stats.invalidate()
+        self.addCleanup(stats.invalidate)
+        biz = business(1)
+        Menu.objects.create(business=biz, name="A")
+        Order.objects.create(business=biz, order_number="O1", customer_name="-", customer_phone="0",
+                             total_amount=10, final_amount=10)
+
+    def test_counts_match_tables(self):
+        counts = stats.dashboard_counts()
+        self.assertEqual(set(counts), set(stats.DASHBOARD_KEYS))
+        self.assertEqual((counts["total_menus"], counts["active_menus"]), (1, 1))
+        self.assertEqual((counts["total_orders"], counts["pending_orders"]), (1, 1))
+        self.assertEqual(counts["total_goals"], 0)
+
+    def test_snapshot_is_one_query_then_cached(self):
+        counters.get(stats.COUNTER_KEYS)  # sayaç satırları var: canlı sayım yok
+        with self.assertNumQueries(1):
+            stats.snapshot()
+        with self.assertNumQueries(0):
+            stats.snapshot()
+
+    def test_writes_drop_snapshot_on_commit(self):
+        self.assertEqual(stats.dashboard_counts()["total_menus"], 1)
+        connection.run_on_commit.clear()  # setUp yazımları commit edilmiş sayılır: yeni transaction yeni küme açar
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Menu.objects.create(business=business(2), name="B")
+                # commit'ten önce eski sayıları gören bir okuyucu anlık görüntüyü yeniden doldurur
+                stats._snapshot.put(stats._KEY, {**stats.snapshot(), "total_menus": 1})
+        self.assertEqual(stats.dashboard_counts()["total_menus"], 2)
+
+    def test_api(self):
+        body = self.client.get("/api/dashboard/stats").json()
+        self.assertTrue(body["success"])
+        self.assertEqual(body["pending_orders"], 1)
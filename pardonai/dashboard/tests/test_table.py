@@ -0,0 +1,70 @@
+# pardonai/dashboard/tests/test_table.py
+"""/api/pareto/table: SQL keyset sayfaları tam agregasyonla birebir aynı."""
+from datetime import date
+
+from django.test import TestCase, override_settings
+
+from ..models import ProductMetric
+from ..pareto_cache import aggregate_cache
+from ..pareto_engine import ParetoEngine
+from ..rollup import rebuild_all
+from .factories import metric
+
+# eşit kârlar sayfa sınırına denk gelir: etiket sırası belirleyici
+PROFITS = {"Kahve": 90.0, "Ayran": 40.0, "Tost": 40.0, "Su": 40.0, "Çay": 15.0, "Simit": 10.0, "Zarar": -5.0}
+
+
+class ParetoTableTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        rows = []
+        for i, (name, profit) in enumerate(PROFITS.items()):
+            rows += [metric(i + 1, name, profit / 2, date(2025, 5, 1)), metric(i + 1, name, profit / 2, date(2025, 5, 2))]
+        ProductMetric.objects.bulk_create(rows)
+        rebuild_all()
+
+    def setUp(self):
+        aggregate_cache.clear()
+
+    def _walk(self, limit, **params):
+        rows, cursor = [], None
+        while True:
+            query = {"limit": limit, **params, **({"cursor": cursor} if cursor else {})}
+            body = self.client.get("/api/pareto/table", query).json()
+            self.assertTrue(body["success"], body)
+            self.assertEqual(body["count"], len(PROFITS))
+            self.assertLessEqual(len(body["rows"]), limit)
+            rows += body["rows"]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return rows
+
+    def _assert_pages(self):
+        pareto = self.client.get("/api/pareto").json()
+        engine = ParetoEngine(pareto["profit"])
+        for limit in (1, 2, 3, 100):
+            with self.subTest(limit=limit):
+                rows = self._walk(limit)
+                self.assertEqual([r["label"] for r in rows], ["Kahve", "Ayran", "Su", "Tost", "Çay", "Simit", "Zarar"])
+                self.assertEqual([r["label"] for r in rows], pareto["labels"])
+                self.assertEqual([r["cum_pct"] for r in rows], engine.cum_pct(2))
+                self.assertEqual([r["class"] for r in rows], engine.abc_labels(80, 95))
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_pages_match_full_aggregate(self):
+        self._assert_pages()
+
+    @override_settings(PARETO_USE_ROLLUP=True)
+    def test_rollup_pages_match_full_aggregate(self):
+        self._assert_pages()
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_page_is_two_queries(self):
+        first = self.client.get("/api/pareto/table", {"limit": 2}).json()
+        with self.assertNumQueries(3):  # veri sürümü + sayfa + toplamlar
+            body = self.client.get("/api/pareto/table", {"limit": 2, "cursor": first["next_cursor"]}).json()
+        self.assertEqual([r["label"] for r in body["rows"]], ["Su", "Tost"])
+
+    def test_bad_cursor(self):
+        self.assertEqual(self.client.get("/api/pareto/table", {"cursor": "%%%"}).status_code, 400)
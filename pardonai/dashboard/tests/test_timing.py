@@ -0,0 +1,131 @@
+# pardonai/dashboard/tests/test_timing.py
+"""Server-Timing: başlık ve log yalnızca ayar açıkken; sorgu sayısı gerçek sorgularla aynı."""
+import re
+from datetime import date
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .. import timing
+from ..models import ProductMetric
+from ..pareto_cache import invalidate_all
+from .factories import metric
+
+
+def parse(header):
+    """'db;dur=1.2;desc="3 queries", total;dur=4' -> {"db": (1.2, "3 queries"), "total": (4.0, None)}"""
+    out = {}
+    for part in header.split(", "):
+        m = re.fullmatch(r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', part)
+        out[m.group(1)] = (float(m.group(2)), m.group(3))
+    return out
+
+
+class RequestTimerTests(SimpleTestCase):
+
+    def test_phases_are_exclusive(self):
+        timer = timing.RequestTimer()
+        timer.push("compute")
+        timer.push("aggregate")
+        timer.pop()
+        timer.push("serialize")
+        timer.close()
+        self.assertEqual(set(timer.phases), {"compute", "aggregate", "serialize"})
+        self.assertLessEqual(sum(timer.phases.values()), timer.total())
+
+    def test_phase_is_noop_without_timer(self):
+        self.assertIsNone(timing.current())
+        self.assertIs(timing.phase("aggregate"), timing._NO_PHASE)
+
+
+class TimingApiMixin:
+
+    @classmethod
+    def setUpTestData(cls):
+        ProductMetric.objects.bulk_create([
+            metric(1, "Kahve", 100.0, date(2025, 6, 1)),
+            metric(2, "Çay", 40.0, date(2025, 6, 2)),
+        ])
+
+    def setUp(self):
+        invalidate_all()
+
+    def _get(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, params)
+            if resp.streaming:
+                b"".join(resp.streaming_content)
+        self.assertEqual(resp.status_code, 200)
+        return resp, len(ctx.captured_queries)
+
+
+@override_settings(PARETO_USE_ROLLUP=False, PARETO_SERVER_TIMING=False)
+class ServerTimingOffTests(TimingApiMixin, TestCase):
+
+    def test_no_header_or_log(self):
+        with self.assertNoLogs("pardonai.dashboard.timing"):
+            for url in ("/api/pareto", "/api/pareto/export"):
+                with self.subTest(url=url):
+                    resp, _ = self._get(url)
+                    self.assertFalse(resp.has_header("Server-Timing"))
+
+
+@override_settings(PARETO_USE_ROLLUP=False, PARETO_SERVER_TIMING=True, PARETO_TIMING_LOG_MIN_MS=0)
+class ServerTimingOnTests(TimingApiMixin, TestCase):
+
+    def test_header_counts_queries(self):
+        for url in ("/api/pareto", "/api/pareto/abc", "/api/pareto/bundle"):
+            with self.subTest(url=url):
+                invalidate_all()
+                with self.assertLogs("pardonai.dashboard.timing", "INFO") as logs:
+                    resp, queries = self._get(url)
+                metrics = parse(resp["Server-Timing"])
+                self.assertEqual(metrics["db"][1], f"{queries} queries")
+                self.assertGreater(queries, 0)
+                self.assertIn("compute", metrics)
+                self.assertIn("serialize", metrics)
+                phases = sum(dur for name, (dur, _) in metrics.items() if name not in ("db", "total"))
+                self.assertLessEqual(phases, metrics["total"][0] + 0.01)
+                record = logs.records[-1]
+                self.assertEqual((record.timing["path"], record.timing["queries"]), (url, queries))
+
+    def test_cached_request_counts_fewer_queries(self):
+        with self.assertLogs("pardonai.dashboard.timing", "INFO"):
+            first, _ = self._get("/api/pareto")
+            again, queries = self._get("/api/pareto")
+        self.assertEqual(parse(again["Server-Timing"])["db"][1], f"{queries} queries")
+        self.assertLess(queries, int(parse(first["Server-Timing"])["db"][1].split()[0]))
+
+    def test_not_modified(self):
+        with self.assertLogs("pardonai.dashboard.timing", "INFO") as logs:
+            etag = self.client.get("/api/pareto")["ETag"]
+            resp = self.client.get("/api/pareto", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(logs.records[-1].timing["status"], 304)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(parse(resp["Server-Timing"])["db"][1], "1 queries")
+
+    def test_streaming_logs_after_body(self):
+        with self.assertLogs("pardonai.dashboard.timing", "INFO") as logs:
+            resp, queries = self._get("/api/pareto/export")
+        self.assertIn("Server-Timing", resp)
+        data = logs.records[-1].timing
+        self.assertEqual(data["queries"], queries)
+        self.assertIn("stream_ms", data)
+
+    @override_settings(PARETO_TIMING_PREFIX="/api/dashboard/")
+    def test_prefix(self):
+        resp, _ = self._get("/api/pareto")
+        self.assertFalse(resp.has_header("Server-Timing"))
+
+    @override_settings(PARETO_TIMING_LOG_MIN_MS=60_000)
+    def test_slow_threshold_silences_log(self):
+        with self.assertNoLogs("pardonai.dashboard.timing"):
+            resp, _ = self._get("/api/pareto")
+        self.assertTrue(resp.has_header("Server-Timing"))
+
+    async def test_async_client(self):
+        with self.assertLogs("pardonai.dashboard.timing", "INFO"):
+            resp = await self.async_client.get("/api/pareto/topn")
+        self.assertEqual(resp.status_code, 200)
+        self.assertRegex(parse(resp["Server-Timing"])["db"][1], r"^[1-9]\d* queries$")
@@ -0,0 +1,173 @@
+# pardonai/dashboard/tests/test_whatif.py
+"""What-if: SQL GROUP BY + CASE sonucu, yerini aldığı satır bazlı Python döngüsüyle aynı olmalı."""
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from .. import pareto_engine
+from ..models import ProductMetric
+from ..pareto_engine import ParetoEngine, scenario_grid
+from ..pareto_cache import aggregate_cache
+from ..rollup import rebuild_all
+from .factories import metric
+
+DAYS = [date(2025, 4, d) for d in (1, 2, 3)]
+
+
+def python_whatif(groupby, selected, price_delta_pct, sales_uplift_pct, date_from=None, date_to=None):
+    """Eski views.pareto_whatif_api döngüsü: satır satır simülasyon, etiket bazında toplam, DESC."""
+    qs = ProductMetric.objects.all()
+    if date_from:
+        qs = qs.filter(ts__gte=date_from)
+    if date_to:
+        qs = qs.filter(ts__lte=date_to)
+    label_field = "product_id" if groupby == "id" else "product_name"
+    agg = {}
+    for r in qs.values(label_field, "cost", "sales_price", "sales"):
+        label = str(r[label_field])
+        price, sales = r["sales_price"], float(r["sales"])
+        if not selected or label in selected:
+            price *= 1.0 + price_delta_pct / 100.0
+            sales *= 1.0 + sales_uplift_pct / 100.0
+        agg[label] = agg.get(label, 0.0) + (price - r["cost"]) * sales
+    items = sorted(agg.items(), key=lambda x: x[1], reverse=True)
+    return [k for k, _ in items], [round(v, 2) for _, v in items]
+
+
+def create_rows():
+    ProductMetric.objects.bulk_create([
+        metric(1, "Kahve", 0, DAYS[0], sales=10, cost=20.0, price=45.0),
+        metric(1, "Kahve", 0, DAYS[1], sales=4, cost=20.0, price=40.0),
+        metric(2, "Çay", 0, DAYS[0], sales=30, cost=3.0, price=7.5),
+        metric(3, "Su", 0, DAYS[1], sales=50, cost=2.0, price=3.0),
+        metric(4, "Tost", 0, DAYS[2], sales=6, cost=35.0, price=30.0),   # zararına satış
+        metric(5, "Çay", 0, DAYS[2], sales=8, cost=4.0, price=9.0),     # aynı ad, farklı id
+    ])
+
+
+class WhatIfParityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_rows()
+        rebuild_all()
+
+    def setUp(self):
+        aggregate_cache.clear()  # ham ve rollup yolu aynı önbellek anahtarını paylaşır
+
+    def _api(self, groupby, selected, p, u, **dates):
+        params = {"groupby": groupby, "selected": ",".join(selected), "price_delta_pct": p, "sales_uplift_pct": u}
+        params.update({k: v.isoformat() for k, v in dates.items()})
+        body = self.client.get("/api/pareto/whatif", params).json()
+        self.assertTrue(body["success"], body)
+        return body
+
+    def _assert_parity(self):
+        cases = [
+            ("name", [], 0, 0),                    # sıfır fark: temel kâr
+            ("name", [], 10, 5),                   # seçim yok: tümü simüle
+            ("name", [], -20, -50),                # negatif fark
+            ("name", ["Çay", "Tost"], 15, -10),
+            ("name", ["Yok"], 50, 50),             # eşleşmeyen seçim: hiçbiri simüle edilmez
+            ("id", ["2", "4"], -20, 30),
+            ("id", [], 0, -100),                   # satış sıfırlanır
+        ]
+        for groupby, selected, p, u in cases:
+            with self.subTest(groupby=groupby, selected=selected, p=p, u=u):
+                body = self._api(groupby, selected, p, u)
+                labels, profits = python_whatif(groupby, set(selected), p, u)
+                self.assertEqual(sorted(body["labels"]), sorted(labels))
+                got = dict(zip(body["labels"], body["profit"]))
+                for label, profit in zip(labels, profits):
+                    self.assertAlmostEqual(got[label], profit, places=2)
+                self.assertEqual(body["profit"], sorted(body["profit"], reverse=True))
+                self.assertAlmostEqual(body["sum_profit"], sum(profits), places=2)
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_raw_matches_python(self):
+        self._assert_parity()
+
+    @override_settings(PARETO_USE_ROLLUP=True)
+    def test_rollup_matches_python(self):
+        self._assert_parity()
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_date_range(self):
+        body = self._api("name", ["Kahve"], 10, 10, date_from=DAYS[1], date_to=DAYS[1])
+        labels, profits = python_whatif("name", {"Kahve"}, 10, 10, DAYS[1], DAYS[1])
+        self.assertEqual(body["labels"], labels)
+        self.assertEqual(body["profit"], profits)
+
+    @override_settings(PARETO_USE_ROLLUP=False)
+    def test_empty_range(self):
+        body = self._api("name", [], 10, 10, date_from=date(2024, 1, 1), date_to=date(2024, 1, 31))
+        self.assertEqual((body["labels"], body["profit"], body["sum_profit"]), ([], [], 0.0))
+
+
+@override_settings(PARETO_USE_ROLLUP=False)
+class WhatIfGridTests(TestCase):
+    """Izgaradaki her senaryo tekil what-if isteğinin (ve Python döngüsünün) özetiyle aynı."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_rows()
+
+    def setUp(self):
+        aggregate_cache.clear()
+
+    def _grid(self, **params):
+        resp = self.client.get("/api/pareto/whatif/grid", params)
+        body = resp.json()
+        self.assertEqual(resp.status_code, 200, body)
+        return body
+
+    def test_scenarios_match_single_requests(self):
+        prices, uplifts = [-10.0, 0.0, 15.0], [0.0, 25.0]
+        body = self._grid(price_deltas="-10,0,15", uplifts="0,25", selected="Çay,Tost", threshold="70")
+        self.assertEqual(body["selected_count"], 2)
+        # satır öncelikli: fiyat dış döngü
+        order = [(s["price_delta_pct"], s["sales_uplift_pct"]) for s in body["scenarios"]]
+        self.assertEqual(order, [(p, u) for p in prices for u in uplifts])
+        for scenario in body["scenarios"]:
+            p, u = scenario["price_delta_pct"], scenario["sales_uplift_pct"]
+            with self.subTest(p=p, u=u):
+                _, profits = python_whatif("name", {"Çay", "Tost"}, p, u)
+                engine = ParetoEngine(sorted(profits, reverse=True))
+                self.assertAlmostEqual(scenario["sum_profit"], sum(profits), places=1)
+                self.assertEqual(scenario["idx_threshold"], engine.threshold_index(70))
+                labels = engine.abc_labels(70, 95)
+                self.assertEqual(scenario["counts"], {c: labels.count(c) for c in "ABC"})
+                self.assertAlmostEqual(sum(scenario["shares"].values()), 100.0, places=1)
+
+                single = self.client.get("/api/pareto/whatif", {
+                    "selected": "Çay,Tost", "price_delta_pct": p, "sales_uplift_pct": u,
+                }).json()
+                self.assertAlmostEqual(scenario["sum_profit"], single["sum_profit"], places=1)
+
+    def test_class_selection(self):
+        body = self._grid(classes="A", uplifts="10")
+        base = ParetoEngine(sorted(python_whatif("name", set(), 0, 0)[1], reverse=True)).abc_labels()
+        self.assertEqual(body["selected_count"], base.count("A"))
+
+    def test_blocks_and_fallback_agree(self):
+        revenue, cogs = [450.0, 160.0, 225.0, 150.0, 180.0], [200.0, 80.0, 90.0, 100.0, 210.0]
+        selected = [True, False, True, True, False]
+        args = (revenue, cogs, selected, [-20.0, 0.0, 5.0, 30.0], [-50.0, 0.0, 40.0])
+        whole = scenario_grid(*args)
+        with mock.patch.object(pareto_engine, "GRID_BLOCK_ELEMENTS", 7):  # blok başına tek senaryo
+            self.assertEqual(scenario_grid(*args), whole)
+        with mock.patch.object(pareto_engine, "np", None):
+            fallback = scenario_grid(*args)
+        for got, want in zip(fallback, whole):
+            self.assertEqual((got["idx_threshold"], got["counts"]), (want["idx_threshold"], want["counts"]))
+            self.assertAlmostEqual(got["sum_profit"], want["sum_profit"], places=6)
+            for cls in "ABC":
+                self.assertAlmostEqual(got["shares"][cls], want["shares"][cls], places=6)
+
+    def test_scenario_limit(self):
+        many = ",".join(str(i) for i in range(60))
+        resp = self.client.get("/api/pareto/whatif/grid", {"price_deltas": many, "uplifts": many})
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(resp.json()["success"])
+        self.assertTrue(resp.json()["error"].startswith("3600 scenarios (max "))
@@ -0,0 +1,248 @@
+# pardonai/dashboard/timing.py
+"""
+İstek başına sorgu ve süre ölçümü (Server-Timing + yapılandırılmış log).
+
+PARETO_SERVER_TIMING=True iken ServerTimingMiddleware PARETO_TIMING_PREFIX
+(varsayılan "/api/") altındaki istekleri ölçer:
+  - db: connection.execute_wrapper ile sorgu sayısı ve toplam DB süresi
+  - adlandırılmış fazlar: view'lar `with phase("aggregate"):` ile işaretler.
+    Fazlar dışlayıcıdır: iç içe bir faz başlayınca dıştaki durur, böylece
+    aggregate / compute / serialize toplamı view süresini aşmaz. View'un
+    hiçbir faza girmeyen kısmı "compute"tur. DB süresi fazlarla örtüşür
+    (çoğunlukla aggregate içindedir).
+  - total: middleware'den geçen toplam süre
+
+Sonuçlar "Server-Timing" başlığında ve pardonai.dashboard.timing logger'ında
+(key=value satırı + extra={"timing": {...}}) yayınlanır. Akışlı yanıtlarda
+(CSV export) DB işi gövde okunurken sürer; başlık erken gider, log satırı
+akış bittiğinde yazılır.
+
+Kapalıyken middleware yüklenmez (MiddlewareNotUsed) ve phase() paylaşılan bir
+no-op döner; maliyet tek bir ContextVar okumasıdır.
+
+ASGI'de middleware async çalışır (senkron bir middleware zinciri tek iş
+parçacığına bağlardı). Sorgular event loop'ta değil aio.run_sync'in iş
+parçacıklarında koşar; DB sayacını orada aio bağlar. aio.gather ile
+eşzamanlı koşan alt sorgular faz açmaz (detached), toplam süreleri
+"aggregate" fazına yazılır.
+"""
+from __future__ import annotations
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger("pardonai.dashboard.timing")
+
+_current: ContextVar[Optional["RequestTimer"]] = ContextVar("pardonai_request_timer", default=None)
+
+
+class RequestTimer:
+    """Bir isteğin DB sayaçları ve dışlayıcı faz süreleri."""
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.phases: Dict[str, float] = {}
+        self._stack: List[List] = []  # [ad, son başlama anı]
+        self._db_lock = Lock()  # aio.gather: aynı istekte birden çok iş parçacığı
+
+    # ---------------- DB ----------------
+    def execute_wrapper(self, execute, sql, params, many, context):
+        t = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - t
+            with self._db_lock:
+                self.db += elapsed
+                self.queries += 1
+
+    # ---------------- fazlar ----------------
+    def push(self, name: str) -> None:
+        now = perf_counter()
+        if self._stack:
+            self._charge(self._stack[-1], now)
+        self._stack.append([name, now])
+
+    def pop(self) -> None:
+        now = perf_counter()
+        self._charge(self._stack.pop(), now)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def close(self) -> None:
+        while self._stack:
+            self.pop()
+
+    def _charge(self, frame, now) -> None:
+        self.phases[frame[0]] = self.phases.get(frame[0], 0.0) + (now - frame[1])
+
+    # ---------------- çıktı ----------------
+    def total(self) -> float:
+        return perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        parts = [f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"']
+        parts += [f"{name};dur={sec * 1000:.2f}" for name, sec in self.phases.items()]
+        parts.append(f"total;dur={self.total() * 1000:.2f}")
+        return ", ".join(parts)
+
+    def as_dict(self) -> Dict[str, float]:
+        out = {"total_ms": round(self.total() * 1000, 2), "db_ms": round(self.db * 1000, 2), "queries": self.queries}
+        out.update({f"{name}_ms": round(sec * 1000, 2) for name, sec in self.phases.items()})
+        return out
+
+
+class _Phase:
+    __slots__ = ("name", "timer")
+
+    def __init__(self, name: str, timer: RequestTimer):
+        self.name = name
+        self.timer = timer
+
+    def __enter__(self):
+        self.timer.push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.pop()
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """Ölçüm açıksa adlandırılmış faz; değilse no-op."""
+    timer = _current.get()
+    return _NO_PHASE if timer is None else _Phase(name, timer)
+
+
+def current() -> Optional[RequestTimer]:
+    return _current.get()
+
+
+@contextmanager
+def detached():
+    """Blok içinde faz kaydı yok (eşzamanlı iş parçacıkları faz yığınını paylaşamaz)."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class ServerTimingMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PARETO_SERVER_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = getattr(settings, "PARETO_TIMING_PREFIX", "/api/")
+        self.log_min_ms = getattr(settings, "PARETO_TIMING_LOG_MIN_MS", 0)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith(self.prefix):
+            return self.get_response(request)
+
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            with connection.execute_wrapper(timer.execute_wrapper):
+                response = self.get_response(request)
+        finally:
+            timer.close()
+            _current.reset(token)
+
+        response["Server-Timing"] = timer.server_timing()
+        if response.streaming:
+            response.streaming_content = self._stream(request, response, timer, response.streaming_content)
+        else:
+            self._log(request, response, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not request.path.startswith(self.prefix):
+            return await self.get_response(request)
+
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            timer.close()
+            _current.reset(token)
+
+        response["Server-Timing"] = timer.server_timing()
+        if response.streaming and response.is_async:
+            response.streaming_content = self._astream(request, response, timer, response.streaming_content)
+        elif response.streaming:
+            response.streaming_content = self._stream(request, response, timer, response.streaming_content)
+        else:
+            self._log(request, response, timer)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = _current.get()
+        if timer is not None:
+            timer.push("compute")
+        return None
+
+    def _stream(self, request, response, timer, content):
+        # üreteç farklı bir bağlamda kapatılabilir; token yerine doğrudan set
+        _current.set(timer)
+        try:
+            with connection.execute_wrapper(timer.execute_wrapper):
+                timer.push("stream")
+                yield from content
+        finally:
+            timer.close()
+            _current.set(None)
+            self._log(request, response, timer)
+
+    async def _astream(self, request, response, timer, content):
+        _current.set(timer)
+        try:
+            timer.push("stream")
+            async for chunk in content:
+                yield chunk
+        finally:
+            timer.close()
+            _current.set(None)
+            self._log(request, response, timer)
+
+    def _log(self, request, response, timer) -> None:
+        data = timer.as_dict()
+        if data["total_ms"] < self.log_min_ms:
+            return
+        fields = " ".join(f"{k}={v}" for k, v in data.items())
+        logger.info(
+            "%s %s status=%s %s", request.method, request.path, response.status_code, fields,
+            extra={"timing": {"method": request.method, "path": request.path,
+                              "status": response.status_code, **data}},
+        )
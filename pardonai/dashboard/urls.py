@@ -1,8 +1,19 @@
+from django.conf import settings
 from django.urls import path
 from . import views
+from . import views_pareto
 
 app_name = 'dashboard'
 
+
+def _api(view):
+    """DASHBOARD_ASYNC_VIEWS=True (ASGI dağıtımı) iken view'un async karşılığı."""
+    if getattr(settings, "DASHBOARD_ASYNC_VIEWS", False):
+        from .views_async import ASYNC_VIEWS
+        return ASYNC_VIEWS.get(view, view)
+    return view
+
+
 urlpatterns = [
     path("", views.dashboard_page, name="dashboard_page"),  # Ana sayfa
     path("dashboard/", views.dashboard_page, name="dashboard_page"),
@@ -10,8 +21,20 @@ urlpatterns = [
     path("pareto/", views.pareto_page, name="pareto_page"),
 
     # APIs
-    path("api/pareto", views.pareto_api, name="pareto_api"),
-    path("api/pareto/topn", views.pareto_topn_api, name="pareto_topn_api"),
-    path("api/pareto/export", views.pareto_export_csv, name="pareto_export_csv"),
-    path("api/pareto/whatif", views.pareto_whatif_api, name="pareto_whatif_api"),
+    path("api/dashboard/stats", _api(views.dashboard_stats_api), name="dashboard_stats_api"),
+    path("api/pareto", _api(views.pareto_api), name="pareto_api"),
+    path("api/pareto/topn", _api(views.pareto_topn_api), name="pareto_topn_api"),
+    path("api/pareto/export", _api(views.pareto_export_csv), name="pareto_export_csv"),
+    path("api/pareto/export/raw", _api(views_pareto.pareto_export_raw), name="pareto_export_raw"),
+    path("api/pareto/whatif", _api(views.pareto_whatif_api), name="pareto_whatif_api"),
+    path("api/pareto/abc", _api(views_pareto.pareto_abc), name="pareto_abc"),
+    path("api/pareto/lorenz", _api(views_pareto.pareto_lorenz), name="pareto_lorenz"),
+    path("api/pareto/scatter", _api(views_pareto.pareto_scatter), name="pareto_scatter"),
+    path("api/pareto/hist", _api(views_pareto.pareto_hist), name="pareto_hist"),
+    path("api/pareto/treemap", _api(views_pareto.pareto_treemap), name="pareto_treemap"),
+    path("api/pareto/whatif/grid", _api(views_pareto.pareto_whatif_grid), name="pareto_whatif_grid"),
+    path("api/pareto/bundle", _api(views_pareto.pareto_bundle), name="pareto_bundle"),
+    path("api/pareto/table", _api(views_pareto.pareto_table), name="pareto_table"),
+    path("api/pareto/drift", _api(views_pareto.pareto_drift), name="pareto_drift"),
+    path("api/pareto/cube", _api(views_pareto.pareto_cube), name="pareto_cube"),
 ]
@@ -0,0 +1,112 @@
+# pardonai/dashboard/views_async.py
+"""
+Dashboard ve pareto API'lerinin async (ASGI) karşılıkları.
+
+DASHBOARD_ASYNC_VIEWS=True iken urls.py bu view'ları bağlar (ASYNC_VIEWS:
+senkron view -> async karşılığı); URL'ler, parametreler ve yanıtlar aynıdır.
+Uvicorn worker'ında istek DB'yi beklerken event loop başka isteklere geçer;
+bir sürecin aynı anda taşıyabildiği istek sayısı DASHBOARD_ASYNC_THREADS'e
+kadar çıkar (bkz. aio, gunicorn_asgi.conf.py).
+
+  - yalnızca bundle ve table alt sorgularını dağıtır (aio.gather): bundle'da
+    agregasyon ve histogram, table'da sayfa ve toplamlar sorgusu aynı anda
+  - diğer endpoint'ler: senkron gövde tek parça aio.run_sync ile havuzda
+  - dashboard/stats: stats anlık görüntüsü (soğukken tek sorgu) havuzda
+  - export'lar: cursor akışı tamponlanmadan (aio.iter_sync)
+WSGI altında da çalışırlar ama her istek async_to_sync üzerinden geçer;
+senkron dağıtımda ayar kapalı kalmalıdır.
+"""
+from __future__ import annotations
+from functools import partial, wraps
+import inspect
+
+from . import aio, stats, views, views_pareto as vp
+from .pareto_query import filtered_qs
+from .conditional import conditional_api
+from .fastjson import FastJsonResponse
+
+
+def _offload(view):
+    """Senkron view'un (dekoratörsüz) gövdesini havuzda çalıştıran async view."""
+    body = inspect.unwrap(view)
+
+    @wraps(body)
+    async def async_view(request, *args, **kwargs):
+        response = await aio.run_sync(body, request, *args, **kwargs)
+        if response.streaming and not response.is_async:
+            response.streaming_content = aio.iter_sync(response.streaming_content)
+        return response
+
+    return aio.require_GET(conditional_api(async_view))
+
+
+# --------------------- Bundle ---------------------
+@aio.require_GET
+@conditional_api
+async def pareto_bundle(request):
+    """/api/pareto/bundle: agregasyon ve hist'in kendi sorgusu aynı anda."""
+    try:
+        names = vp._bundle_parts(request)
+        calls = {}
+        if any(name != "hist" for name in names):
+            calls["agg"] = partial(filtered_qs, request)
+        if "hist" in names:
+            calls["hist"] = partial(vp._hist_payload, request)
+        results = dict(zip(calls, await aio.gather(*calls.values())))
+        agg, hist = results.get("agg"), results.get("hist")
+
+        def build():
+            parts = {name: hist if name == "hist" else vp.PAYLOAD_BUILDERS[name](request, agg) for name in names}
+            return FastJsonResponse({"success": True, "parts": parts})
+
+        return await aio.run_sync(build)
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+
+# --------------------- Tablo ---------------------
+@aio.require_GET
+@conditional_api
+async def pareto_table(request):
+    """/api/pareto/table: sayfa ve toplamlar (sayı, toplam, imleç öncesi) sorguları aynı anda."""
+    try:
+        limit, after, thr, thr_b = vp._table_args(request)
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    try:
+        queries = await aio.run_sync(vp._table_queries, request, limit, after)  # rollup güncelliği sorgusu
+        rows, totals = await aio.gather(*queries)
+        return await aio.run_sync(vp._table_response, request, rows, totals, limit, thr, thr_b)
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+
+# --------------------- Dashboard sayaçları ---------------------
+@aio.require_GET
+async def dashboard_stats_api(request):
+    """/api/dashboard/stats: önbellekteki sayaçlar; soğukken tek sorgu havuzda."""
+    try:
+        counts = await aio.run_sync(stats.dashboard_counts)
+        return FastJsonResponse({"success": True, **counts})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=500)
+
+
+ASYNC_VIEWS = {
+    views.dashboard_stats_api: dashboard_stats_api,
+    views.pareto_api: _offload(views.pareto_api),
+    views.pareto_topn_api: _offload(views.pareto_topn_api),
+    views.pareto_export_csv: _offload(views.pareto_export_csv),
+    views.pareto_whatif_api: _offload(views.pareto_whatif_api),
+    vp.pareto_export_raw: _offload(vp.pareto_export_raw),
+    vp.pareto_abc: _offload(vp.pareto_abc),
+    vp.pareto_lorenz: _offload(vp.pareto_lorenz),
+    vp.pareto_scatter: _offload(vp.pareto_scatter),
+    vp.pareto_hist: _offload(vp.pareto_hist),
+    vp.pareto_treemap: _offload(vp.pareto_treemap),
+    vp.pareto_whatif_grid: _offload(vp.pareto_whatif_grid),
+    vp.pareto_bundle: pareto_bundle,
+    vp.pareto_table: pareto_table,
+    vp.pareto_drift: _offload(vp.pareto_drift),
+    vp.pareto_cube: _offload(vp.pareto_cube),
+}
@@ -0,0 +1,633 @@
+# pardonai/dashboard/views_pareto.py
+from __future__ import annotations
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from math import fsum
+import base64
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from django.db.models import Count, Q, Sum
+from django.views.decorators.http import require_GET
+from django.utils.dateparse import parse_date
+
+from .models import ProductMetricDaily
+from .pareto_engine import DRIFT_STATES, ParetoEngine, bucket_drift, scenario_grid
+from .pareto_cache import aggregate_cache, make_key
+from .pareto_query import (
+    aggregate_row, filtered_qs, fold_long_tail, get_params, get_product_ids, grouped_source, raw_filtered, safe_float,
+    whatif_components,
+)
+from .exports import RAW_EXPORT_CHUNK_SIZE, Echo, binary_export, cursor_chunks, export_format
+from .histogram import sql_histogram
+from .fastjson import FastJsonResponse, columns, wants_columnar
+from .timing import phase
+from . import abc_snapshot, arrow_export, cube as cube_mod
+from .conditional import conditional_api
+
+TABLE_COLUMNS = ["label", "sum_profit", "sum_click", "sum_sales", "avg_cost", "avg_price", "avg_unit_profit", "avg_ppc"]
+TABLE_PAGE_SIZE = 100
+TABLE_PAGE_MAX = 1000
+LORENZ_DEFAULT_POINTS = 500  # Lorenz eğrisi varsayılan en fazla nokta (Gini yine tam vektörden)
+LORENZ_MAX_POINTS = 5000
+HIST_MAX_BINS = 200
+DRIFT_BUCKETS = cube_mod.BUCKETS
+DRIFT_MAX_BUCKETS = 400
+CUBE_MAX_CELLS = 500_000  # en ince kümedeki (ürün x kova) hücre sınırı
+
+# --------------------- yardımcılar ---------------------
+# paylaşılan sorgu / dışa aktarım yardımcıları: pareto_query.py, exports.py
+def _cube(request, dims, bucket: Optional[str]) -> cube_mod.Cube:
+    """
+    Filtrelenmiş küp (dims üzerindeki tüm grouping set'ler). Aynı filtre, dims
+    ve kova için drift, /api/pareto/cube ve dilimleri tek sorguyu paylaşır.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    product_ids = get_product_ids(request)
+    bucket = bucket if "bucket" in dims else None
+    cache_key = make_key(
+        date_from, date_to, search, f"{groupby}:cube:{','.join(dims)}:{bucket}", product_ids, request,
+    )
+
+    def compute():
+        base, key, _, _ = grouped_source(date_from, date_to, search, groupby, product_ids)
+        day_field = "day" if base.model is ProductMetricDaily else "ts"
+        return cube_mod.build_cube(base, key, day_field, dims, cube_mod.all_sets(dims), bucket, CUBE_MAX_CELLS)
+
+    with phase("aggregate"):
+        return aggregate_cache.get_or_compute(cache_key, compute)
+
+def _float_list(raw: str) -> List[float]:
+    return [float(x) for x in (raw or "").split(",") if x.strip()]
+
+# --------------------- payload üreticileri ---------------------
+# Her grafik, filtered_qs'in döndürdüğü tek bir agregasyon sonucundan
+# (labels, profit, click, sales, rows) türetilir. Tekil endpoint'ler ve
+# bundle endpoint'i aynı fonksiyonları kullanır.
+
+def _pareto_payload(request, agg) -> Dict[str, Any]:
+    labels, profit, click, sales, rows = agg
+    engine = ParetoEngine(profit)
+    threshold = int(request.GET.get("threshold") or 80)
+    idx = engine.threshold_index(threshold)
+    if idx < 0:
+        idx = engine.n - 1
+    labels, profit, cum_pct, idx, others = fold_long_tail(request, labels, profit, engine.cum_pct(2), idx)
+    payload = {
+        "labels": labels,
+        "profit": profit,
+        "cum_pct": cum_pct,
+        "sum_profit": round(engine.total, 2),
+        "idx_threshold": idx,
+        "table": {"columns": TABLE_COLUMNS, "rows": rows},
+    }
+    if others is not None:
+        # kovalanmış yanıtta tablo ayrı ve sayfalı: /api/pareto/table
+        payload["others"] = others
+        payload["table"] = {"columns": TABLE_COLUMNS, "rows": [], "paginated": True}
+    if wants_columnar(request):
+        payload["table"]["rows"] = columns(payload["table"]["rows"], TABLE_COLUMNS)
+    return payload
+
+def _topn_payload(request, agg) -> Dict[str, Any]:
+    labels, profit, *_ = agg
+    n = int(request.GET.get("n") or 10)
+    labels = labels[:n]
+    profit = profit[:n]
+    total = fsum(profit) or 1.0
+    share = [round(p/total*100.0, 2) for p in profit]
+    return {"labels": labels, "profit": profit, "share_pct": share}
+
+def _abc_snapshot(request) -> Optional[abc_snapshot.Snapshot]:
+    """
+    Varsayılan görünüm (arama / ürün filtresi yok, eşikler 80/95, tarih yok ya
+    da tam takvim ayı) için güncel snapshot; özel filtrelerde None.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    thresholds = (int(request.GET.get("threshold") or 80), int(request.GET.get("threshold_b") or 95))
+    if search or get_product_ids(request) or thresholds != abc_snapshot.THRESHOLDS:
+        return None
+    period = abc_snapshot.period_for(date_from, date_to)
+    if period is None:
+        return None
+    with phase("aggregate"):
+        return abc_snapshot.load(groupby, period, request)
+
+def _abc_classes(request, agg):
+    """(labels, profit, cum_pct, classes, thr, thr_b); agg bir snapshot ise hazır sınıflar."""
+    thr = int(request.GET.get("threshold") or 80)
+    thr_b = int(request.GET.get("threshold_b") or 95)
+    if isinstance(agg, abc_snapshot.Snapshot):
+        return agg.labels, agg.profit, agg.cum_pct, agg.classes, thr, thr_b
+    labels, profit, *_ = agg
+    engine = ParetoEngine(profit)
+    return labels, profit, engine.cum_pct(2), engine.abc_labels(thr, thr_b), thr, thr_b
+
+def _abc_payload(request, agg) -> Dict[str, Any]:
+    """
+    A: ilk %T (default 80)
+    B: sonraki %15 (80-95)
+    C: kalan
+    format=columnar: items = {"label", "profit", "cum_pct", "class"} dizileri.
+    agg, _abc_snapshot'ın döndürdüğü snapshot da olabilir.
+    """
+    labels, profit, cum, classes, thr, thr_b = _abc_classes(request, agg)
+    if wants_columnar(request):
+        out = {"label": list(labels), "profit": list(profit), "cum_pct": cum, "class": classes}
+    else:
+        out = [
+            {"label": lab, "profit": p, "cum_pct": c, "class": cls}
+            for lab, p, c, cls in zip(labels, profit, cum, classes)
+        ]
+    summary = ParetoEngine(profit).abc_summary(thr, thr_b, classes)
+
+    return {"items": out, "summary": summary, "thresholds": {"A": thr, "B": thr_b}}
+
+def _lorenz_payload(request, agg) -> Dict[str, Any]:
+    """
+    Lorenz eğrisi (ürün sayısı birikimli payı vs kâr birikimli payı) ve Gini katsayısı.
+      points=500 (3..5000): en fazla nokta sayısı, sample=lttb|quantile
+    Yük ürün sayısından bağımsız sınırlıdır; Gini tam vektörden hesaplanır.
+    """
+    labels, profit, *_ = agg
+    points = int(safe_float(request.GET.get("points"), LORENZ_DEFAULT_POINTS))
+    points = max(3, min(points, LORENZ_MAX_POINTS))
+    method = "quantile" if (request.GET.get("sample") or "").lower() == "quantile" else "lttb"
+    x, y, gini = ParetoEngine(profit).lorenz(points, method)
+    return {"x": x, "y": y, "gini": round(gini, 4), "n": len(profit), "sample": method}
+
+def _scatter_payload(request, agg) -> Dict[str, Any]:
+    """
+    Çeşitli saçılım grafikleri:
+      - click vs profit
+      - sales vs profit
+      - profit_per_click vs click (ortalama)
+      - unit_profit vs sales (ortalama)
+    format=columnar: {"labels": [...], "sets": {ad: {"x": [...], "y": [...]}}};
+    etiketler tüm setlerde ortaktır ve bir kez gönderilir.
+    """
+    labels, profit, clicks, sales, rows = agg
+    # ortalamalar tabloda
+    avg_ppc = [r["avg_ppc"] for r in rows]
+    avg_unit = [r["avg_unit_profit"] for r in rows]
+
+    if wants_columnar(request):
+        return {
+            "labels": list(labels),
+            "sets": {
+                "click_profit": {"x": clicks, "y": profit},
+                "sales_profit": {"x": sales, "y": profit},
+                "ppc_click":    {"x": avg_ppc, "y": clicks},
+                "unit_sales":   {"x": avg_unit, "y": sales},
+            },
+        }
+
+    sets = {
+        "click_profit": [{"x": int(c), "y": float(p), "label": lab} for lab, c, p in zip(labels, clicks, profit)],
+        "sales_profit": [{"x": int(s), "y": float(p), "label": lab} for lab, s, p in zip(labels, sales, profit)],
+        "ppc_click":    [{"x": float(ap), "y": int(c), "label": lab} for lab, ap, c in zip(labels, avg_ppc, clicks)],
+        "unit_sales":   [{"x": float(au), "y": int(s), "label": lab} for lab, au, s in zip(labels, avg_unit, sales)],
+    }
+    return {"sets": sets}
+
+def _hist_payload(request, agg=None) -> Dict[str, Any]:
+    """
+    Histogram: profit_per_click (ortalama) ve unit_profit (ortalama)
+      bins=10 (1..200), scale=linear|log, binning=width|quantile
+    Kovalama veritabanında yapılır (histogram.py); yalnızca sayılar ve kenarlar
+    taşınır, agg kullanılmaz. Sonuç agregasyon önbelleğinde aynı filtre
+    anahtarıyla tutulur, böylece ProductMetric yazımları onu da düşürür.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    product_ids = get_product_ids(request)
+    bins = max(1, min(int(safe_float(request.GET.get("bins"), 10)), HIST_MAX_BINS))
+    scale = "log" if (request.GET.get("scale") or "").lower() == "log" else "linear"
+    binning = "quantile" if (request.GET.get("binning") or "").lower() == "quantile" else "width"
+
+    def compute():
+        base, key, annotations, _ = grouped_source(date_from, date_to, search, groupby, product_ids)
+        grouped = base.values(key).annotate(
+            avg_ppc=annotations["avg_ppc"], avg_unit_profit=annotations["avg_unit_profit"],
+        ).order_by()
+        opts = dict(bins=bins, scale=scale, quantile=binning == "quantile")
+        return {
+            "ppc": sql_histogram(grouped, "avg_ppc", **opts),
+            "unit": sql_histogram(grouped, "avg_unit_profit", **opts),
+        }
+
+    cache_key = make_key(date_from, date_to, search, f"{groupby}:hist:{bins}:{scale}:{binning}", product_ids, request)
+    with phase("aggregate"):
+        hist = aggregate_cache.get_or_compute(cache_key, compute)
+    return {**hist, "scale": scale, "binning": binning}
+
+def _treemap_payload(request, agg) -> Dict[str, Any]:
+    """
+    Treemap için hiyerarşik çıktı. Üst düzeyde ABC sınıfı, altında ürünler.
+    format=columnar: düz name / value / class dizileri.
+    """
+    labels, profit, _cum, classes, _thr, _thr_b = _abc_classes(request, agg)
+    if wants_columnar(request):
+        # düz liste: istemci sınıfa göre gruplar
+        return {"name": [str(l) for l in labels], "value": [round(float(p), 2) for p in profit], "class": classes}
+
+    nodes: Dict[str, List[Dict[str, Any]]] = {"A": [], "B": [], "C": []}
+    for lab, p, cls in zip(labels, profit, classes):
+        nodes[cls].append({"name": str(lab), "value": round(float(p), 2)})
+
+    data = [{"name": k, "children": v} for k, v in nodes.items()]
+    return {"root": {"name": "ABC", "children": data}}
+
+# bundle'da kullanılabilecek parçalar (parts=... ile seçilir)
+PAYLOAD_BUILDERS = {
+    "pareto": _pareto_payload,
+    "abc": _abc_payload,
+    "lorenz": _lorenz_payload,
+    "topn": _topn_payload,
+    "scatter": _scatter_payload,
+    "hist": _hist_payload,
+    "treemap": _treemap_payload,
+}
+
+# --------------------- ABC sınıflandırma ---------------------
+@require_GET
+@conditional_api
+def pareto_abc(request):
+    try:
+        agg = _abc_snapshot(request) or filtered_qs(request)
+        return FastJsonResponse({"success": True, **_abc_payload(request, agg)})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Lorenz + Gini ---------------------
+@require_GET
+@conditional_api
+def pareto_lorenz(request):
+    try:
+        agg = filtered_qs(request)
+        return FastJsonResponse({"success": True, **_lorenz_payload(request, agg)})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Scatter paketleri ---------------------
+@require_GET
+@conditional_api
+def pareto_scatter(request):
+    try:
+        agg = filtered_qs(request)
+        return FastJsonResponse({"success": True, **_scatter_payload(request, agg)})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Histogram ---------------------
+@require_GET
+@conditional_api
+def pareto_hist(request):
+    try:
+        return FastJsonResponse({"success": True, **_hist_payload(request)})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Treemap (ABC hiyerarşi) ---------------------
+@require_GET
+@conditional_api
+def pareto_treemap(request):
+    try:
+        agg = _abc_snapshot(request) or filtered_qs(request)
+        return FastJsonResponse({"success": True, **_treemap_payload(request, agg)})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Bundle ---------------------
+def _bundle_parts(request) -> List[str]:
+    """parts=... (boşsa hepsi); bilinmeyen parça ValueError."""
+    requested = [p.strip().lower() for p in (request.GET.get("parts") or "").split(",") if p.strip()]
+    unknown = [p for p in requested if p not in PAYLOAD_BUILDERS]
+    if unknown:
+        raise ValueError(f"unknown parts: {', '.join(unknown)}")
+    return requested or list(PAYLOAD_BUILDERS)
+
+@require_GET
+@conditional_api
+def pareto_bundle(request):
+    """
+    Tüm grafik verilerini tek agregasyondan üretir.
+      parts=pareto,abc,lorenz,topn,scatter,hist,treemap (boşsa hepsi)
+    Yanıt: {"success": true, "parts": {"pareto": {...}, "abc": {...}, ...}}
+    format=columnar her parçaya uygulanır (tablo, abc, scatter, treemap).
+    """
+    try:
+        names = _bundle_parts(request)
+        agg = filtered_qs(request)  # tek GROUP BY
+        parts = {name: PAYLOAD_BUILDERS[name](request, agg) for name in names}
+        return FastJsonResponse({"success": True, "parts": parts})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Tablo (keyset sayfalama) ---------------------
+def _encode_cursor(row: Dict[str, Any]) -> str:
+    raw = json.dumps([row["sum_profit"], row["label"]], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Optional[Tuple[float, Any]]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        profit, label = json.loads(raw)
+        return float(profit), label
+    except Exception:
+        raise ValueError("invalid cursor")
+
+def _keyset_after(after: Tuple[float, Any], key: str) -> Q:
+    """(sum_profit DESC, label ASC) sırasında after'dan sonraki gruplar (HAVING)."""
+    profit, label = after
+    return Q(sum_profit__lt=profit) | Q(sum_profit=profit, **{f"{key}__gt": label})
+
+def _table_args(request) -> Tuple[int, Optional[Tuple[float, Any]], int, int]:
+    """(limit, imleç, threshold, threshold_b); geçersiz değerde ValueError."""
+    limit = max(1, min(int(safe_float(request.GET.get("limit"), TABLE_PAGE_SIZE)), TABLE_PAGE_MAX))
+    after = _decode_cursor((request.GET.get("cursor") or "").strip())
+    thr = int(request.GET.get("threshold") or 80)
+    thr_b = int(request.GET.get("threshold_b") or 95)
+    return limit, after, thr, thr_b
+
+def _table_queries(request, limit: int, after) -> Tuple[Callable[[], List[Dict[str, Any]]], Callable[[], Dict]]:
+    """
+    Birbirinden bağımsız iki sorgu: sayfa (limit + 1 grup) ve toplamlar
+    (grup sayısı, toplam, imleçten önceki toplam). Senkron view sırayla,
+    async view (views_async) aynı anda çalıştırır.
+    """
+    date_from, date_to, search, groupby, _ = get_params(request)
+    base, key, annotations, _ = grouped_source(date_from, date_to, search, groupby, get_product_ids(request))
+    grouped = base.values(key).annotate(**annotations)
+    page_qs = grouped.order_by("-sum_profit", key)
+    stats = dict(count=Count("*"), total=Sum("sum_profit"))
+    if after:
+        page_qs = page_qs.filter(_keyset_after(after, key))
+        stats["before"] = Sum("sum_profit", filter=~_keyset_after(after, key))
+
+    def page():
+        return [aggregate_row(r, key) for r in page_qs[: limit + 1]]
+
+    def totals():
+        return grouped.order_by().aggregate(**stats)
+
+    return page, totals
+
+def _table_response(request, rows, totals, limit: int, thr: int, thr_b: int) -> FastJsonResponse:
+    more = len(rows) > limit
+    rows = rows[:limit]
+
+    engine = ParetoEngine(
+        [r["sum_profit"] for r in rows], offset=float(totals.get("before") or 0.0), total=float(totals["total"] or 0.0),
+    )
+    cum = engine.cum_pct(2)
+    classes = engine.abc_labels(thr, thr_b)
+    if wants_columnar(request):
+        page = {**columns(rows, TABLE_COLUMNS), "cum_pct": cum, "class": classes}
+    else:
+        page = [{**r, "cum_pct": c, "class": cls} for r, c, cls in zip(rows, cum, classes)]
+    return FastJsonResponse({
+        "success": True,
+        "columns": TABLE_COLUMNS + ["cum_pct", "class"],
+        "rows": page,
+        "count": totals["count"],
+        "next_cursor": _encode_cursor(rows[-1]) if more else None,
+    })
+
+@require_GET
+@conditional_api
+def pareto_table(request):
+    """
+    /api/pareto/table?limit=100&cursor=...
+    Özet tablo, (sum_profit DESC, label ASC) üzerinde keyset sayfalamayla:
+    WHERE (sum_profit, label) imleçten sonra ORDER BY ... LIMIT n. OFFSET yok;
+    N. sayfa ilk sayfayla aynı maliyettedir. Kümülatif yüzde ve ABC sınıfı
+    (threshold / threshold_b) için grup sayısı, toplam ve imleçten önceki
+    toplam tek bir ek sorguyla alınır. Son sayfada next_cursor null.
+    """
+    try:
+        limit, after, thr, thr_b = _table_args(request)
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    try:
+        page, totals = _table_queries(request, limit, after)
+        with phase("aggregate"):
+            rows, stats = page(), totals()
+        return _table_response(request, rows, stats, limit, thr, thr_b)
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Drift (zaman kovalı sıralama) ---------------------
+@require_GET
+@conditional_api
+def pareto_drift(request):
+    """
+    /api/pareto/drift?date_from=&date_to=&bucket=day|week|month
+      max_labels=50 (1..500), movers=10 (0..100), threshold / threshold_b
+    (etiket, kova) küpünden (_cube; /api/pareto/cube ile paylaşılır); sıralar,
+    kümülatif paylar ve ABC sınıfları tüm kovalar için birlikte hesaplanır
+    (bucket_drift).
+    Yanıt: buckets, labels (herhangi bir kovada en iyi sıraya göre ilk
+    max_labels) ve etiket x kova matrisleri rank / cum_pct / profit / class
+    (o kovada yoksa rank null, class "-"), ardışık kovalar arası ABC geçiş
+    sayıları ve ilk -> son kova arasında en çok yükselen / düşen etiketler.
+    """
+    try:
+        bucket = (request.GET.get("bucket") or "week").lower()
+        if bucket not in DRIFT_BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(DRIFT_BUCKETS)}")
+        max_labels = max(1, min(int(safe_float(request.GET.get("max_labels"), 50)), 500))
+        movers = max(0, min(int(safe_float(request.GET.get("movers"), 10)), 100))
+        thr = int(request.GET.get("threshold") or 80)
+        thr_b = int(request.GET.get("threshold_b") or 95)
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    try:
+        cube = _cube(request, ("product", "bucket"), bucket)
+        buckets = cube.levels["bucket"]
+        if len(buckets) > DRIFT_MAX_BUCKETS:
+            return FastJsonResponse({
+                "success": False,
+                "error": f"{len(buckets)} buckets (max {DRIFT_MAX_BUCKETS}); use a wider bucket or a shorter range",
+            }, status=400)
+        cs = cube.get(("product", "bucket"))
+        # yalnızca tarihsiz satırı olan etiketler kovalarda görünmez, drift'e girmez
+        products = cs.column("product")
+        seen = sorted(set(products))
+        labels = [cube.levels["product"][i] for i in seen]
+        l_idx = {c: i for i, c in enumerate(seen)}
+        cells = [(b, l_idx[c], p) for b, c, p in zip(cs.column("bucket"), products, cs.column("sum_profit"))]
+
+        res = bucket_drift(len(buckets), len(labels), cells, thr, thr_b, max_labels, movers)
+        days = [b.isoformat() for b in buckets]
+
+        def mover(m):
+            i, first, last = m
+            return {"label": labels[i], "from_rank": first, "to_rank": last, "delta": first - last}
+
+        return FastJsonResponse({
+            "success": True,
+            "bucket": bucket,
+            "buckets": days,
+            "labels": [labels[i] for i in res["keep"]],
+            "rank": [[r or None for r in row] for row in res["rank"]],
+            "cum_pct": res["cum_pct"],
+            "profit": res["profit"],
+            "class": [[DRIFT_STATES[s] for s in row] for row in res["state"]],
+            "transitions": [
+                {
+                    "from": days[i],
+                    "to": days[i + 1],
+                    "counts": {DRIFT_STATES[a]: dict(zip(DRIFT_STATES, t[a])) for a in range(len(DRIFT_STATES))},
+                }
+                for i, t in enumerate(res["transitions"])
+            ],
+            "movers": {"up": [mover(m) for m in res["movers"]["up"]], "down": [mover(m) for m in res["movers"]["down"]]},
+            "n_labels": len(labels),
+            "thresholds": {"A": thr, "B": thr_b},
+        })
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Küp (çok boyutlu agregasyon) ---------------------
+CUBE_VIEWS = ("cube", "pareto", "topn")
+
+@require_GET
+@conditional_api
+def pareto_cube(request):
+    """
+    /api/pareto/cube?dims=product,bucket&bucket=day|week|month
+      &sets=product:bucket,product,bucket,total (boşsa ROLLUP(dims))
+      &view=cube|pareto|topn &at=YYYY-MM-DD (kova başı) &n=10 &threshold=80
+    view=cube: levels (boyut değerleri) + her küme için boyut kodları ve
+    sum_profit / sum_click / sum_sales / row_count dizileri.
+    view=pareto|topn: aynı önbellekteki küpten dilim; at verilirse o kova,
+    verilmezse tüm dönem (product kümesi). Yanıt /api/pareto ve
+    /api/pareto/topn'ın labels / profit alanlarıyla aynı biçimdedir.
+    """
+    try:
+        dims = cube_mod.parse_dims(request.GET.get("dims") or "product,bucket")
+        sets = cube_mod.parse_sets(request.GET.get("sets") or "", dims)
+        bucket = (request.GET.get("bucket") or "week").lower()
+        view = (request.GET.get("view") or "cube").lower()
+        if view not in CUBE_VIEWS:
+            raise ValueError(f"view must be one of: {', '.join(CUBE_VIEWS)}")
+        at = None
+        if request.GET.get("at"):
+            at = parse_date(request.GET["at"])
+            if at is None or "bucket" not in dims:
+                raise ValueError("at needs a YYYY-MM-DD bucket start and dims including bucket")
+        if view != "cube" and "product" not in dims:
+            raise ValueError(f"view={view} needs dims including product")
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    try:
+        cube = _cube(request, dims, bucket)
+        if view == "cube":
+            payload = cube.to_payload()
+            payload["sets"] = [p for p in payload["sets"] if tuple(p["dims"]) in sets]
+            return FastJsonResponse({"success": True, **payload})
+
+        labels, profit = cube.ranked("product", **({"bucket": at} if at else {}))
+        payload = {"at": at, "bucket": cube.bucket if at else None}
+        if view == "topn":
+            payload.update(_topn_payload(request, (labels, profit)))
+        else:
+            engine = ParetoEngine(profit)
+            threshold = int(request.GET.get("threshold") or 80)
+            idx = engine.threshold_index(threshold)
+            payload.update({
+                "labels": labels,
+                "profit": profit,
+                "cum_pct": engine.cum_pct(2),
+                "sum_profit": round(engine.total, 2),
+                "idx_threshold": idx if idx >= 0 else engine.n - 1,
+            })
+        return FastJsonResponse({"success": True, **payload})
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- What-If senaryo ızgarası ---------------------
+WHATIF_GRID_MAX_SCENARIOS = 2500
+
+@require_GET
+@conditional_api
+def pareto_whatif_grid(request):
+    """
+    Fiyat değişimi x satış artışı ızgarasını tek sorgu + tek vektörel geçişte hesaplar.
+      price_deltas=-10,-5,0,5,10   (%)
+      uplifts=0,10,20              (%)
+      selected=etiketler           (opsiyonel)
+      classes=A,B                  (opsiyonel; temel ABC sınıfına göre seçim)
+      threshold / threshold_b
+    Seçim yoksa senaryo tüm ürünlere uygulanır.
+    """
+    try:
+        price_deltas = _float_list(request.GET.get("price_deltas")) or [0.0]
+        uplifts = _float_list(request.GET.get("uplifts")) or [0.0]
+        n = len(price_deltas) * len(uplifts)
+        if n > WHATIF_GRID_MAX_SCENARIOS:
+            return FastJsonResponse({
+                "success": False,
+                "error": f"{n} scenarios (max {WHATIF_GRID_MAX_SCENARIOS}); use fewer price/uplift steps",
+            }, status=400)
+        thr = int(request.GET.get("threshold") or 80)
+        thr_b = int(request.GET.get("threshold_b") or 95)
+        selected = {s.strip() for s in (request.GET.get("selected") or "").split(",") if s.strip()}
+        classes = {c.strip().upper() for c in (request.GET.get("classes") or "").split(",") if c.strip()}
+
+        labels, revenue, cogs = whatif_components(request)
+        base_classes = ParetoEngine([r - c for r, c in zip(revenue, cogs)]).abc_labels(thr, thr_b)
+        if selected or classes:
+            mask = [(lab in selected) or (cls in classes) for lab, cls in zip(labels, base_classes)]
+        else:
+            mask = [True] * len(labels)
+
+        scenarios = scenario_grid(revenue, cogs, mask, price_deltas, uplifts, thr, thr_b)
+        return FastJsonResponse({
+            "success": True,
+            "price_deltas": price_deltas,
+            "uplifts": uplifts,
+            "selected_count": sum(mask),
+            "thresholds": {"A": thr, "B": thr_b},
+            "scenarios": scenarios,
+        })
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+
+# --------------------- Ham dışa aktarım (CSV / Arrow / Parquet) ---------------------
+@require_GET
+@conditional_api
+def pareto_export_raw(request):
+    """
+    /api/pareto/export/raw?format=csv|parquet|arrow&date_from=&date_to=&search=&product_ids=
+    Filtrelenmiş ham product_metric satırları (id sırasıyla), ORM satır
+    dönüşümü olmadan cursor'dan RAW_EXPORT_CHUNK_SIZE'lık parçalarla akıtılır.
+    Arrow/Parquet kolonları tiplidir: int64, float64, date32 (ts), string.
+    """
+    try:
+        fmt = export_format(request)
+    except ValueError as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
+    try:
+        date_from, date_to, search, _, _ = get_params(request)
+        names = [name for name, _ in arrow_export.RAW_COLUMNS]
+        qs = raw_filtered(date_from, date_to, search, get_product_ids(request)).order_by("id").values_list(*names)
+        chunks = cursor_chunks(qs, RAW_EXPORT_CHUNK_SIZE)
+        if fmt != "csv":
+            batches = (arrow_export.transpose(chunk) for chunk in chunks)
+            return binary_export(fmt, arrow_export.RAW_COLUMNS, batches, "product_metric")
+
+        writer = csv.writer(Echo())
+
+        def lines():
+            yield writer.writerow(names)
+            for chunk in chunks:
+                yield "".join(writer.writerow(row) for row in chunk)
+
+        resp = StreamingHttpResponse(lines(), content_type="text/csv; charset=utf-8")
+        resp["Content-Disposition"] = 'attachment; filename="product_metric.csv"'
+        return resp
+    except Exception as e:
+        return FastJsonResponse({"success": False, "error": str(e)}, status=400)
@@ -0,0 +1,60 @@
+# pardonai/dashboard/write_batch.py
+"""
+Transaction başına yazım kümesi.
+
+Tekil ORM yazımlarının sinyalleri (signals.py) etkilenen günleri açık
+transaction'a ait bir kümeye ekler (record):
+  - bir gün bu transaction'da ilk kez görüldüğünde mark(yeni günler)
+    yazımla aynı transaction'da çalışır,
+  - commit'te flush(tüm günler) tek bir on_commit işi olarak bir kez çalışır.
+
+Böylece aynı transaction'daki N yazım gün başına bir işaretleme ve tek bir
+commit işi demektir. Autocommit'te (atomic dışı) her yazım kendi
+transaction'ıdır; flush hemen çalışır.
+
+Küme, flush bağlantının bekleyen on_commit listesinde durduğu sürece
+yaşar. Rollback'te Django bu listeyi boşaltır; bir sonraki yazım yeni küme
+açar. Her flush fonksiyonunun kendi kümesi vardır.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from django.db import transaction
+
+_ATTR = "_pardonai_write_batches"
+
+
+class _Batch:
+    def __init__(self, flush: Callable[[Set], None]):
+        self.days: Set = set()
+        self.flush = flush
+        self.run = self._run  # on_commit listesinde kimlikle aranır
+
+    def _run(self) -> None:
+        self.flush(self.days)
+
+    def pending(self, conn) -> bool:
+        return any(func is self.run for _, func, _ in conn.run_on_commit)
+
+
+def record(days: Iterable, mark: Optional[Callable[[Set], None]], flush: Callable[[Set], None],
+           using: Optional[str] = None) -> None:
+    """
+    days'i açık transaction'ın kümesine ekler. Yeni günler için mark hemen
+    çalışır; flush commit'te bir kez, transaction'ın tüm günleriyle çalışır.
+    flush robust'tur: hatası yazımı bozmaz (loglanır).
+    """
+    conn = transaction.get_connection(using)
+    batches: Dict[Callable, _Batch] = conn.__dict__.setdefault(_ATTR, {})
+    batch = batches.get(flush)
+    fresh = batch is None or not batch.pending(conn)
+    if fresh:
+        batch = batches[flush] = _Batch(flush)
+    new = set(days) - batch.days
+    if new:
+        if mark is not None:
+            mark(new)
+        batch.days |= new
+    if fresh:
+        # autocommit'te hemen çalışır; bu yüzden günler eklendikten sonra
+        transaction.on_commit(batch.run, using=using, robust=True)
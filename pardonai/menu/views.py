@@ -3,16 +3,18 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from .models import Menu, Product, Category, Extra, ProductExtra
+from pardonai.dashboard import counters as status_counters
 from pardonai.dashboard.models import Businesses as CoreBusinesses
 
 
 def menu_list(request):
     """Menü listesi"""
     menus = Menu.objects.all().order_by('-created_date')
+    # Sayılar tablo taranmadan sayaç tablosundan (dashboard/counters.py)
+    counts = status_counters.get(('total_menus', 'active_menus'))
     context = {
         'menus': menus,
-        'total_menus': menus.count(),
-        'active_menus': menus.filter(is_active=True).count(),
+        **counts,
     }
     return render(request, 'menu/menu_list.html', context)
 
@@ -83,10 +85,10 @@ def menu_delete(request, menu_id):
 def product_list(request):
     """Ürün listesi"""
     products = Product.objects.all().order_by('menu', 'category', 'name')
+    counts = status_counters.get(('total_products', 'available_products'))
     context = {
         'products': products,
-        'total_products': products.count(),
-        'available_products': products.filter(is_available=True).count(),
+        **counts,
     }
     return render(request, 'menu/product_list.html', context)
 
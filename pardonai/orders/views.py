@@ -3,17 +3,20 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from .models import Order, OrderItem, OrderItemExtra, OrderHistory, Customer
+from pardonai.dashboard import counters as status_counters
 from pardonai.dashboard.models import Businesses as CoreBusinesses
 
 
 def order_list(request):
     """Sipariş listesi"""
     orders = Order.objects.all().order_by('-order_date')
+    # Sayılar tablo taranmadan sayaç tablosundan (dashboard/counters.py)
+    counts = status_counters.get(('total_orders', 'pending_orders', 'delivered_orders'))
     context = {
         'orders': orders,
-        'total_orders': orders.count(),
-        'pending_orders': orders.filter(order_status='pending').count(),
-        'completed_orders': orders.filter(order_status='delivered').count(),
+        'total_orders': counts['total_orders'],
+        'pending_orders': counts['pending_orders'],
+        'completed_orders': counts['delivered_orders'],
     }
     return render(request, 'orders/order_list.html', context)
 
@@ -78,7 +81,7 @@ def order_analytics(request):
     """Sipariş analitikleri"""
     # Örnek analitik verileri
     analytics_data = {
-        'total_orders': Order.objects.count(),
+        'total_orders': status_counters.get(('total_orders',))['total_orders'],
         'total_revenue': sum(order.final_amount for order in Order.objects.all()),
         'average_order_value': 0,  # Hesaplanacak
         'orders_by_status': {},  # Duruma göre gruplandırma
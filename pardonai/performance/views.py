@@ -3,18 +3,20 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from .models import PerformanceMetric, SalesReport, CustomerAnalytics, BusinessDashboard, Goal
+from pardonai.dashboard import stats as dashboard_stats
 from pardonai.dashboard.models import Businesses as CoreBusinesses
 
 
 def performance_dashboard(request):
     """Performans dashboard ana sayfası"""
-    # Örnek dashboard verileri
+    # Sayaçlar dashboard ile ortak anlık görüntüden (tek sorgu, kısa süreli önbellek)
+    counts = dashboard_stats.snapshot()
     dashboard_data = {
-        'total_businesses': CoreBusinesses.objects.count(),
-        'active_businesses': CoreBusinesses.objects.filter(status='active').count(),
-        'total_metrics': PerformanceMetric.objects.count(),
-        'total_goals': Goal.objects.count(),
-        'achieved_goals': Goal.objects.filter(is_achieved=True).count(),
+        'total_businesses': counts['total_core_businesses'],
+        'active_businesses': counts['active_core_businesses'],
+        'total_metrics': counts['total_metrics'],
+        'total_goals': counts['total_goals'],
+        'achieved_goals': counts['achieved_goals'],
     }
     
     context = {'dashboard_data': dashboard_data}
@@ -63,8 +63,9 @@ INSTALLED_APPS = [
 # Middleware
 # ------------------------------------------------------------------------------
 MIDDLEWARE = [
+    "pardonai.dashboard.timing.ServerTimingMiddleware",  # PARETO_SERVER_TIMING kapalıysa yüklenmez
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",   # Static dosyalar
+    "whitenoise.middleware.WhiteNoiseMiddleware",   # Static dosyalar (ASGI'de aşağıda async alt sınıfı)
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -95,6 +96,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "pardonai.wsgi.application"
+ASGI_APPLICATION = "pardonai.asgi.application"
 
 # ------------------------------------------------------------------------------
 # Database
@@ -150,6 +152,39 @@ if not DEBUG:
     # LB/Proxy arkasında isen aç:
     # SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
+# ------------------------------------------------------------------------------
+# Pareto agregasyon önbelleği (süreç içi LRU + TTL, bkz. dashboard/pareto_cache.py)
+# ------------------------------------------------------------------------------
+PARETO_CACHE_MAX_ENTRIES = env.int("PARETO_CACHE_MAX_ENTRIES", default=64)
+PARETO_CACHE_TTL = env.int("PARETO_CACHE_TTL", default=300)  # saniye
+# worker başına yaklaşık bellek sınırı (bayt); tek başına bundan büyük sonuçlar saklanmaz
+PARETO_CACHE_MAX_BYTES = env.int("PARETO_CACHE_MAX_BYTES", default=64 * 1024 * 1024)
+# ETag'e karışan dağıtım/derleme sürümü (ör. git sha): yeni sürümde eski ETag'ler eşleşmez
+PARETO_ETAG_VERSION = env.str("PARETO_ETAG_VERSION", default="")
+# Güncel olduğunda pareto sorguları product_metric_daily'den cevaplanır
+PARETO_USE_ROLLUP = env.bool("PARETO_USE_ROLLUP", default=True)
+# ORM yazımlarının commit'inden sonra rollup'ı istek içinde artımlı yenile. Kapalıyken (varsayılan)
+# yazımlar günü kirli işaretler, okumalar refresh_product_rollup'a kadar ham tabloya döner:
+# refresh_product_rollup ve rebuild_product_sketches --stale düzenli zamanlanmalı
+PARETO_ROLLUP_REFRESH_ON_COMMIT = env.bool("PARETO_ROLLUP_REFRESH_ON_COMMIT", default=False)
+# approx=1: gün başına tutulan top-k özetinin sayaç sayısı
+PARETO_SKETCH_CAPACITY = env.int("PARETO_SKETCH_CAPACITY", default=512)
+# ORM yazımlarının commit'inden sonra stale günlerin özetlerini istek içinde yeniden üret
+PARETO_SKETCH_REBUILD_ON_COMMIT = env.bool("PARETO_SKETCH_REBUILD_ON_COMMIT", default=False)
+# /api/ isteklerinde Server-Timing başlığı + pardonai.dashboard.timing log satırı
+PARETO_SERVER_TIMING = env.bool("PARETO_SERVER_TIMING", default=False)
+PARETO_TIMING_PREFIX = env.str("PARETO_TIMING_PREFIX", default="/api/")
+PARETO_TIMING_LOG_MIN_MS = env.float("PARETO_TIMING_LOG_MIN_MS", default=0)  # daha hızlı istekler loglanmaz
+# Dashboard/pareto API'lerinin async karşılıkları (ASGI/uvicorn dağıtımında aç; bkz. gunicorn_asgi.conf.py)
+DASHBOARD_ASYNC_VIEWS = env.bool("DASHBOARD_ASYNC_VIEWS", default=False)
+if DASHBOARD_ASYNC_VIEWS:
+    # ASGI dağıtımı: statik olmayan istekler zinciri tek iş parçacığına bağlamasın (bkz. dashboard/aio.py)
+    MIDDLEWARE[MIDDLEWARE.index("whitenoise.middleware.WhiteNoiseMiddleware")] = "pardonai.dashboard.aio.WhiteNoiseMiddleware"
+# async view'ların sorgu havuzu; süreç başına en fazla bu kadar DB bağlantısı
+DASHBOARD_ASYNC_THREADS = env.int("DASHBOARD_ASYNC_THREADS", default=16)
+# dashboard sayaçlarının anlık görüntü süresi (saniye; bkz. dashboard/stats.py)
+DASHBOARD_STATS_TTL = env.int("DASHBOARD_STATS_TTL", default=30)
+
 # ------------------------------------------------------------------------------
 # Logging
 # ------------------------------------------------------------------------------
@@ -158,4 +193,7 @@ LOGGING = {
     "disable_existing_loggers": False,
     "handlers": {"console": {"class": "logging.StreamHandler"}},
     "root": {"handlers": ["console"], "level": "INFO"},
+    "loggers": {
+        "pardonai.dashboard.timing": {"level": env.str("PARETO_TIMING_LOG_LEVEL", default="INFO")},
+    },
 }